@@ -1,11 +1,18 @@
 import sys
-from src.vista.InterfazRecetario import App_Recetario
-from src.logica.Recetario import Recetario
 
 if __name__ == '__main__':
     # Punto inicial de la aplicación
 
+    from src.consola.ConsolaRecetario import es_comando_consola, main
+
+    if es_comando_consola(sys.argv[1:]):
+        #Los comandos de la consola no importan PyQt5; los demás argumentos son de Qt
+        sys.exit(main())
+
+    from src.vista.InterfazRecetario import App_Recetario
+    from src.logica.Recetario import Recetario
+
     logica = Recetario()
 
     app = App_Recetario(sys.argv, logica)
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
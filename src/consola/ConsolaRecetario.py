@@ -0,0 +1,300 @@
+'''
+Clase ConsolaRecetario: comandos de línea para trabajar con el recetario sin la
+interfaz gráfica. Solo depende de la lógica (y con ella de SQLAlchemy), por lo que
+arranca rápido y sirve para tareas programadas y flujos de datos
+'''
+import argparse
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import sys
+
+from src.logica.ExportadorCatalogo import ENTIDADES, FORMATOS
+from src.logica.ImportadorIngredientes import TAMANO_LOTE
+from src.logica.ImportadorRecetas import TAMANO_LOTE as TAMANO_LOTE_RECETAS
+from src.logica.Paginacion import TAMANO_PAGINA
+from src.logica.Recetario import Recetario
+
+#Nivel de gzip: 6 comprime casi como 9 en una fracción del tiempo
+NIVEL_GZIP = 6
+
+#Primer argumento de cada comando; los demás argumentos de la aplicación son para Qt
+COMANDOS = ('recetas', 'ingredientes', 'catalogo')
+
+
+class ConsolaRecetario:
+
+    def __init__(self, logica, salida=None, errores=None):
+        self.logica = logica
+        self.salida = salida if salida is not None else sys.stdout
+        self.errores = errores if errores is not None else sys.stderr
+
+    def escribir_error(self, mensaje):
+        print(mensaje, file=self.errores)
+
+    def recorrer_recetas(self, tamano_pagina=TAMANO_PAGINA):
+        ''' Recorre todas las recetas por páginas, sin cargar el listado completo
+        Retorna:
+            (generator): los diccionarios de las recetas en orden de nombre
+        '''
+        despues_de = None
+        while True:
+            pagina = self.logica.dar_pagina_recetas(despues_de, tamano_pagina)
+            for receta in pagina['elementos']:
+                yield receta
+            despues_de = pagina['siguiente']
+            if despues_de is None:
+                return
+
+    def listar_recetas(self, formato='texto', tamano_pagina=TAMANO_PAGINA):
+        ''' Escribe las recetas en la salida a medida que se consultan
+        Parámetros:
+            formato (string): 'texto' para columnas separadas por tabuladores o 'json' para una receta por línea
+            tamano_pagina (int): recetas por consulta
+        Retorna:
+            (int): la cantidad de recetas escritas
+        '''
+        cantidad = 0
+        for receta in self.recorrer_recetas(tamano_pagina):
+            if formato == 'json':
+                self.salida.write(json.dumps(receta, ensure_ascii=False) + '\n')
+            else:
+                self.salida.write('\t'.join(str(receta[clave]) for clave in
+                                            ('id', 'nombre', 'tiempo', 'personas', 'calorias')) + '\n')
+            cantidad += 1
+            if cantidad % tamano_pagina == 0:
+                self.salida.flush()
+        self.salida.flush()
+        return cantidad
+
+    def exportar_recetas(self, salida):
+        ''' Escribe cada receta con su preparación e ingredientes como una línea JSON, a medida que se lee
+        Parámetros:
+            salida (file): archivo de texto en el que se escribe
+        Retorna:
+            (int): la cantidad de recetas exportadas
+        '''
+        return self.logica.exportar_catalogo('recetas_completas', salida, 'jsonl')
+
+    def importar_recetas(self, entrada, tamano_lote=TAMANO_LOTE_RECETAS):
+        ''' Crea las recetas de un archivo con una receta JSON por línea, en el formato de exportar_recetas
+        Parámetros:
+            entrada (file): archivo de texto que se lee línea por línea
+            tamano_lote (int): recetas por transacción
+        Retorna:
+            (int, int): la cantidad de recetas importadas y la cantidad de errores
+        '''
+        resultado = self.logica.importar_recetas(entrada, tamano_lote)
+        for numero_linea, mensaje in resultado['errores']:
+            self.escribir_error("Línea %d: %s" % (numero_linea, mensaje))
+        return resultado['importadas'], len(resultado['errores'])
+
+    def leer_filas(self, entrada, formato):
+        ''' Recorre las filas de un archivo CSV con encabezados o JSON, sin cargarlo completo
+        cuando es JSON por línea. Un archivo JSON que empieza con [ se lee como una lista
+        Retorna:
+            (generator): un diccionario por fila, o None para las líneas JSON inválidas
+        '''
+        if formato == 'csv':
+            yield from csv.DictReader(entrada)
+            return
+        primera = entrada.readline()
+        if primera.lstrip().startswith('['):
+            yield from json.loads(primera + entrada.read())
+            return
+        for linea in itertools.chain([primera], entrada):
+            if not linea.strip():
+                continue
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                yield None
+
+    def importar_ingredientes(self, entrada, formato='csv', tamano_lote=TAMANO_LOTE):
+        ''' Importa los ingredientes de un archivo e informa al final los errores de todas las filas
+        Parámetros:
+            entrada (file): archivo de texto en CSV (nombre,unidad,valor,sitioCompra) o JSON
+            formato (string): 'csv' o 'json'
+            tamano_lote (int): ingredientes por transacción
+        Retorna:
+            (int, int): la cantidad de ingredientes importados y la cantidad de filas con errores
+        '''
+        resultado = self.logica.importar_ingredientes(self.leer_filas(entrada, formato), tamano_lote)
+        for numero_fila, mensaje in resultado['errores']:
+            self.escribir_error("Fila %d: %s" % (numero_fila, mensaje))
+        return resultado['importados'], len(resultado['errores'])
+
+    def preparar_receta(self, id_receta, cantidad_personas):
+        ''' Escribe en JSON los datos de preparación de una receta
+        Retorna:
+            (bool): si la receta existe y se pudo preparar
+        '''
+        preparacion = self.logica.dar_preparacion_por_id(id_receta, cantidad_personas)
+        if not isinstance(preparacion, dict) or not preparacion:
+            self.escribir_error(preparacion or "La receta %s no existe" % id_receta)
+            return False
+        self.salida.write(json.dumps(preparacion, ensure_ascii=False, indent=2) + '\n')
+        self.salida.flush()
+        return True
+
+
+def abrir_archivo(ruta, modo, estandar, comprimir=False):
+    #'-' o ninguna ruta representan la entrada o la salida estándar
+    if ruta in (None, '-'):
+        if not comprimir:
+            return estandar, False
+        #El texto se comprime sobre los bytes de la salida estándar, que no se cierra al terminar
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=estandar.buffer, mode=modo + 'b', compresslevel=NIVEL_GZIP), encoding='utf-8',
+                                newline=''), True
+    if comprimir or ruta.endswith('.gz'):
+        return gzip.open(ruta, modo + 't', compresslevel=NIVEL_GZIP, encoding='utf-8', newline=''), True
+    return open(ruta, modo, encoding='utf-8', newline=''), True
+
+
+def listar(consola, opciones):
+    consola.listar_recetas(opciones.formato, opciones.tamano_pagina)
+    return 0
+
+
+def exportar(consola, opciones):
+    archivo, propio = abrir_archivo(opciones.archivo, 'w', consola.salida, opciones.gzip)
+    try:
+        cantidad = consola.exportar_recetas(archivo)
+    finally:
+        if propio:
+            archivo.close()
+    consola.escribir_error("%d recetas exportadas" % cantidad)
+    return 0
+
+
+def exportar_catalogo(consola, opciones):
+    archivo, propio = abrir_archivo(opciones.archivo, 'w', consola.salida, opciones.gzip)
+    try:
+        cantidad = consola.logica.exportar_catalogo(opciones.entidad_catalogo, archivo, opciones.formato)
+    except ValueError as error:
+        consola.escribir_error(str(error))
+        return 2
+    finally:
+        if propio:
+            archivo.close()
+    consola.escribir_error("%d filas exportadas" % cantidad)
+    return 0
+
+
+def importar(consola, opciones):
+    archivo, propio = abrir_archivo(opciones.archivo, 'r', sys.stdin)
+    try:
+        importadas, errores = consola.importar_recetas(archivo, opciones.tamano_lote)
+    finally:
+        if propio:
+            archivo.close()
+    consola.escribir_error("%d recetas importadas, %d errores" % (importadas, errores))
+    return 1 if errores else 0
+
+
+def importar_ingredientes(consola, opciones):
+    formato = opciones.formato
+    if formato is None:
+        #Sin formato explícito se toma de la extensión del archivo
+        ruta = opciones.archivo or ''
+        if ruta.endswith('.gz'):
+            ruta = ruta[:-len('.gz')]
+        formato = 'json' if os.path.splitext(ruta)[1].lower() in ('.json', '.jsonl') else 'csv'
+    archivo, propio = abrir_archivo(opciones.archivo, 'r', sys.stdin)
+    try:
+        importados, errores = consola.importar_ingredientes(archivo, formato, opciones.tamano_lote)
+    except ValueError as error:
+        #Una lista JSON inválida no se puede recorrer por filas
+        consola.escribir_error("El archivo no es un JSON válido (%s)" % error)
+        return 1
+    finally:
+        if propio:
+            archivo.close()
+    consola.escribir_error("%d ingredientes importados, %d errores" % (importados, errores))
+    return 1 if errores else 0
+
+
+def preparar(consola, opciones):
+    return 0 if consola.preparar_receta(opciones.id_receta, opciones.personas) else 1
+
+
+def entero_positivo(texto):
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError("debe ser un número entero positivo")
+    return valor
+
+
+def es_comando_consola(argumentos):
+    ''' Indica si los argumentos de la aplicación son un comando de la consola
+    Parámetros:
+        argumentos (list): argumentos sin el nombre del programa
+    Retorna:
+        (bool): True si el primer argumento es uno de COMANDOS; opciones como -style
+            o -platform son de Qt y abren la interfaz gráfica
+    '''
+    return len(argumentos) > 0 and argumentos[0] in COMANDOS
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='python -m src.consola', description='Recetario sin interfaz gráfica')
+    entidades = parser.add_subparsers(dest='entidad', required=True)
+
+    recetas = entidades.add_parser('recetas', help='Consultar, exportar, importar y preparar recetas')
+    comandos = recetas.add_subparsers(dest='comando', required=True)
+
+    comando = comandos.add_parser('listar', aliases=['list'], help='Lista las recetas por páginas')
+    comando.add_argument('--formato', choices=['texto', 'json'], default='texto')
+    comando.add_argument('--tamano-pagina', type=entero_positivo, default=TAMANO_PAGINA)
+    comando.set_defaults(ejecutar=listar)
+
+    comando = comandos.add_parser('exportar', aliases=['export'], help='Exporta las recetas completas en JSON por línea')
+    comando.add_argument('--archivo', help='archivo de destino; por defecto la salida estándar; .gz se comprime')
+    comando.add_argument('--gzip', action='store_true', help='comprime la salida con gzip')
+    comando.set_defaults(ejecutar=exportar)
+
+    comando = comandos.add_parser('importar', aliases=['import'], help='Importa recetas en JSON por línea')
+    comando.add_argument('--archivo', help='archivo de origen; por defecto la entrada estándar')
+    comando.add_argument('--tamano-lote', type=entero_positivo, default=TAMANO_LOTE_RECETAS)
+    comando.set_defaults(ejecutar=importar)
+
+    comando = comandos.add_parser('preparar', help='Calcula la preparación de una receta')
+    comando.add_argument('id_receta', type=int, help='id de la receta, como lo muestra listar')
+    comando.add_argument('--personas', type=entero_positivo, required=True)
+    comando.set_defaults(ejecutar=preparar)
+
+    ingredientes = entidades.add_parser('ingredientes', help='Importar ingredientes')
+    comandos = ingredientes.add_subparsers(dest='comando', required=True)
+
+    comando = comandos.add_parser('importar', aliases=['import'],
+                                  help='Importa ingredientes en CSV (nombre,unidad,valor,sitioCompra) o JSON')
+    comando.add_argument('--archivo', help='archivo de origen; por defecto la entrada estándar')
+    comando.add_argument('--formato', choices=['csv', 'json'],
+                         help='por defecto json para archivos .json o .jsonl y csv en los demás casos')
+    comando.add_argument('--tamano-lote', type=entero_positivo, default=TAMANO_LOTE)
+    comando.set_defaults(ejecutar=importar_ingredientes)
+
+    catalogo = entidades.add_parser('catalogo', help='Exportar el catálogo completo')
+    comandos = catalogo.add_subparsers(dest='comando', required=True)
+
+    comando = comandos.add_parser('exportar', aliases=['export'], help='Exporta una parte del catálogo en CSV o JSON por línea')
+    comando.add_argument('entidad_catalogo', choices=sorted(ENTIDADES), metavar='entidad',
+                         help='una de: ' + ', '.join(sorted(ENTIDADES)))
+    comando.add_argument('--formato', choices=FORMATOS, default='jsonl')
+    comando.add_argument('--archivo', help='archivo de destino; por defecto la salida estándar; .gz se comprime')
+    comando.add_argument('--gzip', action='store_true', help='comprime la salida con gzip')
+    comando.set_defaults(ejecutar=exportar_catalogo)
+    return parser
+
+
+def main(argumentos=None, logica=None, salida=None, errores=None):
+    opciones = crear_parser().parse_args(argumentos)
+    consola = ConsolaRecetario(logica if logica is not None else Recetario(), salida, errores)
+    try:
+        return opciones.ejecutar(consola, opciones)
+    except BrokenPipeError:
+        #El proceso que leía la salida (por ejemplo head) terminó antes
+        return 0
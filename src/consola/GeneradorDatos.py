@@ -0,0 +1,233 @@
+'''
+Clase GeneradorDatos: crea catálogos sintéticos de recetas e ingredientes de
+cualquier tamaño (10 mil, 100 mil, un millón de filas) para probar el rendimiento.
+La generación es determinista a partir de una semilla y escribe directamente en un
+archivo SQLite nuevo con inserciones masivas por lotes, sin pasar por la lógica
+'''
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import time as hora
+from random import Random
+
+from sqlalchemy import create_engine, event
+
+from src.modelo.declarative_base import Base
+from src.modelo.receta import Receta
+from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
+
+
+#Filas insertadas por transacción
+TAMANO_LOTE = 5000
+
+BASES_INGREDIENTES = [
+    "Arroz", "Papa", "Tomate", "Cebolla", "Ajo", "Zanahoria", "Pollo", "Res", "Cerdo", "Pescado", "Camarón",
+    "Frijol", "Lenteja", "Garbanzo", "Maíz", "Plátano", "Yuca", "Queso", "Leche", "Huevo", "Harina", "Azúcar",
+    "Sal", "Pimienta", "Aceite", "Mantequilla", "Cilantro", "Perejil", "Limón", "Naranja", "Pimentón", "Apio",
+    "Champiñón", "Espinaca", "Brócoli", "Ahuyama", "Aguacate", "Coco", "Panela", "Comino",
+]
+VARIEDADES = [
+    "criollo", "blanco", "rojo", "orgánico", "integral", "fresco", "seco", "ahumado", "tierno", "maduro",
+    "verde", "molido", "en polvo", "importado", "campesino", "light", "extra", "premium",
+]
+UNIDADES = ["kg", "g", "libra", "L", "ml", "unidad", "taza", "cucharada"]
+SITIOS_COMPRA = ["Plaza", "Supermercado", "Tienda", "Mercado campesino", "Distribuidor", "Carnicería"]
+PLATOS = ["Sopa", "Arroz", "Guiso", "Ensalada", "Crema", "Sudado", "Asado", "Torta", "Pastel", "Salteado",
+          "Tortilla", "Estofado", "Ajiaco", "Sancocho", "Empanada", "Arepa", "Postre", "Jugo"]
+ESTILOS = ["casero", "de la abuela", "al horno", "a la plancha", "criollo", "express", "tradicional",
+           "picante", "especial", "del día"]
+PALABRAS_PREPARACION = [
+    "picar", "mezclar", "cocinar", "hervir", "freír", "sofreír", "hornear", "batir", "agregar", "servir",
+    "la", "el", "los", "las", "con", "en", "a", "fuego", "medio", "lento", "alto", "minutos", "hasta",
+    "dorar", "sal", "agua", "caldo", "olla", "sartén", "revolver", "tapar", "dejar", "reposar", "calentar",
+    "retirar", "porciones", "finamente", "cuidadosamente", "aparte", "luego", "después", "todo", "bien",
+]
+
+#Distribución de un valor entero: uniforme entre minimo y maximo, o triangular si se indica la moda
+Distribucion = namedtuple('Distribucion', ['minimo', 'maximo', 'moda'])
+
+
+def muestrear(aleatorio, distribucion):
+    if distribucion.moda is None:
+        return aleatorio.randint(distribucion.minimo, distribucion.maximo)
+    return int(round(aleatorio.triangular(distribucion.minimo, distribucion.maximo, distribucion.moda)))
+
+
+def leer_distribucion(texto):
+    ''' Convierte 'minimo:maximo' o 'minimo:maximo:moda' en una Distribucion '''
+    try:
+        valores = [int(valor) for valor in texto.split(':')]
+    except ValueError:
+        raise argparse.ArgumentTypeError("debe tener la forma minimo:maximo o minimo:maximo:moda")
+    if len(valores) not in (2, 3):
+        raise argparse.ArgumentTypeError("debe tener la forma minimo:maximo o minimo:maximo:moda")
+    minimo, maximo = valores[:2]
+    moda = valores[2] if len(valores) == 3 else None
+    if minimo < 0 or minimo > maximo or (moda is not None and not minimo <= moda <= maximo):
+        raise argparse.ArgumentTypeError("se requiere 0 <= minimo <= moda <= maximo")
+    return Distribucion(minimo, maximo, moda)
+
+
+class GeneradorDatos:
+
+    def __init__(self, semilla=0, ingredientes_por_receta=Distribucion(2, 10, 5),
+                 palabras_preparacion=Distribucion(20, 300, 80), precios=Distribucion(200, 60000, 4000)):
+        ''' Parámetros:
+            semilla (int): la misma semilla y los mismos parámetros producen exactamente el mismo catálogo
+            ingredientes_por_receta (Distribucion): ingredientes distintos de cada receta
+            palabras_preparacion (Distribucion): longitud en palabras del texto de preparación
+            precios (Distribucion): valor por unidad de los ingredientes
+        '''
+        self.semilla = semilla
+        self.ingredientes_por_receta = ingredientes_por_receta
+        self.palabras_preparacion = palabras_preparacion
+        self.precios = precios
+
+    def generar_ingredientes(self, aleatorio, cantidad):
+        ''' Genera los ingredientes con ids 1..cantidad; (nombre, unidad) es único '''
+        usados = set()
+        for id_ingrediente in range(1, cantidad + 1):
+            nombre = "%s %s" % (aleatorio.choice(BASES_INGREDIENTES), aleatorio.choice(VARIEDADES))
+            unidad = aleatorio.choice(UNIDADES)
+            if (nombre, unidad) in usados:
+                #Las combinaciones se agotan pronto: las repetidas se distinguen con su id
+                nombre = "%s %d" % (nombre, id_ingrediente)
+            usados.add((nombre, unidad))
+            yield {'id': id_ingrediente, 'nombre': nombre, 'unidad': unidad,
+                   'valor': muestrear(aleatorio, self.precios), 'sitioCompra': aleatorio.choice(SITIOS_COMPRA)}
+
+    def generar_preparacion(self, aleatorio):
+        palabras = aleatorio.choices(PALABRAS_PREPARACION, k=max(1, muestrear(aleatorio, self.palabras_preparacion)))
+        return " ".join(palabras).capitalize() + "."
+
+    def generar_recetas(self, aleatorio, cantidad, cantidad_ingredientes):
+        ''' Genera las recetas con ids 1..cantidad junto con sus líneas de ingredientes '''
+        for id_receta in range(1, cantidad + 1):
+            receta = {
+                'id': id_receta,
+                'nombre': "%s de %s %s %d" % (aleatorio.choice(PLATOS), aleatorio.choice(BASES_INGREDIENTES).lower(),
+                                              aleatorio.choice(ESTILOS), id_receta),
+                'tiempo': hora(*divmod(aleatorio.randrange(5, 240, 5), 60)),
+                'personas': aleatorio.randint(1, 12),
+                'calorias': aleatorio.randrange(50, 1500, 10),
+                'preparacion': self.generar_preparacion(aleatorio),
+            }
+            cantidad_lineas = min(muestrear(aleatorio, self.ingredientes_por_receta), cantidad_ingredientes)
+            lineas = [{'receta_id': id_receta, 'ingrediente_id': id_ingrediente,
+                       'cantidad': aleatorio.randint(1, 20)}
+                      for id_ingrediente in aleatorio.sample(range(1, cantidad_ingredientes + 1), cantidad_lineas)]
+            yield receta, lineas
+
+    def crear_engine(self, destino):
+        engine = create_engine('sqlite:///' + destino)
+
+        @event.listens_for(engine, 'connect')
+        def aplicar_pragmas(conexion_dbapi, registro_conexion):
+            #El archivo se vuelve a generar si la carga se interrumpe: no necesita diario ni fsync
+            cursor = conexion_dbapi.cursor()
+            cursor.execute('PRAGMA journal_mode = OFF')
+            cursor.execute('PRAGMA synchronous = OFF')
+            cursor.close()
+        return engine
+
+    def generar(self, destino, cantidad_recetas, cantidad_ingredientes, tamano_lote=TAMANO_LOTE):
+        ''' Crea el esquema en un archivo SQLite nuevo y lo llena con el catálogo sintético
+        Parámetros:
+            destino (string): ruta del archivo SQLite; no debe existir
+            cantidad_recetas, cantidad_ingredientes (int): tamaño del catálogo
+            tamano_lote (int): filas por transacción; no cambia los datos generados
+        Retorna:
+            (dict): la cantidad de recetas, ingredientes y líneas de ingredientes creadas
+        '''
+        if os.path.exists(destino):
+            raise FileExistsError("El archivo %s ya existe" % destino)
+        if cantidad_recetas > 0 and cantidad_ingredientes < 1:
+            raise ValueError("Las recetas necesitan al menos un ingrediente")
+        aleatorio = Random(self.semilla)
+        engine = self.crear_engine(destino)
+        try:
+            Base.metadata.create_all(engine)
+            totales = {'ingredientes': 0, 'recetas': 0, 'lineas_ingredientes': 0}
+
+            lote = []
+            for ingrediente in self.generar_ingredientes(aleatorio, cantidad_ingredientes):
+                lote.append(ingrediente)
+                if len(lote) >= tamano_lote:
+                    self.insertar(engine, Ingrediente.__table__, lote)
+                    lote = []
+            self.insertar(engine, Ingrediente.__table__, lote)
+            totales['ingredientes'] = cantidad_ingredientes
+
+            recetas = []
+            lineas = []
+            for receta, lineas_receta in self.generar_recetas(aleatorio, cantidad_recetas, cantidad_ingredientes):
+                recetas.append(receta)
+                lineas.extend(lineas_receta)
+                if len(recetas) >= tamano_lote:
+                    totales['lineas_ingredientes'] += self.insertar_recetas(engine, recetas, lineas)
+                    recetas = []
+                    lineas = []
+            totales['lineas_ingredientes'] += self.insertar_recetas(engine, recetas, lineas)
+            totales['recetas'] = cantidad_recetas
+        finally:
+            engine.dispose()
+        return totales
+
+    def insertar(self, engine, tabla, filas):
+        if filas:
+            with engine.begin() as conexion:
+                conexion.execute(tabla.insert(), filas)
+
+    def insertar_recetas(self, engine, recetas, lineas):
+        #Las recetas y sus líneas de un lote se guardan en la misma transacción
+        if recetas:
+            with engine.begin() as conexion:
+                conexion.execute(Receta.__table__.insert(), recetas)
+                if lineas:
+                    conexion.execute(RecetaIngrediente.__table__.insert(), lineas)
+        return len(lineas)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog='python -m src.consola.GeneradorDatos',
+                                     description='Genera un catálogo sintético de recetas en un archivo SQLite')
+    parser.add_argument('destino', help='archivo SQLite a crear, por ejemplo RecetarioDatos.sqlite')
+    parser.add_argument('--recetas', type=int, default=10000)
+    parser.add_argument('--ingredientes', type=int, default=1000)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--ingredientes-por-receta', type=leer_distribucion, default=Distribucion(2, 10, 5),
+                        metavar='MIN:MAX[:MODA]')
+    parser.add_argument('--palabras-preparacion', type=leer_distribucion, default=Distribucion(20, 300, 80),
+                        metavar='MIN:MAX[:MODA]')
+    parser.add_argument('--precios', type=leer_distribucion, default=Distribucion(200, 60000, 4000),
+                        metavar='MIN:MAX[:MODA]')
+    parser.add_argument('--tamano-lote', type=int, default=TAMANO_LOTE)
+    parser.add_argument('--reemplazar', action='store_true', help='elimina el archivo de destino si ya existe')
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.reemplazar:
+        for sufijo in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(opciones.destino + sufijo):
+                os.remove(opciones.destino + sufijo)
+
+    generador = GeneradorDatos(opciones.semilla, opciones.ingredientes_por_receta, opciones.palabras_preparacion,
+                               opciones.precios)
+    inicio = time.perf_counter()
+    try:
+        totales = generador.generar(opciones.destino, opciones.recetas, opciones.ingredientes, opciones.tamano_lote)
+    except FileExistsError as error:
+        print("%s; use --reemplazar para sobrescribirlo" % error, file=sys.stderr)
+        return 1
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print("%d ingredientes, %d recetas y %d líneas de ingredientes en %.1f s" % (
+        totales['ingredientes'], totales['recetas'], totales['lineas_ingredientes'], time.perf_counter() - inicio),
+        file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,7 @@
+import sys
+
+from src.consola.ConsolaRecetario import main
+
+if __name__ == '__main__':
+    # Punto inicial de la consola: no importa PyQt5 ni necesita pantalla
+    sys.exit(main())
@@ -0,0 +1,76 @@
+'''
+Clase CacheListados: caché en memoria de los listados de la lógica con
+versiones por listado e invalidación explícita
+'''
+import threading
+
+
+class CacheListados:
+
+    def __init__(self):
+        self.candado = threading.Lock()
+        self.entradas = {}
+        self.versiones = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+    def dar(self, nombre, cargar):
+        ''' Retorna el listado guardado o lo carga y lo guarda
+        Parámetros:
+            nombre (string): nombre del listado
+            cargar (function): función sin parámetros que consulta el listado
+        Retorna:
+            (list): una copia del listado con copias de sus diccionarios, que el llamador puede modificar
+        '''
+        with self.candado:
+            version = self.versiones.get(nombre, 0)
+            entrada = self.entradas.get(nombre)
+            if entrada is not None and entrada[0] == version:
+                self.aciertos += 1
+                return self.copiar(entrada[1])
+            self.fallos += 1
+
+        valor = cargar()
+
+        #Si hubo una escritura mientras se cargaba, el valor puede estar desactualizado y no se guarda
+        with self.candado:
+            if self.versiones.get(nombre, 0) == version:
+                self.entradas[nombre] = (version, valor)
+        return self.copiar(valor)
+
+    def copiar(self, listado):
+        #Los diccionarios guardados no se comparten con los llamadores
+        return [dict(fila) for fila in listado]
+
+    def dar_version(self, nombre):
+        ''' Retorna la versión actual del listado '''
+        with self.candado:
+            return self.versiones.get(nombre, 0)
+
+    def guardar_si_vigente(self, nombre, version, guardar):
+        ''' Ejecuta guardar bajo el candado solo si el listado no se ha invalidado
+        Parámetros:
+            nombre (string): nombre del listado
+            version (int): versión leída con dar_version antes de consultar los datos
+            guardar (function): función sin parámetros que guarda los datos consultados
+        Retorna:
+            (bool): True si los datos se guardaron
+        '''
+        with self.candado:
+            if self.versiones.get(nombre, 0) != version:
+                return False
+            guardar()
+            return True
+
+    def invalidar(self, nombre):
+        ''' Descarta el listado y aumenta su versión '''
+        with self.candado:
+            self.versiones[nombre] = self.versiones.get(nombre, 0) + 1
+            self.entradas.pop(nombre, None)
+            self.invalidaciones += 1
+
+    def dar_estadisticas(self):
+        ''' Retorna los contadores de aciertos, fallos e invalidaciones '''
+        with self.candado:
+            return {'aciertos': self.aciertos, 'fallos': self.fallos, 'invalidaciones': self.invalidaciones}
@@ -0,0 +1,126 @@
+'''
+Clase ExportadorCatalogo: escribe el catálogo (recetas, ingredientes y líneas de
+ingredientes de las recetas) en CSV o JSON por línea a medida que se lee. Las
+consultas se leen del cursor por bloques con fetchmany y traen solo columnas, sin
+crear objetos ORM, por lo que la memoria no crece con el tamaño del catálogo
+'''
+import csv
+import json
+
+from sqlalchemy import select
+
+from src.modelo.declarative_base import sesion_transaccional
+from src.modelo.receta import Receta
+from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
+
+
+#Filas que se traen de la base de datos en cada bloque
+TAMANO_BLOQUE = 500
+
+FORMATOS = ('csv', 'jsonl')
+
+#Entidades exportables con sus columnas; recetas_completas es el formato anidado que lee importar_recetas
+ENTIDADES = {
+    'recetas': ['id', 'nombre', 'tiempo', 'personas', 'calorias', 'preparacion'],
+    'ingredientes': ['id', 'nombre', 'unidad', 'valor', 'sitioCompra'],
+    'ingredientes_recetas': ['receta_id', 'receta', 'ingrediente_id', 'ingrediente', 'unidad', 'cantidad'],
+    'recetas_completas': ['nombre', 'tiempo', 'personas', 'calorias', 'preparacion', 'ingredientes'],
+}
+
+
+class ExportadorCatalogo:
+
+    def __init__(self, tamano_bloque=TAMANO_BLOQUE):
+        self.tamano_bloque = tamano_bloque
+
+    def recorrer_consulta(self, session, consulta):
+        ''' Recorre una consulta de Core por bloques de filas desde el cursor, sin cargar el resultado completo '''
+        resultado = session.execute(consulta.execution_options(stream_results=True))
+        try:
+            while True:
+                filas = resultado.fetchmany(self.tamano_bloque)
+                if not filas:
+                    return
+                yield from filas
+        finally:
+            resultado.close()
+
+    def recorrer_recetas(self, session):
+        consulta = select([Receta.id, Receta.nombre, Receta.tiempo, Receta.personas, Receta.calorias,
+                           Receta.preparacion]).order_by(Receta.nombre, Receta.id)
+        for id_receta, nombre, tiempo, personas, calorias, preparacion in self.recorrer_consulta(session, consulta):
+            yield id_receta, nombre, str(tiempo), personas, calorias, preparacion
+
+    def recorrer_ingredientes(self, session):
+        consulta = select([Ingrediente.id, Ingrediente.nombre, Ingrediente.unidad, Ingrediente.valor,
+                           Ingrediente.sitioCompra]).order_by(Ingrediente.nombre, Ingrediente.unidad)
+        return self.recorrer_consulta(session, consulta)
+
+    def recorrer_ingredientes_recetas(self, session):
+        #La llave primaria (ingrediente_id, receta_id) permite recorrer las líneas sin ordenar en memoria
+        consulta = select([RecetaIngrediente.receta_id, Receta.nombre, RecetaIngrediente.ingrediente_id,
+                           Ingrediente.nombre, Ingrediente.unidad, RecetaIngrediente.cantidad]) \
+            .select_from(RecetaIngrediente.__table__
+                         .join(Receta.__table__, Receta.id == RecetaIngrediente.receta_id)
+                         .join(Ingrediente.__table__, Ingrediente.id == RecetaIngrediente.ingrediente_id)) \
+            .order_by(RecetaIngrediente.ingrediente_id, RecetaIngrediente.receta_id)
+        return self.recorrer_consulta(session, consulta)
+
+    def recorrer_recetas_completas(self, session):
+        ''' Recorre las recetas con sus ingredientes; las líneas se consultan por bloques de recetas
+        para no tener que ordenar todas las líneas por el nombre de la receta '''
+        bloque = []
+        for receta in self.recorrer_recetas(session):
+            bloque.append(receta)
+            if len(bloque) >= self.tamano_bloque:
+                yield from self.completar_bloque(session, bloque)
+                bloque = []
+        if bloque:
+            yield from self.completar_bloque(session, bloque)
+
+    def completar_bloque(self, session, bloque):
+        lineas = {}
+        consulta = select([RecetaIngrediente.receta_id, Ingrediente.nombre, Ingrediente.unidad,
+                           RecetaIngrediente.cantidad]) \
+            .select_from(RecetaIngrediente.__table__
+                         .join(Ingrediente.__table__, Ingrediente.id == RecetaIngrediente.ingrediente_id)) \
+            .where(RecetaIngrediente.receta_id.in_([receta[0] for receta in bloque])) \
+            .order_by(RecetaIngrediente.receta_id, Ingrediente.nombre, Ingrediente.unidad)
+        #Las líneas de un bloque de recetas se traen juntas; su cantidad está acotada por el bloque
+        for id_receta, nombre, unidad, cantidad in session.execute(consulta).fetchall():
+            lineas.setdefault(id_receta, []).append({'nombre': nombre, 'unidad': unidad, 'cantidad': cantidad})
+        for id_receta, *receta in bloque:
+            yield (*receta, lineas.get(id_receta, []))
+
+    def exportar(self, entidad, salida, formato='jsonl'):
+        ''' Escribe todas las filas de una entidad en la salida
+        Parámetros:
+            entidad (string): una de las llaves de ENTIDADES
+            salida (file): archivo de texto abierto para escritura
+            formato (string): 'csv' con encabezados o 'jsonl' con un objeto JSON por línea
+        Retorna:
+            (int): la cantidad de filas escritas
+        '''
+        if entidad not in ENTIDADES:
+            raise ValueError("Entidad desconocida: %s" % entidad)
+        if formato not in FORMATOS:
+            raise ValueError("Formato desconocido: %s" % formato)
+        if formato == 'csv' and entidad == 'recetas_completas':
+            raise ValueError("Las recetas completas solo se exportan en JSON por línea")
+
+        columnas = ENTIDADES[entidad]
+        if formato == 'csv':
+            escritor = csv.writer(salida, lineterminator='\n')
+            escritor.writerow(columnas)
+            escribir = escritor.writerow
+        else:
+            def escribir(fila):
+                salida.write(json.dumps(dict(zip(columnas, fila)), ensure_ascii=False) + '\n')
+
+        cantidad = 0
+        with sesion_transaccional() as session:
+            for fila in getattr(self, 'recorrer_' + entidad)(session):
+                escribir(fila)
+                cantidad += 1
+        salida.flush()
+        return cantidad
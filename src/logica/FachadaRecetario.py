@@ -10,6 +10,21 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
     
+    def suscribir_cambios(self, observador, entidad=None):
+        ''' Registra una función que se llama cada vez que se crea, actualiza o elimina una receta o un ingrediente
+        Parámetros:
+            observador (function): función que recibe un EventoCambio con el tipo de cambio, la entidad y su id
+            entidad (string): 'receta' o 'ingrediente' para recibir solo esos cambios, None para todos
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def cancelar_suscripcion_cambios(self, observador):
+        ''' Deja de enviar cambios a un observador registrado con suscribir_cambios
+        Parámetros:
+            observador (function): la función registrada
+        '''
+        raise NotImplementedError("Método no implementado")
+
     def dar_receta(self, id_receta):
         ''' Retorna una receta a partir de su identificador
         Parámetros:
@@ -18,7 +33,27 @@ class FachadaRecetario:
             (dict): La receta identificada con el id_receta recibido como parámetro
         '''
         raise NotImplementedError("Método no implementado")
-    
+
+    def dar_receta_por_id(self, id_receta):
+        ''' Retorna una receta a partir de su llave primaria en la base de datos
+        Parámetros:
+            id_receta (int): El id de la receta en la tabla receta
+        Retorna:
+            (dict): La receta con el id recibido o None si no existe
+        '''
+        raise NotImplementedError("Método no implementado")
+
+
+    def dar_pagina_recetas(self, despues_de=None, tamano_pagina=50):
+        ''' Retorna una página de recetas ordenadas por nombre e id
+        Parámetros:
+            despues_de (tuple): (nombre, id) de la última receta ya mostrada, None para la primera página
+            tamano_pagina (int): cantidad máxima de recetas de la página
+        Retorna:
+            (dict): 'elementos' con las recetas de la página y 'siguiente' con la llave
+                para pedir la página siguiente o None si no hay más recetas
+        '''
+        raise NotImplementedError("Método no implementado")
 
     def validar_crear_editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
         ''' Valida que una receta se pueda crear o editar
@@ -45,6 +80,32 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
 
+    def crear_receta_con_id(self, receta, tiempo, personas, calorias, preparacion):
+        ''' Crea una nueva receta e informa su id en la base de datos
+        Parámetros:
+            receta (string): El nombre de la receta
+            tiempo (string): El tiempo de preparación de la receta
+            personas (string): La cantidad de personas de la receta
+            calorias (string): Calorías por porción
+            preparación (string): Proceso de preparación de la receta
+        Retorna:
+            (int, string): el id de la receta creada, o None si no se pudo guardar, y el mensaje del resultado
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def importar_recetas(self, lineas, tamano_lote=500):
+        ''' Crea recetas completas, con sus ingredientes, desde líneas JSON
+        Parámetros:
+            lineas (iterable): una receta JSON por línea con nombre, tiempo, personas, calorias,
+            preparacion e ingredientes (lista de nombre, unidad y cantidad). Una receta con algún
+            ingrediente inexistente, repetido o con cantidad inválida no se importa
+            tamano_lote (int): recetas que se guardan en cada transacción
+        Retorna:
+            (dict): 'importadas' con la cantidad de recetas creadas, 'lineas_ingredientes' con la
+            cantidad de ingredientes agregados y 'errores' con la lista de (número de línea, mensaje)
+        '''
+        raise NotImplementedError("Método no implementado")
+
     def editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
         ''' Edita los datos de una receta
         Parámetros:
@@ -64,6 +125,25 @@ class FachadaRecetario:
         raise NotImplementedError("Método no implementado")
     
 
+    def editar_receta_por_id(self, id_receta, receta, tiempo, personas, calorias, preparacion):
+        ''' Edita una receta a partir de su llave primaria en la base de datos
+        Parámetros:
+            id_receta (int): El id de la receta en la tabla receta
+            receta, tiempo, personas, calorias, preparacion: los mismos datos de editar_receta
+        Retorna:
+            (string): el mensaje con el resultado
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def eliminar_receta_por_id(self, id_receta):
+        ''' Elimina una receta a partir de su llave primaria en la base de datos
+        Parámetros:
+            id_receta (int): El id de la receta en la tabla receta
+        Retorna:
+            (string): el mensaje con el resultado o None si la receta no existe
+        '''
+        raise NotImplementedError("Método no implementado")
+
     def dar_ingredientes(self):
         ''' Retorna la lista de ingredientes
         Retorna:
@@ -71,6 +151,19 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
     
+    def dar_pagina_ingredientes(self, despues_de=None, tamano_pagina=50, orden='nombre', descendente=False):
+        ''' Retorna una página de ingredientes ordenados por nombre, unidad e id o por unidad, nombre e id
+        Parámetros:
+            despues_de (tuple): llave del último ingrediente ya mostrado, None para la primera página
+            tamano_pagina (int): cantidad máxima de ingredientes de la página
+            orden (string): 'nombre' o 'unidad', columna por la que se ordena el listado
+            descendente (bool): si el listado va de mayor a menor
+        Retorna:
+            (dict): 'elementos' con los ingredientes de la página y 'siguiente' con la llave
+                para pedir la página siguiente o None si no hay más ingredientes
+        '''
+        raise NotImplementedError("Método no implementado")
+
     def dar_ingrediente(self, id_ingrediente):
         ''' Retorna un ingrediente dado su id
         Retorna:
@@ -78,9 +171,29 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
 
-    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra):
+    def dar_ingrediente_por_id(self, id_ingrediente):
+        ''' Retorna un ingrediente a partir de su llave primaria en la base de datos
+        Parámetros:
+            id_ingrediente (int): El id del ingrediente en la tabla ingrediente
+        Retorna:
+            (dict): el ingrediente con el id recibido o None si no existe
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def buscar_ingrediente(self, nombre, unidad):
+        ''' Retorna el ingrediente con el nombre y la unidad recibidos
+        Parámetros:
+            nombre (string): El nombre del ingrediente
+            unidad (string): Unidad
+        Retorna:
+            (dict): el ingrediente encontrado o None si no existe
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def validar_crear_editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompra):
         ''' Valida que un ingrediente se pueda crear o editar
         Parámetros:
+            id_ingrediente (int): La posición del ingrediente en la lista de ingredientes, o -1 si es nuevo
             nombre (string): El nombre del ingrediente
             unidad (string): Unidad
             valor (string): Valor del ingrediente para la unidad
@@ -103,6 +216,29 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
 
+    def crear_ingrediente_con_id(self, nombre, unidad, valor, sitioCompra):
+        ''' Crea un ingrediente e informa su id en la base de datos
+        Parámetros:
+            nombre (string): El nombre del ingrediente
+            unidad (string): Unidad
+            valor (string): Valor del ingrediente para la unidad
+            sitioCompra (string): lugar en el que se compra el ingrediente
+        Retorna:
+            (int, string): el id del ingrediente creado, o None si no se pudo guardar, y el mensaje del resultado
+        '''
+        raise NotImplementedError("Método no implementado")
+
+
+    def importar_ingredientes(self, filas, tamano_lote=1000):
+        ''' Crea muchos ingredientes a la vez, por ejemplo desde la lista de precios de un proveedor
+        Parámetros:
+            filas (iterable): diccionarios con nombre, unidad, valor y sitioCompra
+            tamano_lote (int): ingredientes que se guardan en cada transacción
+        Retorna:
+            (dict): 'importados' con la cantidad de ingredientes creados y 'errores' con la
+            lista de (número de fila, mensaje) de las filas que no se importaron
+        '''
+        raise NotImplementedError("Método no implementado")
 
     def editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
         ''' Edita un ingrediente
@@ -121,6 +257,40 @@ class FachadaRecetario:
             id_ingrediente (int): El identificador del ingrediente que se desea eliminar
         '''
         raise NotImplementedError("Método no implementado")
+
+    def validar_crear_editar_ingrediente_por_id(self, id_ingrediente, nombre, unidad, valor, sitioCompra):
+        ''' Valida que un ingrediente se pueda crear o editar a partir de su id en la base de datos
+        Parámetros:
+            id_ingrediente (int): El id del ingrediente a editar o None si es un ingrediente nuevo
+            nombre (string): El nombre del ingrediente
+            unidad (string): Unidad
+            valor (string): Valor del ingrediente para la unidad
+            sitioCompra (string): lugar en el que se compra el ingrediente
+        Retorna:
+            (string): El mensaje de error generado al presentarse errores en la
+            validación o una cadena de caracteres vacía si no hay errores.
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def editar_ingrediente_por_id(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
+        ''' Edita un ingrediente a partir de su id en la base de datos
+        Parámetros:
+            id_ingrediente (int): El id del ingrediente en la tabla ingrediente
+            nombre (string): El nombre del ingrediente
+            unidad (string): Unidad
+            valor (string): Valor del ingrediente para la unidad
+            sitioCompra (string): lugar en el que se compra el ingrediente
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def eliminar_ingrediente_por_id(self, id_ingrediente):
+        ''' Elimina un ingrediente a partir de su id en la base de datos
+        Parámetros:
+            id_ingrediente (int): El id del ingrediente en la tabla ingrediente
+        Retorna:
+            (string): el mensaje con el resultado o None si el ingrediente no existe
+        '''
+        raise NotImplementedError("Método no implementado")
     
     def dar_ingredientes_receta(self, id_receta):
         ''' Retorna el listado de ingredientes de una receta dado si id
@@ -130,6 +300,15 @@ class FachadaRecetario:
             (list) : listado de ingredientes de la receta
         '''
         raise NotImplementedError("Método no implementado")
+
+    def dar_ingredientes_receta_por_id(self, id_receta):
+        ''' Retorna el listado de ingredientes de una receta a partir de su llave primaria
+        Parámetros:
+            id_receta (int): El id de la receta en la tabla receta
+        Retorna:
+            (list) : listado de ingredientes de la receta ordenado por nombre y unidad
+        '''
+        raise NotImplementedError("Método no implementado")
     
     def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
         ''' agregar el ingrediente a la recceta con la cantidad 
@@ -166,6 +345,39 @@ class FachadaRecetario:
         '''
         raise NotImplementedError("Método no implementado")
 		
+    def exportar_catalogo(self, entidad, salida, formato='jsonl'):
+        ''' Escribe una parte del catálogo a medida que se lee de la base de datos
+        Parámetros:
+            entidad (string): 'recetas', 'ingredientes', 'ingredientes_recetas' o 'recetas_completas'
+            (el formato anidado que lee importar_recetas)
+            salida (file): archivo de texto abierto para escritura
+            formato (string): 'csv' o 'jsonl'
+        Retorna:
+            (int): la cantidad de filas escritas
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def dar_costos_recetas(self, ids_recetas=None, cantidad_personas=None):
+        ''' Retorna el costo de varias recetas según la cantidad de cada ingrediente
+        Parámetros:
+            ids_recetas (list): ids de las recetas en la base de datos, None para todas
+            cantidad_personas (int): personas para las que se preparan, None para las personas base
+        Retorna:
+            (dict): costo total de cada receta por su id
+        '''
+        raise NotImplementedError("Método no implementado")
+
+    def dar_preparaciones(self, ids_recetas, cantidades_personas):
+        ''' Calcula la preparación de varias recetas para varias cantidades de personas
+        Parámetros:
+            ids_recetas (list): ids de las recetas en la base de datos
+            cantidades_personas (list): cantidades de personas a evaluar
+        Retorna:
+            (dict) matrices recetas x personas con el tiempo de preparación en segundos
+                y el costo, junto con los ids, nombres y calorías de las recetas
+        '''
+        raise NotImplementedError("Método no implementado")
+
     def dar_preparacion(self, id_receta,cantidad_personas):
         ''' retorna los datos de preparación de una receta para cantidad de personas que entra como parametro
         Parámetros:
@@ -175,3 +387,13 @@ class FachadaRecetario:
             (dic) diccionario con los datos de preparacion de la receta: nombre, cantidad peronas, calorias, costo, tiempo de preparacion},
                   (list) ingredientes de la receta 
         '''
+
+    def dar_preparacion_por_id(self, id_receta, cantidad_personas):
+        ''' Retorna los datos de preparación de una receta a partir de su llave primaria
+        Parámetros:
+            id_receta (int): El id de la receta en la tabla receta
+            cantidad_personas (int): cantidad de personas para las que se va a preparar la receta
+        Retorna:
+            (dict) los mismos datos de dar_preparacion
+        '''
+        raise NotImplementedError("Método no implementado")
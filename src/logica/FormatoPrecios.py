@@ -0,0 +1,81 @@
+'''
+Clase FormatoPrecios: da formato de moneda a los valores de los ingredientes con
+el separador de miles de la configuración regional, sin modificar el locale del proceso
+'''
+import locale
+import threading
+from functools import lru_cache
+
+
+#setlocale es global al proceso; se serializa su uso mientras se leen las convenciones
+candado_locale = threading.Lock()
+
+
+class FormatoPrecios:
+
+    def __init__(self, separador_miles=None, agrupacion=None):
+        if separador_miles is None or agrupacion is None:
+            separador_local, agrupacion_local = self.leer_convenciones_locales()
+            separador_miles = separador_local if separador_miles is None else separador_miles
+            agrupacion = agrupacion_local if agrupacion is None else agrupacion
+        self.separador_miles = separador_miles
+        self.agrupacion = list(agrupacion)
+        self.formatear = lru_cache(maxsize=65536)(self.formatear_valor)
+
+    def leer_convenciones_locales(self):
+        ''' Lee una sola vez el separador de miles y la agrupación de la configuración
+        regional del usuario y restablece la configuración numérica anterior '''
+        with candado_locale:
+            anterior = locale.setlocale(locale.LC_NUMERIC)
+            try:
+                locale.setlocale(locale.LC_NUMERIC, '')
+                convenciones = locale.localeconv()
+            except locale.Error:
+                convenciones = {'thousands_sep': '', 'grouping': []}
+            finally:
+                locale.setlocale(locale.LC_NUMERIC, anterior)
+        return convenciones['thousands_sep'], convenciones['grouping']
+
+    def agrupar_digitos(self, digitos):
+        #Misma interpretación de la agrupación que locale.format_string
+        if not self.separador_miles:
+            return digitos
+        partes = []
+        for tamano in self.intervalos_agrupacion():
+            if len(digitos) <= tamano:
+                break
+            partes.insert(0, digitos[-tamano:])
+            digitos = digitos[:-tamano]
+        partes.insert(0, digitos)
+        return self.separador_miles.join(partes)
+
+    def intervalos_agrupacion(self):
+        ultimo = None
+        for intervalo in self.agrupacion:
+            if intervalo == locale.CHAR_MAX:
+                return
+            if intervalo == 0:
+                while ultimo:
+                    yield ultimo
+                return
+            yield intervalo
+            ultimo = intervalo
+
+    def formatear_valor(self, valor):
+        ''' Retorna el valor con el símbolo $ y separador de miles, por ejemplo $12.500 '''
+        signo = '-' if valor < 0 else ''
+        return f"${signo}{self.agrupar_digitos(str(abs(int(valor))))}"
+
+
+_formato_precios = None
+
+
+def dar_formato_precios():
+    ''' Retorna el formateador de precios del proceso, creándolo la primera vez '''
+    global _formato_precios
+    if _formato_precios is None:
+        formato = FormatoPrecios()
+        with candado_locale:
+            if _formato_precios is None:
+                _formato_precios = formato
+    return _formato_precios
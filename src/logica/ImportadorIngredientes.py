@@ -0,0 +1,98 @@
+'''
+Clase ImportadorIngredientes: carga masiva de ingredientes (por ejemplo la lista
+de precios de un proveedor). Valida todas las filas en memoria contra un conjunto
+con las llaves (nombre, unidad) existentes y las inserta por lotes con un
+executemany de SQLAlchemy Core, una transacción por lote
+'''
+from sqlalchemy.exc import IntegrityError
+
+from src.modelo.declarative_base import sesion_transaccional
+from src.modelo.ingrediente import Ingrediente
+
+
+#Filas insertadas por transacción
+TAMANO_LOTE = 1000
+
+CAMPOS_INGREDIENTE = ['nombre', 'unidad', 'valor', 'sitioCompra']
+
+
+class ImportadorIngredientes:
+
+    def __init__(self, validar_campos):
+        #Validación de campos compartida con la creación de un ingrediente desde la interfaz
+        self.validar_campos = validar_campos
+
+    def dar_llaves_existentes(self):
+        ''' Retorna el conjunto de llaves (nombre, unidad) de los ingredientes guardados '''
+        with sesion_transaccional() as session:
+            return set(session.query(Ingrediente.nombre, Ingrediente.unidad).all())
+
+    def preparar_fila(self, fila, llaves):
+        ''' Valida una fila y la convierte en los valores a insertar
+        Parámetros:
+            fila (dict): la fila leída con los campos nombre, unidad, valor y sitioCompra
+            llaves (set): llaves (nombre, unidad) ya guardadas o aceptadas en esta importación
+        Retorna:
+            (dict, string): los valores a insertar y un mensaje vacío, o None y el mensaje de error
+        '''
+        if not isinstance(fila, dict):
+            return None, "La fila no tiene el formato de un ingrediente."
+        faltantes = [campo for campo in CAMPOS_INGREDIENTE if fila.get(campo) is None]
+        if faltantes:
+            return None, "Faltan los campos: " + ", ".join(faltantes)
+
+        nombre, unidad, valor, sitio_compra = [str(fila[campo]).strip() for campo in CAMPOS_INGREDIENTE]
+        mensaje = self.validar_campos(nombre, unidad, valor, sitio_compra)
+        if mensaje:
+            return None, mensaje
+        if (nombre, unidad) in llaves:
+            return None, "Ya existe un ingrediente con el nombre y la unidad de medida."
+        llaves.add((nombre, unidad))
+        return {'nombre': nombre, 'unidad': unidad, 'valor': int(valor.replace("$", "")),
+                'sitioCompra': sitio_compra}, ""
+
+    def insertar_lote(self, lote):
+        ''' Inserta un lote de ingredientes con un solo executemany en su propia transacción '''
+        with sesion_transaccional() as session:
+            session.execute(Ingrediente.__table__.insert(), lote)
+
+    def importar(self, filas, tamano_lote=TAMANO_LOTE):
+        ''' Importa los ingredientes de una secuencia de filas
+        Parámetros:
+            filas (iterable): diccionarios con nombre, unidad, valor y sitioCompra; se recorren una sola vez
+            tamano_lote (int): filas por transacción
+        Retorna:
+            (dict): 'importados' con la cantidad de ingredientes creados y 'errores' con la lista
+                de (número de fila, mensaje) de las filas rechazadas, en orden
+        '''
+        llaves = self.dar_llaves_existentes()
+        importados = 0
+        errores = []
+        lote = []
+        numeros_lote = []
+        for numero_fila, fila in enumerate(filas, 1):
+            valores, mensaje = self.preparar_fila(fila, llaves)
+            if valores is None:
+                errores.append((numero_fila, mensaje))
+                continue
+            lote.append(valores)
+            numeros_lote.append(numero_fila)
+            if len(lote) >= tamano_lote:
+                importados += self.guardar_lote(lote, numeros_lote, errores)
+                lote = []
+                numeros_lote = []
+        if lote:
+            importados += self.guardar_lote(lote, numeros_lote, errores)
+        errores.sort()
+        return {'importados': importados, 'errores': errores}
+
+    def guardar_lote(self, lote, numeros_lote, errores):
+        ''' Inserta el lote; si otra sesión creó alguno de sus ingredientes mientras se
+        importaba, el lote completo se revierte y sus filas se informan como errores '''
+        try:
+            self.insertar_lote(lote)
+            return len(lote)
+        except IntegrityError as e:
+            for numero_fila in numeros_lote:
+                errores.append((numero_fila, "Error al guardar el lote: %s" % e.orig))
+            return 0
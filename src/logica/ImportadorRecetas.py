@@ -0,0 +1,144 @@
+'''
+Clase ImportadorRecetas: carga recetas completas, con sus ingredientes, desde un
+archivo con una receta JSON por línea. Lee una receta a la vez y solo mantiene en
+memoria el lote en curso; los ingredientes se resuelven con un diccionario
+(nombre, unidad) -> id construido una sola vez, y cada lote de recetas y sus
+líneas se guarda en una transacción. Una receta con algún ingrediente inválido
+se rechaza completa
+'''
+import json
+from datetime import datetime
+
+from src.modelo.declarative_base import sesion_transaccional
+from src.modelo.receta import Receta
+from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
+
+
+#Recetas guardadas por transacción; también acota los nombres de cada consulta IN
+TAMANO_LOTE = 500
+
+CAMPOS_RECETA = ['nombre', 'tiempo', 'personas', 'calorias', 'preparacion']
+
+
+class ImportadorRecetas:
+
+    def __init__(self, validar_campos, validar_cantidad):
+        #Validaciones compartidas con la creación de recetas desde la interfaz
+        self.validar_campos = validar_campos
+        self.validar_cantidad = validar_cantidad
+
+    def dar_ingredientes_por_llave(self):
+        ''' Retorna el diccionario (nombre, unidad) -> id de todos los ingredientes '''
+        with sesion_transaccional() as session:
+            return {(nombre, unidad): id_ingrediente for id_ingrediente, nombre, unidad in
+                    session.query(Ingrediente.id, Ingrediente.nombre, Ingrediente.unidad)}
+
+    def preparar_receta(self, linea, ingredientes, errores, numero_linea):
+        ''' Valida una línea y la convierte en la receta y las líneas de ingredientes a insertar
+        Parámetros:
+            linea (string): la receta en JSON, en el formato de la exportación
+            ingredientes (dict): ids de los ingredientes por (nombre, unidad)
+            errores (list): lista vacía a la que se agregan los errores de la línea
+        Retorna:
+            (dict, list): los valores de la receta y la lista de (id del ingrediente, cantidad),
+                o None si la receta o alguno de sus ingredientes no se puede importar
+        '''
+        try:
+            receta = json.loads(linea)
+            datos = [str(receta[campo]) for campo in CAMPOS_RECETA]
+            lineas_ingredientes = receta.get('ingredientes', [])
+            if not isinstance(lineas_ingredientes, list):
+                raise TypeError("ingredientes debe ser una lista")
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            errores.append((numero_linea, "formato inválido (%s)" % error))
+            return None, None
+
+        mensaje = self.validar_campos(*datos)
+        if mensaje:
+            errores.append((numero_linea, mensaje))
+            return None, None
+        nombre, tiempo, personas, calorias, preparacion = datos
+        valores = {'nombre': nombre.strip(), 'tiempo': datetime.strptime(tiempo, '%H:%M:%S').time(),
+                   'personas': int(personas), 'calorias': int(calorias), 'preparacion': preparacion}
+
+        lineas = []
+        agregados = set()
+        for ingrediente in lineas_ingredientes:
+            if not isinstance(ingrediente, dict):
+                errores.append((numero_linea, "formato inválido (ingrediente %r)" % (ingrediente,)))
+                continue
+            llave = (ingrediente.get('nombre'), ingrediente.get('unidad'))
+            id_ingrediente = ingredientes.get(llave)
+            if id_ingrediente is None:
+                errores.append((numero_linea, "el ingrediente %s (%s) no existe" % llave))
+                continue
+            cantidad = str(ingrediente.get('cantidad', ''))
+            mensaje = self.validar_cantidad(cantidad) if cantidad else \
+                "Los campos 'ingrediente' y 'cantidad' no pueden estar vacíos."
+            if not mensaje and id_ingrediente in agregados:
+                mensaje = "El ingrediente ya se encuentra almacenado."
+            if mensaje:
+                errores.append((numero_linea, "%s %s (%s)" % (mensaje, *llave)))
+                continue
+            agregados.add(id_ingrediente)
+            lineas.append((id_ingrediente, int(cantidad)))
+        #Una receta con alguna línea de ingrediente inválida no se importa incompleta
+        if errores:
+            return None, None
+        return valores, lineas
+
+    def importar(self, lineas, tamano_lote=TAMANO_LOTE):
+        ''' Importa las recetas de una secuencia de líneas JSON
+        Parámetros:
+            lineas (iterable): líneas de texto, por ejemplo un archivo abierto; se recorren una sola vez
+            tamano_lote (int): recetas por transacción
+        Retorna:
+            (dict): 'importadas' con la cantidad de recetas creadas, 'lineas_ingredientes' con la
+                cantidad de ingredientes agregados a ellas y 'errores' con la lista de
+                (número de línea, mensaje), en orden
+        '''
+        ingredientes = self.dar_ingredientes_por_llave()
+        resultado = {'importadas': 0, 'lineas_ingredientes': 0, 'errores': []}
+        lote = []
+        for numero_linea, linea in enumerate(lineas, 1):
+            if not linea.strip():
+                continue
+            errores_linea = []
+            valores, lineas_receta = self.preparar_receta(linea, ingredientes, errores_linea, numero_linea)
+            if valores is not None:
+                lote.append((numero_linea, valores, lineas_receta))
+            else:
+                resultado['errores'].extend(errores_linea)
+            if len(lote) >= tamano_lote:
+                self.guardar_lote(lote, resultado)
+                lote = []
+        if lote:
+            self.guardar_lote(lote, resultado)
+        resultado['errores'].sort()
+        return resultado
+
+    def guardar_lote(self, lote, resultado):
+        ''' Inserta las recetas del lote y sus líneas de ingredientes en una sola transacción.
+        Las recetas cuyo nombre ya existe, en la base de datos o antes en el mismo lote, se
+        informan como errores '''
+        tabla_recetas = Receta.__table__
+        with sesion_transaccional() as session:
+            nombres = [valores['nombre'] for _, valores, _ in lote]
+            existentes = {nombre for nombre, in session.query(Receta.nombre).filter(Receta.nombre.in_(nombres))}
+
+            importadas = 0
+            filas_ingredientes = []
+            for numero_linea, valores, lineas_receta in lote:
+                if valores['nombre'] in existentes:
+                    resultado['errores'].append((numero_linea, "Ya existe una receta con el nombre."))
+                    continue
+                existentes.add(valores['nombre'])
+                #El nombre no es único en la tabla: cada receta se inserta sola para tomar su propia llave
+                id_receta = session.execute(tabla_recetas.insert(), valores).inserted_primary_key[0]
+                importadas += 1
+                filas_ingredientes.extend({'receta_id': id_receta, 'ingrediente_id': id_ingrediente,
+                                           'cantidad': cantidad} for id_ingrediente, cantidad in lineas_receta)
+            if filas_ingredientes:
+                session.execute(RecetaIngrediente.__table__.insert(), filas_ingredientes)
+        resultado['importadas'] += importadas
+        resultado['lineas_ingredientes'] += len(filas_ingredientes)
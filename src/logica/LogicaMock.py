@@ -64,7 +64,7 @@ class LogicaMock(FachadaRecetario):
     def dar_ingrediente(self, id_ingrediente):
         return self.ingredientes[id_ingrediente].copy()
 
-    def validar_crear_editar_ingrediente(self, nombre, unidad, valor, sitioCompra):
+    def validar_crear_editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompra):
         return ""
 		
     def crear_ingrediente(self, nombre, unidad, valor, sitioCompras):
@@ -0,0 +1,82 @@
+'''
+Clase MotorCostos: calcula en SQL el costo de las recetas según la cantidad de
+cada ingrediente y el número de personas
+'''
+from sqlalchemy import Float, cast, func, literal
+
+from src.modelo.declarative_base import sesion_transaccional
+from src.modelo.receta import Receta
+from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
+
+
+#Cantidad máxima de ids por cláusula IN, por debajo del límite de parámetros de SQLite
+TAMANO_BLOQUE = 500
+
+
+class MotorCostos:
+
+    def expresion_costo_linea(self, cantidad_personas=None):
+        ''' Construye la expresión SQL del costo de una línea de ingrediente
+        Parámetros:
+            cantidad_personas (int): personas para las que se prepara la receta,
+                None para usar las personas base de la receta
+        Retorna:
+            la expresión valor * cantidad * personas / personas base
+        '''
+        costo_base = cast(Ingrediente.valor, Float) * RecetaIngrediente.cantidad
+        if cantidad_personas is None:
+            return costo_base
+        return costo_base * literal(float(cantidad_personas)) / Receta.personas
+
+    def dar_costos_lineas(self, ids_recetas, cantidad_personas=None):
+        ''' Retorna el costo de cada línea de ingrediente de las recetas
+        Parámetros:
+            ids_recetas (list): ids de las recetas en la base de datos
+            cantidad_personas (int): personas para las que se preparan las recetas
+        Retorna:
+            (list): diccionarios con receta_id, nombre, unidad, cantidad, valor y costo,
+                ordenados por receta, nombre y unidad del ingrediente
+        '''
+        lineas = []
+        with sesion_transaccional() as session:
+            for bloque in self.dividir_en_bloques(sorted(ids_recetas)):
+                filas = session.query(
+                        RecetaIngrediente.receta_id,
+                        Ingrediente.nombre,
+                        Ingrediente.unidad,
+                        RecetaIngrediente.cantidad,
+                        Ingrediente.valor,
+                        self.expresion_costo_linea(cantidad_personas).label('costo')) \
+                    .join(Ingrediente, Ingrediente.id == RecetaIngrediente.ingrediente_id) \
+                    .join(Receta, Receta.id == RecetaIngrediente.receta_id) \
+                    .filter(RecetaIngrediente.receta_id.in_(bloque)) \
+                    .order_by(RecetaIngrediente.receta_id, Ingrediente.nombre, Ingrediente.unidad).all()
+                lineas.extend(fila._asdict() for fila in filas)
+        return lineas
+
+    def dar_costos_recetas(self, ids_recetas=None, cantidad_personas=None):
+        ''' Retorna el costo total de varias recetas en una sola consulta agregada
+        Parámetros:
+            ids_recetas (list): ids de las recetas, None para todo el catálogo
+            cantidad_personas (int): personas para las que se preparan las recetas
+        Retorna:
+            (dict): costo total por id de receta; las recetas sin ingredientes cuestan 0
+        '''
+        with sesion_transaccional() as session:
+            consulta = session.query(
+                    Receta.id,
+                    func.coalesce(func.sum(self.expresion_costo_linea(cantidad_personas)), 0.0)) \
+                .outerjoin(RecetaIngrediente, RecetaIngrediente.receta_id == Receta.id) \
+                .outerjoin(Ingrediente, Ingrediente.id == RecetaIngrediente.ingrediente_id) \
+                .group_by(Receta.id)
+            if ids_recetas is None:
+                return {id_receta: float(costo) for id_receta, costo in consulta.all()}
+
+            costos = {}
+            for bloque in self.dividir_en_bloques(list(ids_recetas)):
+                costos.update((id_receta, float(costo)) for id_receta, costo in consulta.filter(Receta.id.in_(bloque)))
+            return costos
+
+    def dividir_en_bloques(self, ids):
+        for inicio in range(0, len(ids), TAMANO_BLOQUE):
+            yield ids[inicio:inicio + TAMANO_BLOQUE]
@@ -0,0 +1,53 @@
+'''
+Funciones de paginación por llave (keyset) para los listados de la lógica
+'''
+from sqlalchemy import and_, or_
+
+
+#Cantidad de elementos por página cuando no se indica otra
+TAMANO_PAGINA = 50
+
+
+def filtro_despues_de(columnas, valores, descendente=False):
+    ''' Construye la condición (c1, c2, ...) > (v1, v2, ...) en orden lexicográfico
+    Parámetros:
+        columnas (list): columnas del ORDER BY, la última debe ser única
+        valores (tuple): valores de esas columnas en el último elemento de la página anterior
+        descendente (bool): si el listado va en orden descendente, en cuyo caso la condición es <
+    Retorna:
+        la expresión c1 >= v1 AND (c1 > v1 OR (c1 = v1 AND c2 > v2) OR ...)
+    '''
+    condiciones = []
+    for posicion, (columna, valor) in enumerate(zip(columnas, valores)):
+        iguales = [anterior == valor_anterior for anterior, valor_anterior in zip(columnas[:posicion], valores[:posicion])]
+        condiciones.append(and_(*iguales, columna < valor if descendente else columna > valor))
+    #La cota redundante sobre la primera columna permite que SQLite busque en el índice en lugar de recorrerlo
+    cota = columnas[0] <= valores[0] if descendente else columnas[0] >= valores[0]
+    return and_(cota, or_(*condiciones))
+
+
+def paginar(consulta, columnas, despues_de, tamano_pagina, descendente=False):
+    ''' Retorna una página de la consulta ordenada por las columnas de la llave
+    Parámetros:
+        consulta (Query): consulta sin ORDER BY ni LIMIT
+        columnas (list): columnas de la llave de paginación
+        despues_de (tuple): llave del último elemento ya mostrado, None para la primera página
+        tamano_pagina (int): cantidad máxima de filas de la página
+        descendente (bool): ordena todas las columnas de la llave de mayor a menor
+    Retorna:
+        (list, tuple): las filas de la página y la llave para pedir la siguiente,
+            o None si no hay más filas
+    '''
+    if tamano_pagina < 1:
+        raise ValueError("El tamaño de la página debe ser un número entero positivo")
+    if despues_de is not None:
+        consulta = consulta.filter(filtro_despues_de(columnas, tuple(despues_de), descendente))
+
+    #Se pide una fila adicional solo para saber si existe una página siguiente
+    orden = [columna.desc() for columna in columnas] if descendente else columnas
+    filas = consulta.order_by(*orden).limit(tamano_pagina + 1).all()
+    if len(filas) <= tamano_pagina:
+        return filas, None
+    filas = filas[:tamano_pagina]
+    ultima = filas[-1]
+    return filas, tuple(getattr(ultima, columna.key) for columna in columnas)
@@ -0,0 +1,70 @@
+'''
+Clase PreparacionMasiva: calcula la preparación de muchas recetas para varias
+cantidades de personas a la vez
+'''
+import numpy as np
+from sqlalchemy import func
+
+from src.logica.MotorCostos import MotorCostos
+from src.modelo.declarative_base import sesion_transaccional
+from src.modelo.receta import Receta
+from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
+
+
+class PreparacionMasiva:
+
+    def __init__(self, motor_costos=None):
+        self.motor_costos = motor_costos or MotorCostos()
+
+    def dar_datos_recetas(self, ids_recetas):
+        ''' Consulta en una sola pasada los datos base y el costo base de las recetas
+        Parámetros:
+            ids_recetas (list): ids de las recetas en la base de datos
+        Retorna:
+            (list): filas con id, nombre, tiempo, personas, calorias y costo para las personas base
+        '''
+        costo_base = func.coalesce(func.sum(self.motor_costos.expresion_costo_linea()), 0.0).label('costo')
+        filas = []
+        with sesion_transaccional() as session:
+            for bloque in self.motor_costos.dividir_en_bloques(list(ids_recetas)):
+                filas.extend(session.query(
+                        Receta.id, Receta.nombre, Receta.tiempo, Receta.personas, Receta.calorias, costo_base) \
+                    .outerjoin(RecetaIngrediente, RecetaIngrediente.receta_id == Receta.id) \
+                    .outerjoin(Ingrediente, Ingrediente.id == RecetaIngrediente.ingrediente_id) \
+                    .filter(Receta.id.in_(bloque)) \
+                    .group_by(Receta.id).all())
+        return filas
+
+    def dar_preparaciones(self, ids_recetas, cantidades_personas):
+        ''' Calcula tiempo y costo de preparación para cada receta y cantidad de personas
+        Parámetros:
+            ids_recetas (list): ids de las recetas en la base de datos
+            cantidades_personas (list): cantidades de personas a evaluar
+        Retorna:
+            (dict): ids_recetas, recetas y calorias por fila; personas por columna;
+                tiempo_preparacion (segundos) y costo como matrices recetas x personas
+        '''
+        ids_recetas = list(dict.fromkeys(ids_recetas))
+        filas = {fila.id: fila for fila in self.dar_datos_recetas(ids_recetas)}
+        filas = [filas[id_receta] for id_receta in ids_recetas if id_receta in filas]
+
+        #Recetas en las filas (vectores columna) y cantidades de personas en las columnas
+        P = np.asarray(cantidades_personas, dtype=float).reshape(1, -1)
+        TR = np.array([fila.tiempo.hour * 3600 + fila.tiempo.minute * 60 + fila.tiempo.second for fila in filas],
+                      dtype=float).reshape(-1, 1)
+        PB = np.array([fila.personas for fila in filas], dtype=float).reshape(-1, 1)
+        costo_base = np.array([fila.costo for fila in filas], dtype=float).reshape(-1, 1)
+
+        #Misma fórmula de dar_preparacion: TPP = TR - ((PB-P)/(2*PB))*TR si P <= PB, 2*TR/3 si no
+        with np.errstate(divide='ignore', invalid='ignore'):
+            TPP = np.where(P <= PB, TR - ((PB - P) / (2 * PB)) * TR, (2 * TR) / 3)
+            costo = costo_base * P / PB
+
+        return {
+            'ids_recetas': np.array([fila.id for fila in filas], dtype=np.int64),
+            'recetas': [fila.nombre for fila in filas],
+            'calorias': np.array([fila.calorias for fila in filas], dtype=float),
+            'personas': P.ravel(),
+            'tiempo_preparacion': TPP,
+            'costo': costo,
+        }
@@ -0,0 +1,62 @@
+'''
+Clase PublicadorCambios: avisa a los observadores suscritos cada vez que la lógica
+crea, actualiza o elimina una receta o un ingrediente
+'''
+import threading
+import weakref
+from collections import namedtuple
+
+#Tipos de cambio
+CREADO = 'creado'
+ACTUALIZADO = 'actualizado'
+ELIMINADO = 'eliminado'
+
+#Entidades que publican cambios
+RECETA = 'receta'
+INGREDIENTE = 'ingrediente'
+
+#Evento publicado: tipo de cambio, entidad afectada y su id en la base de datos;
+#el id es None cuando una operación masiva cambió muchos registros de la entidad
+EventoCambio = namedtuple('EventoCambio', ['tipo', 'entidad', 'id'])
+
+
+class PublicadorCambios:
+
+    def __init__(self):
+        self.candado = threading.Lock()
+        self.suscripciones = []
+
+    def suscribir(self, observador, entidad=None):
+        ''' Registra un observador de cambios
+        Parámetros:
+            observador (function): función que recibe un EventoCambio; los métodos se guardan
+                con una referencia débil para no mantener vivas las ventanas cerradas
+            entidad (string): RECETA o INGREDIENTE para recibir solo esos cambios, None para todos
+        '''
+        referencia = weakref.WeakMethod(observador) if hasattr(observador, '__self__') and hasattr(observador, '__func__') \
+            else (lambda: observador)
+        with self.candado:
+            self.suscripciones.append((referencia, entidad))
+
+    def cancelar_suscripcion(self, observador):
+        ''' Retira todas las suscripciones del observador '''
+        with self.candado:
+            self.suscripciones = [(referencia, entidad) for referencia, entidad in self.suscripciones
+                                  if referencia() not in (None, observador)]
+
+    def publicar(self, tipo, entidad, id_entidad):
+        ''' Envía el evento a los observadores de la entidad
+        Retorna:
+            (EventoCambio): el evento publicado
+        '''
+        evento = EventoCambio(tipo, entidad, id_entidad)
+        with self.candado:
+            self.suscripciones = [(referencia, filtro) for referencia, filtro in self.suscripciones
+                                  if referencia() is not None]
+            observadores = [referencia() for referencia, filtro in self.suscripciones
+                            if filtro is None or filtro == entidad]
+        #Los observadores se llaman fuera del candado para que puedan suscribirse o consultar la lógica
+        for observador in observadores:
+            if observador is not None:
+                observador(evento)
+        return evento
@@ -2,48 +2,205 @@
 Clase Recetario
 '''
 import datetime
-import locale
-from sqlite3 import IntegrityError
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
 from src.logica.FachadaRecetario import FachadaRecetario
-from src.modelo.declarative_base import engine, Base, session
+from src.logica.CacheListados import CacheListados
+from src.logica.ExportadorCatalogo import ExportadorCatalogo
+from src.logica.FormatoPrecios import dar_formato_precios
+from src.logica.ImportadorIngredientes import ImportadorIngredientes, TAMANO_LOTE
+from src.logica.ImportadorRecetas import ImportadorRecetas, TAMANO_LOTE as TAMANO_LOTE_RECETAS
+from src.logica.MotorCostos import MotorCostos
+from src.logica.Paginacion import TAMANO_PAGINA, paginar
+from src.logica.PublicadorCambios import PublicadorCambios, CREADO, ACTUALIZADO, ELIMINADO, RECETA, INGREDIENTE
+from src.modelo.declarative_base import engine, Base, sesion_transaccional, crear_indices_faltantes
 from src.modelo.receta import Receta
 from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
 from datetime import datetime, timedelta
 
+#Columnas de la llave de paginación de los ingredientes según la columna por la que se ordenan
+ORDENES_INGREDIENTES = {
+    'nombre': [Ingrediente.nombre, Ingrediente.unidad, Ingrediente.id],
+    'unidad': [Ingrediente.unidad, Ingrediente.nombre, Ingrediente.id],
+}
+
+
+def validar_campos_receta(receta, tiempo, personas, calorias, preparacion):
+    if not receta:
+        return "El campo receta no debe estar vacío"
+    elif not calorias:
+        return "El campo \"Calorías por porción\" no debe estar vacío"
+    
+    elif not preparacion:
+        return "El campo \"Preparación\" no debe estar vacío."
+    
+    try:
+        if not tiempo:
+            raise ValueError
+        datetime.strptime(tiempo, '%H:%M:%S').time()
+    except ValueError:
+        return "El campo Tiempo de preparación (horas) no debe estar vacío y debe tener el formato HH:MM:SS"
+    
+    
+    try:
+        comensales = int(personas)
+        if comensales < 0:
+            return "El número de comensales de la receta no puede ser negativo"     
+    except ValueError:
+        return "El número de comensales de la receta debe ser un número entero"
+    
+    try:
+        calorias = int(calorias)
+        if calorias < 0:
+            return "El valor de las calorias de la receta debe ser un número entero positivo"     
+    except ValueError:
+        return "El valor de las calorias de la receta debe ser un número entero positivo"
+    return ""
+
+
+def validar_cantidad_ingrediente_receta(cantidad):
+    #Valida la cantidad de un ingrediente en una receta
+    try:
+        valor_entero = int(cantidad)
+        if valor_entero < 0:
+            return "El valor del ingrediente no puede ser negativo"
+    except ValueError:
+        return "La cantidad debe ser un número entero."
+    return ""
+
+
+def validar_campos_ingrediente(nombre, unidad, valor, sitioCompra):
+    if len(nombre) > 255:
+        return "El nombre del ingrediente no puede superar los 255 caracteres."
+    
+    elif len(unidad)>255:
+        return "La unidad de medida no puede superar los 255 caracteres."
+    elif len(sitioCompra)>255:
+        return "El sitio de compra no puede superar los 255 caracteres."
+    
+    #Valida que esten completos todos los campos
+    if not nombre or not unidad or not valor or not sitioCompra:
+        return "Todos los campos son obligatorios. Por favor, complete todos los campos."
+    
+    # Validar que el valor por unidad sea un número entero
+    try:
+        valor_entero = int(valor.replace("$",""))
+        if valor_entero < 0:
+            return "El valor del ingrediente no puede ser negativo"     
+    except ValueError:
+        return "El valor del ingrediente debe ser un número entero"
+    return ""
+
 class Recetario(FachadaRecetario):
 
 
     def __init__(self):
         Base.metadata.create_all(engine) 
+        crear_indices_faltantes()
+        #Índice cacheado con los ids de las recetas en el orden en que se listan
+        self.ids_recetas = None
+        self.cache = CacheListados()
+        self.formato_precios = dar_formato_precios()
+        self.motor_costos = MotorCostos()
+        #NumPy solo se importa cuando se pide un cálculo masivo; la consola y los servicios no lo cargan
+        self.preparacion_masiva = None
+        self.publicador = PublicadorCambios()
+        self.importador_ingredientes = ImportadorIngredientes(validar_campos_ingrediente)
+        self.importador_recetas = ImportadorRecetas(validar_campos_receta, validar_cantidad_ingrediente_receta)
+        self.exportador_catalogo = ExportadorCatalogo()
+
+    def suscribir_cambios(self, observador, entidad=None):
+        self.publicador.suscribir(observador, entidad)
+
+    def cancelar_suscripcion_cambios(self, observador):
+        self.publicador.cancelar_suscripcion(observador)
 
     def dar_recetas(self):
-        recetas = session.query(Receta).all()
-        recetas_ordenadas = sorted(recetas, key=lambda receta: receta.nombre)
-
-        # Lista para almacenar los resultados
-        lista_recetas = []
-
-        # Iterar sobre las recetas y agregar los valores a la lista
-        for receta in recetas_ordenadas:
-            dict_receta = {
-                'nombre': receta.nombre,
-                'tiempo': str(receta.tiempo),
-                'personas': str(receta.personas),
-                'calorias': str(receta.calorias),
-                'preparacion': receta.preparacion}
-            lista_recetas.append(dict_receta)
+        return self.cache.dar('recetas', self.consultar_recetas)
+
+    def consultar_recetas(self):
+        #La versión se lee antes de consultar para no guardar un índice de antes de una escritura
+        version = self.cache.dar_version('recetas')
+        with sesion_transaccional() as session:
+            recetas_ordenadas = session.query(Receta).order_by(Receta.nombre, Receta.id).all()
+
+            #Se reconstruye el índice de posiciones con las recetas que ve la interfaz
+            ids_recetas = [receta.id for receta in recetas_ordenadas]
+            self.guardar_ids_recetas(version, ids_recetas)
+
+            # Lista para almacenar los resultados
+            lista_recetas = []
+
+            # Iterar sobre las recetas y agregar los valores a la lista
+            for receta in recetas_ordenadas:
+                dict_receta = {
+                    'nombre': receta.nombre,
+                    'tiempo': str(receta.tiempo),
+                    'personas': str(receta.personas),
+                    'calorias': str(receta.calorias)}
+                lista_recetas.append(dict_receta)
             
-        # Cerrar la sesión y devolver la lista de recetas
-        session.close()
         return lista_recetas
     
+    def dar_pagina_recetas(self, despues_de=None, tamano_pagina=TAMANO_PAGINA):
+        columnas = [Receta.nombre, Receta.id]
+        with sesion_transaccional() as session:
+            consulta = session.query(Receta.id, Receta.nombre, Receta.tiempo, Receta.personas, Receta.calorias)
+            filas, siguiente = paginar(consulta, columnas, despues_de, tamano_pagina)
+
+        recetas = [{
+            'id': fila.id,
+            'nombre': fila.nombre,
+            'tiempo': str(fila.tiempo),
+            'personas': str(fila.personas),
+            'calorias': str(fila.calorias)} for fila in filas]
+        return {'elementos': recetas, 'siguiente': siguiente}
+
+    def dar_ids_recetas(self):
+        #El índice solo se consulta cuando fue invalidado por una escritura
+        ids_recetas = self.ids_recetas
+        if ids_recetas is None:
+            version = self.cache.dar_version('recetas')
+            with sesion_transaccional() as session:
+                ids = session.query(Receta.id).order_by(Receta.nombre, Receta.id).all()
+            ids_recetas = [id_receta for id_receta, in ids]
+            self.guardar_ids_recetas(version, ids_recetas)
+        return ids_recetas
+
+    def guardar_ids_recetas(self, version, ids_recetas):
+        #Si hubo una escritura mientras se consultaba, el índice puede estar desactualizado y no se guarda
+        def guardar():
+            self.ids_recetas = ids_recetas
+        self.cache.guardar_si_vigente('recetas', version, guardar)
+
+    def dar_id_receta(self, posicion):
+        ids_recetas = self.dar_ids_recetas()
+        if 0 <= posicion < len(ids_recetas):
+            return ids_recetas[posicion]
+        return None
+
+    def invalidar_recetas(self):
+        #Primero la versión: un índice consultado antes ya no se puede guardar después de descartarlo
+        self.cache.invalidar('recetas')
+        self.ids_recetas = None
+
+    def dar_estadisticas_cache(self):
+        return self.cache.dar_estadisticas()
+
     def dar_receta(self, id_receta):
-        recetas_ordenadas = session.query(Receta).order_by(Receta.nombre).all()
-        posicion = id_receta
+        id_receta_bd = self.dar_id_receta(id_receta)
+        if id_receta_bd is None:
+            return None
+        return self.dar_receta_por_id(id_receta_bd)
+
+    def dar_receta_por_id(self, id_receta):
+        with sesion_transaccional() as session:
+            #La preparación se trae en la misma consulta porque la ventana de la receta la muestra
+            receta_seleccionada = session.query(Receta).options(undefer(Receta.preparacion)).get(id_receta)
+            if receta_seleccionada is None:
+                return None
 
-        if 0 <= posicion < len(recetas_ordenadas):
-            receta_seleccionada = recetas_ordenadas[posicion]
-            
             dict_receta = {
                 'id':     receta_seleccionada.id,
                 'nombre': receta_seleccionada.nombre,
@@ -52,161 +209,179 @@ class Recetario(FachadaRecetario):
                 'calorias': str(receta_seleccionada.calorias),
                 'preparacion': receta_seleccionada.preparacion
             }
-            
-            return dict_receta
-        else:
-            return None
+        return dict_receta
     
     def validar_crear_editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
-        if not receta:
-            return "El campo receta no debe estar vacío"
-        elif not calorias:
-            return "El campo \"Calorías por porción\" no debe estar vacío"
-        
-        elif not preparacion:
-            return "El campo \"Preparación\" no debe estar vacío."
-        
-        try:
-            if not tiempo:
-                raise ValueError
-            datetime.strptime(tiempo, '%H:%M:%S').time()
-        except ValueError:
-            return "El campo Tiempo de preparación (horas) no debe estar vacío y debe tener el formato HH:MM:SS"
-        
-        
-        try:
-            comensales = int(personas)
-            if comensales < 0:
-                return "El número de comensales de la receta no puede ser negativo"     
-        except ValueError:
-            return "El número de comensales de la receta debe ser un número entero"
-        
-        try:
-            calorias = int(calorias)
-            if calorias < 0:
-                return "El valor de las calorias de la receta debe ser un número entero positivo"     
-        except ValueError:
-            return "El valor de las calorias de la receta debe ser un número entero positivo"
-        
+        mensaje = validar_campos_receta(receta, tiempo, personas, calorias, preparacion)
+        if mensaje:
+            return mensaje
+
          # Validar si ya existe una receta con el mismo nombre y es una receta nueva
-        receta_existente = session.query(Receta).filter_by(nombre=receta.strip()).all()
+        with sesion_transaccional() as session:
+            receta_existente = session.query(Receta).filter_by(nombre=receta.strip()).all()
 
         if (receta_existente and id_receta == -1) or (len(receta_existente)>1):
             return "Ya existe una receta con el nombre."
         return ""
     
     def crear_receta(self, receta, tiempo, personas, calorias, preparacion):
+        return self.crear_receta_con_id(receta, tiempo, personas, calorias, preparacion)[1]
+
+    def crear_receta_con_id(self, receta, tiempo, personas, calorias, preparacion):
         nueva_receta = Receta(nombre=receta, 
                                    calorias=int(calorias), 
                                    preparacion=preparacion, 
                                    tiempo=datetime.strptime(tiempo, '%H:%M:%S').time(),
                                    personas=int(personas))
-        session.add(nueva_receta)
         try:
-            session.commit()
-            return "La receta ha sido creada exitósamente."
+            with sesion_transaccional() as session:
+                session.add(nueva_receta)
+                session.flush()
+                id_receta = nueva_receta.id
+            self.invalidar_recetas()
+            self.publicador.publicar(CREADO, RECETA, id_receta)
+            return id_receta, "La receta ha sido creada exitósamente."
         except IntegrityError as e:
-            session.rollback()
-            session.close()        
-            return f"Error al crear la receta: {str(e)}, intente nuevamente"
+            return None, f"Error al crear la receta: {str(e)}, intente nuevamente"
+
+    def importar_recetas(self, lineas, tamano_lote=TAMANO_LOTE_RECETAS):
+        resultado = self.importador_recetas.importar(lineas, tamano_lote)
+        if resultado['importadas']:
+            self.invalidar_recetas()
+            #Un solo evento sin id avisa que se crearon muchas recetas a la vez
+            self.publicador.publicar(CREADO, RECETA, None)
+        return resultado
 
     def editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):    
         try:
-            receta_listada= self.dar_receta(id_receta)
-            receta_encontrada = session.query(Receta).filter_by(id=receta_listada['id']).first()
-            receta_encontrada.nombre=receta.strip()
-            receta_encontrada.tiempo = tiempo=datetime.strptime(tiempo, '%H:%M:%S').time()
-            receta_encontrada.persona = int(personas)
-            receta_encontrada.calorias=int(calorias)
-            receta_encontrada.preparacion=preparacion
-            session.commit()
+            id_receta_bd = self.dar_id_receta(id_receta)
+        except Exception as e:
+            return f"Error al editar la receta, intente nuevamente"
+        return self.editar_receta_por_id(id_receta_bd, receta, tiempo, personas, calorias, preparacion)
+
+    def editar_receta_por_id(self, id_receta_bd, receta, tiempo, personas, calorias, preparacion):
+        try:
+            with sesion_transaccional() as session:
+                receta_encontrada = session.query(Receta).get(id_receta_bd)
+                receta_encontrada.nombre=receta.strip()
+                receta_encontrada.tiempo = tiempo=datetime.strptime(tiempo, '%H:%M:%S').time()
+                receta_encontrada.persona = int(personas)
+                receta_encontrada.calorias=int(calorias)
+                receta_encontrada.preparacion=preparacion
+            self.invalidar_recetas()
+            self.publicador.publicar(ACTUALIZADO, RECETA, id_receta_bd)
             return "La receta ha sido actualizada exitósamente."
         except Exception as e:
-            session.rollback()
-            session.close()        
             return f"Error al editar la receta, intente nuevamente"
        
 
     def eliminar_receta(self, id_receta):
         try:
-            receta_listada= self.dar_receta(id_receta)
-            receta_existente = session.query(Receta).filter_by(id=receta_listada['id']).first()
-            relacion_receta = session.query(RecetaIngrediente).filter_by(receta_id=receta_listada['id']).first()
-            if relacion_receta is not None:
-                session.delete(relacion_receta)
-            if receta_existente is not None:
+            id_receta_bd = self.dar_id_receta(id_receta)
+        except Exception as e:
+            return f"Error al eliminar la receta, intente nuevamente"
+        return self.eliminar_receta_por_id(id_receta_bd)
+
+    def eliminar_receta_por_id(self, id_receta_bd):
+        try:
+            with sesion_transaccional() as session:
+                receta_existente = session.query(Receta).get(id_receta_bd)
+                relacion_receta = session.query(RecetaIngrediente).filter_by(receta_id=id_receta_bd).first()
+                if relacion_receta is not None:
+                    session.delete(relacion_receta)
+                if receta_existente is None:
+                    return None
                 session.delete(receta_existente)
-                session.commit()
-                return "La receta ha sido eliminada."
+            self.invalidar_recetas()
+            self.publicador.publicar(ELIMINADO, RECETA, id_receta_bd)
+            return "La receta ha sido eliminada."
         except Exception as e:
-            session.rollback()
-            session.close()        
             return f"Error al eliminar la receta, intente nuevamente"
 
 
 
     def dar_ingredientes(self):
-        #Se establece configuración regional para el formato de miles
-        locale.setlocale(locale.LC_ALL,'')
-
-        ingredientes = session.query(Ingrediente).all()
-        ingredientes_ordenados = sorted(ingredientes, key=lambda ingrediente: (ingrediente.nombre,ingrediente.unidad))
-        lista_ingredientes = []
-        for ingrediente in ingredientes_ordenados:
-            valor_formato = locale.format_string("%d",ingrediente.valor,grouping=True)
-            dict_ingrediente = {
-                'id':ingrediente.id,
-                'nombre': ingrediente.nombre,
-                'unidad': ingrediente.unidad,
-                'valor':  str(f"${valor_formato}"),
-                'sitioCompra': ingrediente.sitioCompra}
-            lista_ingredientes.append(dict_ingrediente)
-        session.close()
+        return self.cache.dar('ingredientes', self.consultar_ingredientes)
+
+    def consultar_ingredientes(self):
+        #El formato de miles se toma del formateador compartido, sin cambiar el locale del proceso
+        with sesion_transaccional() as session:
+            ingredientes = session.query(
+                    Ingrediente.id, Ingrediente.nombre, Ingrediente.unidad, Ingrediente.valor, Ingrediente.sitioCompra) \
+                .order_by(Ingrediente.nombre, Ingrediente.unidad).all()
+            lista_ingredientes = [self.crear_dict_ingrediente(ingrediente) for ingrediente in ingredientes]
         return lista_ingredientes
     
+    def dar_pagina_ingredientes(self, despues_de=None, tamano_pagina=TAMANO_PAGINA, orden='nombre', descendente=False):
+        if orden not in ORDENES_INGREDIENTES:
+            raise ValueError("Orden de ingredientes desconocido: %s" % orden)
+        columnas = ORDENES_INGREDIENTES[orden]
+        with sesion_transaccional() as session:
+            consulta = session.query(
+                Ingrediente.id, Ingrediente.nombre, Ingrediente.unidad, Ingrediente.valor, Ingrediente.sitioCompra)
+            filas, siguiente = paginar(consulta, columnas, despues_de, tamano_pagina, descendente)
+
+        ingredientes = [self.crear_dict_ingrediente(fila) for fila in filas]
+        return {'elementos': ingredientes, 'siguiente': siguiente}
+
+    def crear_dict_ingrediente(self, ingrediente):
+        return {
+            'id': ingrediente.id,
+            'nombre': ingrediente.nombre,
+            'unidad': ingrediente.unidad,
+            'valor': self.formato_precios.formatear(ingrediente.valor),
+            'sitioCompra': ingrediente.sitioCompra}
+
     def dar_ingrediente(self, id_ingrediente):
-        return self.ingredientes[id_ingrediente].copy()
+        return self.dar_ingredientes()[id_ingrediente].copy()
+
+    def dar_ingrediente_por_id(self, id_ingrediente):
+        with sesion_transaccional() as session:
+            ingrediente = session.query(Ingrediente).get(id_ingrediente)
+            if ingrediente is None:
+                return None
+            return self.crear_dict_ingrediente(ingrediente)
+
+    def buscar_ingrediente(self, nombre, unidad):
+        with sesion_transaccional() as session:
+            ingrediente = session.query(Ingrediente).filter_by(nombre=nombre, unidad=unidad).first()
+            if ingrediente is None:
+                return None
+            return self.crear_dict_ingrediente(ingrediente)
 
     def validar_crear_editar_ingrediente(self, id, nombre, unidad, valor, sitioCompra):
-
-        if len(nombre) > 255:
-            return "El nombre del ingrediente no puede superar los 255 caracteres."
-        
-        elif len(unidad)>255:
-            return "La unidad de medida no puede superar los 255 caracteres."
-        elif len(sitioCompra)>255:
-            return "El sitio de compra no puede superar los 255 caracteres."
-        
-        #Valida que esten completos todos los campos
-        if not nombre or not unidad or not valor or not sitioCompra:
-            return "Todos los campos son obligatorios. Por favor, complete todos los campos."
-        
-        # Validar que el valor por unidad sea un número entero
-        try:
-            valor_entero = int(valor.replace("$",""))
-            if valor_entero < 0:
-                return "El valor del ingrediente no puede ser negativo"     
-        except ValueError:
-            return "El valor del ingrediente debe ser un número entero"
-        
-        receta_ingrediente = None
-        ingrediente_existente = session.query(Ingrediente).filter_by(nombre=nombre.strip(), unidad=unidad).all()
-        
-        ingrediente_activo = self.dar_ingredientes()[id]
-
-        if id == -1 and len(ingrediente_existente)==1:
-            # Validar si ya existe un ingrediente nuevo con el mismo nombre y unidad de medida
-            return "Ya existe un ingrediente con el nombre y la unidad de medida."
-        elif len(ingrediente_existente)==1 and ingrediente_existente[0].id != ingrediente_activo['id']:
-            return "Ya existe un ingrediente con el nombre y la unidad de medida."
-        elif len(ingrediente_existente)>1:
-            return "Ya existe un ingrediente con el nombre y la unidad de medida." 
+        mensaje = validar_campos_ingrediente(nombre, unidad, valor, sitioCompra)
+        if mensaje:
+            return mensaje
+
+        id_ingrediente = None if id == -1 else self.dar_ingredientes()[id]['id']
+        return self.validar_ingrediente_unico(id_ingrediente, nombre, unidad)
+
+    def validar_crear_editar_ingrediente_por_id(self, id_ingrediente, nombre, unidad, valor, sitioCompra):
+        mensaje = validar_campos_ingrediente(nombre, unidad, valor, sitioCompra)
+        if mensaje:
+            return mensaje
+        return self.validar_ingrediente_unico(id_ingrediente, nombre, unidad)
+
+    def validar_ingrediente_unico(self, id_ingrediente, nombre, unidad):
+        #id_ingrediente es None cuando se va a crear un ingrediente nuevo
+        with sesion_transaccional() as session:
+            receta_ingrediente = None
+            ingrediente_existente = session.query(Ingrediente).filter_by(nombre=nombre.strip(), unidad=unidad).all()
+
+            if id_ingrediente is None and len(ingrediente_existente)==1:
+                # Validar si ya existe un ingrediente nuevo con el mismo nombre y unidad de medida
+                return "Ya existe un ingrediente con el nombre y la unidad de medida."
+            elif len(ingrediente_existente)==1 and ingrediente_existente[0].id != id_ingrediente:
+                return "Ya existe un ingrediente con el nombre y la unidad de medida."
+            elif len(ingrediente_existente)>1:
+                return "Ya existe un ingrediente con el nombre y la unidad de medida." 
         
 
-        #Validar que sea una edición para determinar si existe en alguna receta o permitirle validar 
-        #que se cambie el nombre siempre y cuando no exista en otro ingrediente
-        if ingrediente_activo:
-            receta_ingrediente = session.query(RecetaIngrediente).filter_by(ingrediente_id=ingrediente_activo['id']).first()
+            #Validar que sea una edición para determinar si existe en alguna receta o permitirle validar 
+            #que se cambie el nombre siempre y cuando no exista en otro ingrediente
+            if id_ingrediente is not None:
+                receta_ingrediente = session.query(RecetaIngrediente).filter_by(ingrediente_id=id_ingrediente).first()
         
         if receta_ingrediente is not None:
             return "Este ingrediente ya existe en una receta."
@@ -214,54 +389,85 @@ class Recetario(FachadaRecetario):
         
 		
     def crear_ingrediente(self, nombre, unidad, valor, sitioCompras):
+        return self.crear_ingrediente_con_id(nombre, unidad, valor, sitioCompras)[1]
+
+    def crear_ingrediente_con_id(self, nombre, unidad, valor, sitioCompras):
         nuevo_ingrediente = Ingrediente(nombre=nombre, unidad=unidad, valor=int(valor), sitioCompra=sitioCompras)
-        session.add(nuevo_ingrediente)
         try:
-            session.commit()
-            return "El ingrediente ha sido creado exitosamente."
+            with sesion_transaccional() as session:
+                session.add(nuevo_ingrediente)
+                session.flush()
+                id_ingrediente = nuevo_ingrediente.id
+            self.cache.invalidar('ingredientes')
+            self.publicador.publicar(CREADO, INGREDIENTE, id_ingrediente)
+            return id_ingrediente, "El ingrediente ha sido creado exitosamente."
         except IntegrityError as e:
-            session.rollback()
-            return f"Error al crear el ingrediente: {str(e)}, intente nuevamente"
-        
-        session.close()    
+            return None, f"Error al crear el ingrediente: {str(e)}, intente nuevamente"
  
 
+    def importar_ingredientes(self, filas, tamano_lote=TAMANO_LOTE):
+        resultado = self.importador_ingredientes.importar(filas, tamano_lote)
+        if resultado['importados']:
+            self.cache.invalidar('ingredientes')
+            #Un solo evento sin id avisa que cambiaron muchos ingredientes a la vez
+            self.publicador.publicar(CREADO, INGREDIENTE, None)
+        return resultado
+
     def editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
+        ingrediente_listado = self.dar_ingredientes()[id_ingrediente]
+        return self.editar_ingrediente_por_id(ingrediente_listado['id'], nombre, unidad, valor, sitioCompras)
+
+    def editar_ingrediente_por_id(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
         try:
-            ingrediente_listado= self.dar_ingredientes()[id_ingrediente]
-            ingrediente_encontrado = session.query(Ingrediente).filter_by(id=ingrediente_listado['id']).first()
-            ingrediente_encontrado.nombre=nombre.strip()
-            ingrediente_encontrado.unidad = unidad.strip()
-            ingrediente_encontrado.valor = int(valor.replace(",","").replace("$","").replace(".",""))
-            ingrediente_encontrado.sitioCompra=sitioCompras.strip()
-            session.commit()
+            with sesion_transaccional() as session:
+                ingrediente_encontrado = session.query(Ingrediente).filter_by(id=id_ingrediente).first()
+                ingrediente_encontrado.nombre=nombre.strip()
+                ingrediente_encontrado.unidad = unidad.strip()
+                ingrediente_encontrado.valor = int(valor.replace(",","").replace("$","").replace(".",""))
+                ingrediente_encontrado.sitioCompra=sitioCompras.strip()
+            self.cache.invalidar('ingredientes')
+            self.publicador.publicar(ACTUALIZADO, INGREDIENTE, id_ingrediente)
             return "El ingrediente ha sido actualizado exitósamente."
         except IntegrityError as e:
-            session.rollback()
-            session.close()        
             return f"Error al editar el ingrediente: {str(e)}, intente nuevamente"
 
 
     def eliminar_ingrediente(self, id_ingrediente):
-        del self.ingredientes[id_ingrediente]
+        ingrediente_listado = self.dar_ingredientes()[id_ingrediente]
+        return self.eliminar_ingrediente_por_id(ingrediente_listado['id'])
+
+    def eliminar_ingrediente_por_id(self, id_ingrediente):
+        try:
+            with sesion_transaccional() as session:
+                ingrediente_existente = session.query(Ingrediente).get(id_ingrediente)
+                if ingrediente_existente is None:
+                    return None
+                #Un ingrediente que usa alguna receta no se elimina para no alterar la receta
+                if session.query(RecetaIngrediente).filter_by(ingrediente_id=id_ingrediente).first() is not None:
+                    return "Este ingrediente ya existe en una receta."
+                session.delete(ingrediente_existente)
+            self.cache.invalidar('ingredientes')
+            self.publicador.publicar(ELIMINADO, INGREDIENTE, id_ingrediente)
+            return "El ingrediente ha sido eliminado."
+        except Exception as e:
+            return f"Error al eliminar el ingrediente, intente nuevamente"
 
     def dar_ingredientes_receta(self, id_receta):
-        recetaProv = self.dar_receta(id_receta)
-        if recetaProv is None:
+        id_receta_bd = self.dar_id_receta(id_receta)
+        if id_receta_bd is None:
             return []
-        
-        receta = session.query(Receta).filter_by(
-            nombre = str(recetaProv['nombre']),
-            tiempo = datetime.strptime(recetaProv['tiempo'], '%H:%M:%S').time(),
-            personas = int(recetaProv['personas']),
-            calorias = int(recetaProv['calorias']),
-            preparacion = recetaProv['preparacion']).first()
+        return self.dar_ingredientes_receta_por_id(id_receta_bd)
 
-        if receta:
-            ingredientes_receta = session.query(Ingrediente.nombre, Ingrediente.unidad, RecetaIngrediente.cantidad) \
-                .join(RecetaIngrediente, Ingrediente.id == RecetaIngrediente.ingrediente_id) \
-                .filter(RecetaIngrediente.receta_id == receta.id).all()
+    def dar_ingredientes_receta_por_id(self, id_receta_bd):
+        with sesion_transaccional() as session:
+            receta = session.query(Receta).get(id_receta_bd)
+            ingredientes_receta = []
+            if receta:
+                ingredientes_receta = session.query(Ingrediente.nombre, Ingrediente.unidad, RecetaIngrediente.cantidad) \
+                    .join(RecetaIngrediente, Ingrediente.id == RecetaIngrediente.ingrediente_id) \
+                    .filter(RecetaIngrediente.receta_id == receta.id).all()
 
+        if receta:
             if ingredientes_receta:
                 lista_ingredientes = []
                 for nombre, unidad, cantidad in ingredientes_receta:
@@ -280,34 +486,45 @@ class Recetario(FachadaRecetario):
         else:
             return []
     
-    def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
-
-        recetaSelec = session.query(Receta).filter_by(
+    def buscar_receta(self, session, receta):
+        ''' Busca en la sesión la receta de un diccionario de dar_receta
+        Parámetros:
+            session (Session): sesión en la que se consulta la receta
+            receta (dict): la receta con su 'id', o con nombre, tiempo, personas y calorías
+        Retorna:
+            (Receta): la receta encontrada o None
+        '''
+        if receta.get('id') is not None:
+            return session.query(Receta).get(receta['id'])
+        #La preparación no se compara: puede estar guardada comprimida o en claro
+        return session.query(Receta).filter_by(
             nombre = str(receta['nombre']),
             tiempo = datetime.strptime(receta['tiempo'], '%H:%M:%S').time(),
             personas = int(receta['personas']),
-            calorias = int(receta['calorias']),
-            preparacion = receta['preparacion']).first()
+            calorias = int(receta['calorias'])).first()
+
+    def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
 
         valor_sin_simbolo = ingrediente['valor'].replace('$', '')  # Eliminar el símbolo '$'
         valor_sin_punto = valor_sin_simbolo.replace(',', '').replace(".","")
-        ingredienteSelec = session.query(Ingrediente).filter_by(
-            nombre = str(ingrediente['nombre']),
-            unidad = str(ingrediente['unidad']),
-            valor = int(valor_sin_punto),
-            sitioCompra = str(ingrediente['sitioCompra'])).first()
-        
-        nuevo_ingrediente = RecetaIngrediente(
-            ingrediente_id=ingredienteSelec.id,
-            receta_id=recetaSelec.id,
-            cantidad=cantidad
-        )
-        session.add(nuevo_ingrediente)
         try:
-            session.commit()
+            with sesion_transaccional() as session:
+                recetaSelec = self.buscar_receta(session, receta)
+
+                ingredienteSelec = session.query(Ingrediente).filter_by(
+                    nombre = str(ingrediente['nombre']),
+                    unidad = str(ingrediente['unidad']),
+                    valor = int(valor_sin_punto),
+                    sitioCompra = str(ingrediente['sitioCompra'])).first()
+                
+                nuevo_ingrediente = RecetaIngrediente(
+                    ingrediente_id=ingredienteSelec.id,
+                    receta_id=recetaSelec.id,
+                    cantidad=cantidad
+                )
+                session.add(nuevo_ingrediente)
             return "El ingrediente ha sido creado exitosamente."
         except IntegrityError as e:
-            session.rollback()
             return f"Error al crear el ingrediente: {str(e)}, intente nuevamente"
 
     def editar_ingrediente_receta(self, id_ingrediente_receta, receta, ingrediente, cantidad):
@@ -333,50 +550,80 @@ class Recetario(FachadaRecetario):
             return "Los campos 'ingrediente' y 'cantidad' no pueden estar vacíos."
 
         # Verificar si la cantidad es un número entero y si es negativa
-        try:
-            valor_entero = int(cantidad)
-            if valor_entero < 0:
-                return "El valor del ingrediente no puede ser negativo"
-        except ValueError:
-            return "La cantidad debe ser un número entero."
+        mensaje = validar_cantidad_ingrediente_receta(cantidad)
+        if mensaje:
+            return mensaje
         
-        recetaSelec = session.query(Receta).filter_by(
-            nombre = str(receta['nombre']),
-            tiempo = datetime.strptime(receta['tiempo'], '%H:%M:%S').time(),
-            personas = int(receta['personas']),
-            calorias = int(receta['calorias']),
-            preparacion = receta['preparacion']).first()
-
-        valor_sin_simbolo = ingrediente['valor'].replace('$', '')  # Eliminar el símbolo '$'
-        valor_sin_punto = valor_sin_simbolo.replace(',', '').replace(".","")  # Eliminar puntos
-        ingredienteSelec = session.query(Ingrediente).filter_by(
-            nombre = str(ingrediente['nombre']),
-            unidad = str(ingrediente['unidad']),
-            valor = int(valor_sin_punto),
-            sitioCompra = str(ingrediente['sitioCompra'])).first()
+        with sesion_transaccional() as session:
+            recetaSelec = self.buscar_receta(session, receta)
+
+            valor_sin_simbolo = ingrediente['valor'].replace('$', '')  # Eliminar el símbolo '$'
+            valor_sin_punto = valor_sin_simbolo.replace(',', '').replace(".","")  # Eliminar puntos
+            ingredienteSelec = session.query(Ingrediente).filter_by(
+                nombre = str(ingrediente['nombre']),
+                unidad = str(ingrediente['unidad']),
+                valor = int(valor_sin_punto),
+                sitioCompra = str(ingrediente['sitioCompra'])).first()
         
-        # Verificar si existe una relación en la tabla Receta_ingrediente
-        relacion_existente = session.query(RecetaIngrediente).filter_by(
-            receta_id=recetaSelec.id,
-            ingrediente_id=ingredienteSelec.id,
-        ).first()
+            # Verificar si existe una relación en la tabla Receta_ingrediente
+            relacion_existente = session.query(RecetaIngrediente).filter_by(
+                receta_id=recetaSelec.id,
+                ingrediente_id=ingredienteSelec.id,
+            ).first()
         
         # Verificar si la cantidad es diferente a la almacenada en la tabla
         if relacion_existente is not None:
             return "El ingrediente ya se encuentra almacenado."
         return ""
 
+    def exportar_catalogo(self, entidad, salida, formato='jsonl'):
+        return self.exportador_catalogo.exportar(entidad, salida, formato)
+
+    def dar_costos_recetas(self, ids_recetas=None, cantidad_personas=None):
+        return self.motor_costos.dar_costos_recetas(ids_recetas, cantidad_personas)
+
+    def dar_preparaciones(self, ids_recetas, cantidades_personas):
+        if self.preparacion_masiva is None:
+            from src.logica.PreparacionMasiva import PreparacionMasiva
+            self.preparacion_masiva = PreparacionMasiva(self.motor_costos)
+        return self.preparacion_masiva.dar_preparaciones(ids_recetas, cantidades_personas)
+
     def dar_preparacion(self, id_receta,cantidad_personas):
         try:
             #Obtengo el id de la receta en la tabla Receta
-            receta = self.dar_receta(id_receta)
-            if receta is not None:
-                #Se realiza el calculo de la preparación
-                tiempoReceta = datetime.strptime(receta['tiempo'], '%H:%M:%S').time()
-                TR = tiempoReceta.hour * 3600 + tiempoReceta.minute * 60 + tiempoReceta.second
-                PB = int(receta['personas'])
-            else:
+            id_receta_bd = self.dar_id_receta(id_receta)
+        except Exception:
+            return "Error al preparar receta"
+        if id_receta_bd is None:
+            return {}
+        return self.dar_preparacion_por_id(id_receta_bd, cantidad_personas)
+
+    def dar_preparacion_por_id(self, id_receta_bd, cantidad_personas):
+        try:
+            #Una sola consulta trae la receta, sus ingredientes y el costo total
+            costo_linea = self.motor_costos.expresion_costo_linea(cantidad_personas)
+            with sesion_transaccional() as session:
+                filas = session.query(
+                        Receta.nombre.label('receta'),
+                        Receta.tiempo,
+                        Receta.personas,
+                        Receta.calorias,
+                        Ingrediente.nombre,
+                        Ingrediente.unidad,
+                        RecetaIngrediente.cantidad,
+                        costo_linea.label('costo_linea'),
+                        func.sum(costo_linea).over().label('costo')) \
+                    .outerjoin(RecetaIngrediente, RecetaIngrediente.receta_id == Receta.id) \
+                    .outerjoin(Ingrediente, Ingrediente.id == RecetaIngrediente.ingrediente_id) \
+                    .filter(Receta.id == id_receta_bd) \
+                    .order_by(Ingrediente.nombre, Ingrediente.unidad).all()
+            if not filas:
                 return {}
+            receta = filas[0]
+
+            #Se realiza el calculo de la preparación
+            TR = receta.tiempo.hour * 3600 + receta.tiempo.minute * 60 + receta.tiempo.second
+            PB = int(receta.personas)
                 
             if cantidad_personas <= PB:
                 TPP = TR - ((PB-cantidad_personas)/(2*PB))*TR
@@ -385,30 +632,25 @@ class Recetario(FachadaRecetario):
 
             TP = str(timedelta(seconds=TPP)) #convierto de segundos al formato
 
-            #Obtengo los ingredientes de la receta
-            costoTotalReceta = 0
+            #Ingredientes de la receta; sin ingredientes el outer join deja una fila vacía
             datos_ingredientes = []  # Lista para almacenar los diccionarios de ingredientes
-            lista_ingredientes = self.dar_ingredientes_receta(id_receta)
-            for ingrediente in lista_ingredientes:
-                ingredienteOriginal = session.query(Ingrediente).filter_by(
-                    nombre=ingrediente['ingrediente'],
-                    unidad=ingrediente['unidad']
-                ).first()
+            for fila in filas:
+                if fila.nombre is None:
+                    continue
                 dict_ingrediente = {
-                    'nombre': ingrediente['ingrediente'],
-                    'unidad': ingrediente['unidad'],
-                    'cantidad': str(ingrediente['cantidad']),
-                    'valor': float(ingredienteOriginal.valor)
+                    'nombre': fila.nombre,
+                    'unidad': fila.unidad,
+                    'cantidad': str(fila.cantidad),
+                    'valor': float(fila.costo_linea)
                 }
-                costoTotalReceta = ingredienteOriginal.valor + costoTotalReceta
                 datos_ingredientes.append(dict_ingrediente)
 
             #Se retorna un diccionario con la información de la receta    
             dict_receta = {
-                    'receta': receta['nombre'],
+                    'receta': receta.receta,
                     'personas': str(cantidad_personas),
-                    'calorias': str(receta['calorias']),
-                    'costo' : float(costoTotalReceta),
+                    'calorias': str(receta.calorias),
+                    'costo' : float(receta.costo or 0),
                     'tiempo_preparacion': str(TP),
                     'datos_ingredientes': datos_ingredientes,
                 }
@@ -0,0 +1,248 @@
+'''
+Clase RecetarioAsincrono: versión asyncio de la fachada del recetario. Ejecuta la
+lógica en un pool acotado de hilos, limita las llamadas concurrentes, aplica tiempos
+límite y comparte entre llamadores las consultas idénticas que están en curso
+'''
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+from src.logica.Recetario import Recetario
+from src.modelo.declarative_base import cerrar_sesion
+
+
+#Hilos del pool cuando no se indica otra cantidad
+MAX_HILOS = 4
+
+#Métodos de solo lectura: las llamadas idénticas en curso comparten una sola consulta
+CONSULTAS = frozenset([
+    'dar_recetas', 'dar_receta', 'dar_receta_por_id', 'dar_pagina_recetas', 'validar_crear_editar_receta',
+    'dar_ingredientes', 'dar_pagina_ingredientes', 'dar_ingrediente', 'dar_ingrediente_por_id',
+    'buscar_ingrediente', 'validar_crear_editar_ingrediente', 'validar_crear_editar_ingrediente_por_id',
+    'dar_ingredientes_receta', 'dar_ingredientes_receta_por_id', 'validar_crear_editar_ingReceta',
+    'dar_costos_recetas', 'dar_preparaciones', 'dar_preparacion', 'dar_preparacion_por_id',
+])
+
+
+class RecetarioAsincrono:
+
+    def __init__(self, logica=None, max_hilos=MAX_HILOS, max_concurrentes=None, tiempo_limite=None):
+        ''' Crea la fachada asíncrona
+        Parámetros:
+            logica (FachadaRecetario): lógica a ejecutar, por defecto un Recetario nuevo
+            max_hilos (int): hilos del pool que ejecutan la lógica
+            max_concurrentes (int): llamadas que pueden estar en el pool al mismo tiempo; las demás esperan
+                en el ciclo de eventos sin ocupar un hilo. Por defecto max_hilos
+            tiempo_limite (float): segundos que espera cada llamada, None para esperar sin límite
+        '''
+        if max_hilos < 1:
+            raise ValueError("La cantidad de hilos debe ser un número entero positivo")
+        self.logica = logica if logica is not None else Recetario()
+        self.ejecutor = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix='recetario')
+        self.max_concurrentes = max_concurrentes or max_hilos
+        self.tiempo_limite = tiempo_limite
+        #El semáforo y las consultas en curso pertenecen al ciclo de eventos en el que se crearon
+        self.ciclo = None
+        self.semaforo = None
+        self.en_curso = {}
+        self.consultas_compartidas = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, tipo, valor, traza):
+        #La espera del pool se hace en otro hilo para no bloquear el ciclo de eventos
+        await asyncio.get_running_loop().run_in_executor(None, self.cerrar)
+
+    def cerrar(self):
+        ''' Espera a que terminen las llamadas en el pool y lo libera. Desde una corrutina se usa
+        async with, que hace esta espera fuera del ciclo de eventos '''
+        self.ejecutor.shutdown(wait=True)
+
+    def preparar_ciclo(self):
+        ciclo = asyncio.get_running_loop()
+        if ciclo is not self.ciclo:
+            self.ciclo = ciclo
+            self.semaforo = asyncio.Semaphore(self.max_concurrentes)
+            self.en_curso = {}
+
+    def ejecutar_en_hilo(self, nombre, argumentos):
+        ''' Ejecuta el método de la lógica en el hilo del pool y libera la sesión del hilo al terminar '''
+        try:
+            return getattr(self.logica, nombre)(*argumentos)
+        finally:
+            cerrar_sesion()
+
+    async def ejecutar(self, nombre, argumentos):
+        async with self.semaforo:
+            return await self.ciclo.run_in_executor(self.ejecutor, self.ejecutar_en_hilo, nombre, argumentos)
+
+    async def llamar(self, nombre, *argumentos, tiempo_limite=None):
+        ''' Ejecuta un método de la lógica en el pool
+        Parámetros:
+            nombre (string): nombre del método de la fachada
+            argumentos: argumentos del método
+            tiempo_limite (float): segundos de espera para esta llamada, None para usar el de la fachada
+        Retorna:
+            el resultado del método. Si una consulta idéntica ya estaba en curso se espera su resultado
+            y cada llamador recibe su propia copia
+        Lanza:
+            asyncio.TimeoutError si se supera el tiempo límite. La llamada sigue en el pool hasta terminar,
+            por lo que una escritura puede quedar aplicada aunque su llamador haya dejado de esperarla
+        '''
+        self.preparar_ciclo()
+        limite = self.tiempo_limite if tiempo_limite is None else tiempo_limite
+        llave = (nombre, argumentos)
+        compartible = nombre in CONSULTAS
+        if compartible:
+            try:
+                hash(llave)
+            except TypeError:
+                #Los argumentos como listas o diccionarios no sirven de llave; la llamada no se comparte
+                compartible = False
+        else:
+            #Las consultas iniciadas antes de una escritura no se comparten con las llamadas posteriores
+            self.en_curso = {}
+
+        if not compartible:
+            tarea = asyncio.ensure_future(self.ejecutar(nombre, argumentos))
+            tarea.add_done_callback(self.leer_error)
+            return await asyncio.wait_for(asyncio.shield(tarea), limite)
+
+        entrada = self.en_curso.get(llave)
+        if entrada is None:
+            entrada = [asyncio.ensure_future(self.ejecutar(nombre, argumentos)), 1]
+            self.en_curso[llave] = entrada
+            entrada[0].add_done_callback(lambda tarea: self.retirar(llave, entrada))
+        else:
+            entrada[1] += 1
+            self.consultas_compartidas += 1
+
+        #shield evita que el tiempo límite de un llamador cancele la consulta de los demás
+        resultado = await asyncio.wait_for(asyncio.shield(entrada[0]), limite)
+        if entrada[1] > 1:
+            return copy.deepcopy(resultado)
+        return resultado
+
+    def retirar(self, llave, entrada):
+        if self.en_curso.get(llave) is entrada:
+            del self.en_curso[llave]
+        self.leer_error(entrada[0])
+
+    def leer_error(self, tarea):
+        #Si todos los llamadores superaron su tiempo límite, nadie lee la excepción de la tarea;
+        #se marca como leída para que asyncio no la reporte
+        if not tarea.cancelled():
+            tarea.exception()
+
+    def suscribir_cambios(self, observador, entidad=None):
+        ''' Registra un observador de cambios; se llama desde el hilo del pool que hizo la escritura '''
+        self.logica.suscribir_cambios(observador, entidad)
+
+    def cancelar_suscripcion_cambios(self, observador):
+        self.logica.cancelar_suscripcion_cambios(observador)
+
+    async def dar_recetas(self):
+        return await self.llamar('dar_recetas')
+
+    async def dar_receta(self, id_receta):
+        return await self.llamar('dar_receta', id_receta)
+
+    async def dar_receta_por_id(self, id_receta):
+        return await self.llamar('dar_receta_por_id', id_receta)
+
+    async def dar_pagina_recetas(self, despues_de=None, tamano_pagina=50):
+        return await self.llamar('dar_pagina_recetas', despues_de, tamano_pagina)
+
+    async def validar_crear_editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
+        return await self.llamar('validar_crear_editar_receta', id_receta, receta, tiempo, personas, calorias, preparacion)
+
+    async def crear_receta(self, receta, tiempo, personas, calorias, preparacion):
+        return await self.llamar('crear_receta', receta, tiempo, personas, calorias, preparacion)
+
+    async def importar_recetas(self, lineas, tamano_lote=500):
+        return await self.llamar('importar_recetas', lineas, tamano_lote)
+
+    async def editar_receta(self, id_receta, receta, tiempo, personas, calorias, preparacion):
+        return await self.llamar('editar_receta', id_receta, receta, tiempo, personas, calorias, preparacion)
+
+    async def eliminar_receta(self, id_receta):
+        return await self.llamar('eliminar_receta', id_receta)
+
+    async def editar_receta_por_id(self, id_receta, receta, tiempo, personas, calorias, preparacion):
+        return await self.llamar('editar_receta_por_id', id_receta, receta, tiempo, personas, calorias, preparacion)
+
+    async def eliminar_receta_por_id(self, id_receta):
+        return await self.llamar('eliminar_receta_por_id', id_receta)
+
+    async def dar_ingredientes(self):
+        return await self.llamar('dar_ingredientes')
+
+    async def dar_pagina_ingredientes(self, despues_de=None, tamano_pagina=50, orden='nombre', descendente=False):
+        return await self.llamar('dar_pagina_ingredientes', despues_de, tamano_pagina, orden, descendente)
+
+    async def dar_ingrediente(self, id_ingrediente):
+        return await self.llamar('dar_ingrediente', id_ingrediente)
+
+    async def dar_ingrediente_por_id(self, id_ingrediente):
+        return await self.llamar('dar_ingrediente_por_id', id_ingrediente)
+
+    async def buscar_ingrediente(self, nombre, unidad):
+        return await self.llamar('buscar_ingrediente', nombre, unidad)
+
+    async def validar_crear_editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompra):
+        return await self.llamar('validar_crear_editar_ingrediente', id_ingrediente, nombre, unidad, valor, sitioCompra)
+
+    async def crear_ingrediente(self, nombre, unidad, valor, sitioCompra):
+        return await self.llamar('crear_ingrediente', nombre, unidad, valor, sitioCompra)
+
+    async def importar_ingredientes(self, filas, tamano_lote=1000):
+        return await self.llamar('importar_ingredientes', filas, tamano_lote)
+
+    async def editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
+        return await self.llamar('editar_ingrediente', id_ingrediente, nombre, unidad, valor, sitioCompras)
+
+    async def eliminar_ingrediente(self, id_ingrediente):
+        return await self.llamar('eliminar_ingrediente', id_ingrediente)
+
+    async def validar_crear_editar_ingrediente_por_id(self, id_ingrediente, nombre, unidad, valor, sitioCompra):
+        return await self.llamar('validar_crear_editar_ingrediente_por_id', id_ingrediente, nombre, unidad, valor, sitioCompra)
+
+    async def editar_ingrediente_por_id(self, id_ingrediente, nombre, unidad, valor, sitioCompras):
+        return await self.llamar('editar_ingrediente_por_id', id_ingrediente, nombre, unidad, valor, sitioCompras)
+
+    async def eliminar_ingrediente_por_id(self, id_ingrediente):
+        return await self.llamar('eliminar_ingrediente_por_id', id_ingrediente)
+
+    async def dar_ingredientes_receta(self, id_receta):
+        return await self.llamar('dar_ingredientes_receta', id_receta)
+
+    async def dar_ingredientes_receta_por_id(self, id_receta):
+        return await self.llamar('dar_ingredientes_receta_por_id', id_receta)
+
+    async def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
+        return await self.llamar('agregar_ingrediente_receta', receta, ingrediente, cantidad)
+
+    async def editar_ingrediente_receta(self, id_ingrediente_receta, receta, ingrediente, cantidad):
+        return await self.llamar('editar_ingrediente_receta', id_ingrediente_receta, receta, ingrediente, cantidad)
+
+    async def validar_crear_editar_ingReceta(self, receta, ingrediente, cantidad):
+        return await self.llamar('validar_crear_editar_ingReceta', receta, ingrediente, cantidad)
+
+    async def eliminar_ingrediente_receta(self, id_ingrediente_receta, receta):
+        return await self.llamar('eliminar_ingrediente_receta', id_ingrediente_receta, receta)
+
+    async def exportar_catalogo(self, entidad, salida, formato='jsonl'):
+        return await self.llamar('exportar_catalogo', entidad, salida, formato)
+
+    async def dar_costos_recetas(self, ids_recetas=None, cantidad_personas=None):
+        return await self.llamar('dar_costos_recetas', ids_recetas, cantidad_personas)
+
+    async def dar_preparaciones(self, ids_recetas, cantidades_personas):
+        return await self.llamar('dar_preparaciones', ids_recetas, cantidades_personas)
+
+    async def dar_preparacion(self, id_receta, cantidad_personas):
+        return await self.llamar('dar_preparacion', id_receta, cantidad_personas)
+
+    async def dar_preparacion_por_id(self, id_receta, cantidad_personas):
+        return await self.llamar('dar_preparacion_por_id', id_receta, cantidad_personas)
@@ -1,9 +1,229 @@
-from sqlalchemy import create_engine
+import configparser
+import os
+import threading
+import warnings
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+
+#Perfiles de rendimiento de SQLite que se aplican a cada conexión. busy_timeout está en
+#milisegundos y es lo que una conexión espera un bloqueo del archivo; espera_pool está en
+#segundos y es lo que una sesión espera una conexión libre del pool.
+#El perfil por defecto usa el journal de reversión y deja la base de datos en un solo archivo;
+#WAL, que crea los archivos -wal y -shm, se activa con los otros perfiles o con journal_mode
+PERFILES_SQLITE = {
+    'durable': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -8000,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+        'cached_statements': 100,
+        'tamano_pool': 5,
+        'max_desborde': 5,
+        'espera_pool': 30,
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268435456,
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'cached_statements': 256,
+        'tamano_pool': 10,
+        'max_desborde': 10,
+        'espera_pool': 30,
+    },
+    'read-mostly': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 1073741824,
+        'cache_size': -32000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+        'cached_statements': 512,
+        'tamano_pool': 20,
+        'max_desborde': 20,
+        'espera_pool': 30,
+    },
+}
+PERFIL_POR_DEFECTO = 'durable'
+ARCHIVO_CONFIGURACION = 'recetario.ini'
+
+#Política de memoria de las sesiones, configurable en la sección [sesion]
+POLITICA_MEMORIA = {
+    'expire_on_commit': True,
+    'operaciones_entre_limpiezas': 500,
+    'max_objetos': 10000,
+}
+
+#Compresión de los textos de preparación, configurable en la sección [almacenamiento]
+COMPRESION_PREPARACION = {
+    'comprimir_preparacion': False,
+    'umbral_compresion': 256,
+}
+
+
+def dar_seccion_configuracion(nombre_seccion):
+    '''Retorna la sección del archivo de configuración o un diccionario vacío'''
+    configuracion = configparser.ConfigParser()
+    configuracion.read(os.environ.get('RECETARIO_CONFIGURACION', ARCHIVO_CONFIGURACION))
+    if configuracion.has_section(nombre_seccion):
+        return configuracion[nombre_seccion]
+    return {}
+
+
+def dar_perfil_sqlite():
+    '''Retorna la configuración de SQLite a usar.
+    El perfil se toma de la variable de entorno RECETARIO_PERFIL_SQLITE o de la
+    clave perfil de la sección [sqlite] de recetario.ini; las demás claves de esa
+    sección reemplazan valores puntuales del perfil.'''
+    seccion = dar_seccion_configuracion('sqlite')
+
+    nombre = os.environ.get('RECETARIO_PERFIL_SQLITE') or seccion.get('perfil', PERFIL_POR_DEFECTO)
+    if nombre not in PERFILES_SQLITE:
+        raise ValueError("Perfil de SQLite desconocido: %s" % nombre)
+
+    perfil = dict(PERFILES_SQLITE[nombre])
+    for clave in perfil:
+        if clave in seccion:
+            valor = seccion[clave]
+            perfil[clave] = int(valor) if isinstance(perfil[clave], int) else valor
+    return perfil
+
+
+def dar_politica_memoria():
+    '''Retorna la política de memoria de las sesiones.
+    expire_on_commit se pasa al sessionmaker; cada operaciones_entre_limpiezas
+    transacciones, o cuando la sesión supera max_objetos, se vacía su mapa de
+    identidad con expunge_all.'''
+    seccion = dar_seccion_configuracion('sesion')
+    politica = dict(POLITICA_MEMORIA)
+    if 'expire_on_commit' in seccion:
+        politica['expire_on_commit'] = seccion.getboolean('expire_on_commit')
+    for clave in ('operaciones_entre_limpiezas', 'max_objetos'):
+        if clave in seccion:
+            politica[clave] = int(seccion[clave])
+    return politica
+
+
+def dar_compresion_preparacion():
+    '''Retorna la configuración de compresión de las preparaciones.
+    Con comprimir_preparacion activo (o la variable de entorno
+    RECETARIO_COMPRIMIR_PREPARACION en 1), los textos de al menos
+    umbral_compresion bytes se guardan comprimidos con zlib.'''
+    seccion = dar_seccion_configuracion('almacenamiento')
+    compresion = dict(COMPRESION_PREPARACION)
+    if 'comprimir_preparacion' in seccion:
+        compresion['comprimir_preparacion'] = seccion.getboolean('comprimir_preparacion')
+    if 'RECETARIO_COMPRIMIR_PREPARACION' in os.environ:
+        compresion['comprimir_preparacion'] = os.environ['RECETARIO_COMPRIMIR_PREPARACION'] == '1'
+    if 'umbral_compresion' in seccion:
+        compresion['umbral_compresion'] = int(seccion['umbral_compresion'])
+    return compresion
+
+
+def crear_engine(perfil):
+    '''Crea el engine de la base de datos.
+    Con tamano_pool mayor que 0 las conexiones se reutilizan desde un QueuePool
+    (hasta tamano_pool + max_desborde abiertas a la vez, y una sesión espera hasta
+    espera_pool segundos a que se libere una) y no se vuelve a abrir
+    el archivo ni a aplicar los PRAGMA en cada sesión; con 0 cada sesión abre su
+    propia conexión.'''
+    argumentos_conexion = {'cached_statements': perfil['cached_statements']}
+    if perfil['tamano_pool'] <= 0:
+        return create_engine('sqlite:///RecetarioDatos.sqlite', connect_args=argumentos_conexion, poolclass=NullPool)
+    #Una conexión del pool pasa de un hilo a otro, pero nunca la usan dos hilos a la vez
+    argumentos_conexion['check_same_thread'] = False
+    return create_engine('sqlite:///RecetarioDatos.sqlite', connect_args=argumentos_conexion, poolclass=QueuePool,
+                         pool_size=perfil['tamano_pool'], max_overflow=perfil['max_desborde'],
+                         pool_timeout=perfil['espera_pool'])
 
-engine = create_engine('sqlite:///RecetarioDatos.sqlite')
-Session = sessionmaker(bind=engine)
+
+perfil_sqlite = dar_perfil_sqlite()
+engine = crear_engine(perfil_sqlite)
+
+
+@event.listens_for(engine, 'connect')
+def aplicar_perfil_sqlite(conexion_dbapi, registro_conexion):
+    cursor = conexion_dbapi.cursor()
+    for pragma in ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'busy_timeout'):
+        cursor.execute('PRAGMA %s = %s' % (pragma, perfil_sqlite[pragma]))
+    cursor.close()
+
+
+politica_memoria = dar_politica_memoria()
+compresion_preparacion = dar_compresion_preparacion()
+Session = sessionmaker(bind=engine, expire_on_commit=politica_memoria['expire_on_commit'])
+#Registro de sesiones: cada hilo obtiene su propia sesión
+Sesion = scoped_session(Session)
 
 Base = declarative_base()
-session = Session()
\ No newline at end of file
+
+_estado_hilo = threading.local()
+
+
+@contextmanager
+def sesion_transaccional():
+    '''Entrega la sesión del hilo actual dentro de una transacción.
+    Al salir del bloque más externo se confirman los cambios, o se revierten si
+    hubo una excepción; los bloques anidados participan de la misma transacción.'''
+    sesion = Sesion()
+    profundidad = getattr(_estado_hilo, 'profundidad', 0)
+    _estado_hilo.profundidad = profundidad + 1
+    try:
+        yield sesion
+        if profundidad == 0:
+            sesion.commit()
+    except Exception:
+        if profundidad == 0:
+            sesion.rollback()
+        raise
+    finally:
+        _estado_hilo.profundidad = profundidad
+        if profundidad == 0:
+            aplicar_politica_memoria(sesion)
+
+
+def aplicar_politica_memoria(sesion):
+    '''Libera los objetos de la sesión del hilo cuando la política lo indica'''
+    operaciones = getattr(_estado_hilo, 'operaciones', 0) + 1
+    if (operaciones >= politica_memoria['operaciones_entre_limpiezas']
+            or len(sesion.identity_map) > politica_memoria['max_objetos']):
+        sesion.expunge_all()
+        operaciones = 0
+    _estado_hilo.operaciones = operaciones
+
+
+def dar_objetos_en_sesion():
+    '''Retorna la cantidad de objetos ORM que mantiene la sesión del hilo actual'''
+    return len(Sesion().identity_map)
+
+
+def cerrar_sesion():
+    '''Cierra y descarta la sesión del hilo actual. Los hilos de trabajo la
+    deben llamar al terminar para liberar su conexión.'''
+    Sesion.remove()
+
+
+def crear_indices_faltantes():
+    '''Crea en una base de datos existente los índices declarados en los modelos.
+    create_all solo crea índices junto con tablas nuevas, por lo que las bases de
+    datos creadas con versiones anteriores del esquema se actualizan aquí.'''
+    inspector = inspect(engine)
+    for tabla in Base.metadata.sorted_tables:
+        existentes = {indice['name'] for indice in inspector.get_indexes(tabla.name)}
+        for indice in tabla.indexes:
+            if indice.name in existentes:
+                continue
+            try:
+                indice.create(bind=engine)
+            except IntegrityError:
+                #Los datos existentes tienen duplicados y no admiten el índice único
+                warnings.warn("No se pudo crear el índice %s: existen registros duplicados" % indice.name)
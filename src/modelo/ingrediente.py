@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .declarative_base import Base
@@ -6,6 +6,11 @@ from .declarative_base import Base
 
 class Ingrediente(Base):
     __tablename__ = 'ingrediente'
+    __table_args__ = (
+        Index('ix_ingrediente_nombre_unidad', 'nombre', 'unidad', unique=True),
+        #Permite paginar el catálogo ordenado por unidad sin ordenar en memoria
+        Index('ix_ingrediente_unidad_nombre', 'unidad', 'nombre'),
+    )
 
     id = Column(Integer, primary_key=True)
     nombre = Column(String)
@@ -16,6 +21,10 @@ class Ingrediente(Base):
 
 class RecetaIngrediente(Base):
     __tablename__='receta_ingrediente'
+    #La llave primaria (ingrediente_id, receta_id) ya indexa las búsquedas por ingrediente
+    __table_args__ = (
+        Index('ix_receta_ingrediente_receta_id', 'receta_id'),
+    )
 
     ingrediente_id = Column(
         Integer,
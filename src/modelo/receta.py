@@ -1,17 +1,19 @@
 from sqlalchemy import Column, Integer, String, Time, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from .declarative_base import Base
+from .texto_comprimido import TextoComprimido
 
 class Receta(Base):
     __tablename__ = 'receta'
 
     id = Column(Integer, primary_key=True)
-    nombre = Column(String)
+    nombre = Column(String, index=True)
     tiempo = Column(Time)
     personas = Column(Integer)
     calorias = Column(Integer)
-    preparacion = Column(String)
+    #El texto de la preparación solo se carga cuando se abre una receta
+    preparacion = deferred(Column(TextoComprimido))
     ingredientes = relationship('Ingrediente', secondary='receta_ingrediente', back_populates='recetas')
     
 
@@ -0,0 +1,40 @@
+import zlib
+
+from sqlalchemy import String
+from sqlalchemy.types import TypeDecorator
+
+from .declarative_base import compresion_preparacion
+
+#Prefijo que distingue los textos comprimidos de los guardados en claro
+PREFIJO_COMPRIMIDO = b'zlib:'
+
+
+class TextoComprimido(TypeDecorator):
+    '''Texto que se guarda comprimido con zlib cuando la compresión está activa.
+    La lectura es transparente: los valores en claro y los comprimidos pueden
+    convivir en la misma columna, así que activar o desactivar la compresión
+    no exige migrar los datos existentes. Por lo mismo la columna no sirve para
+    buscar por igualdad: el valor comparado se comprime según la configuración
+    actual y no coincide con las filas guardadas de la otra forma, así que las
+    recetas se buscan por id o por sus demás campos.'''
+    impl = String
+
+    def __init__(self, comprimir=None, umbral=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.comprimir = compresion_preparacion['comprimir_preparacion'] if comprimir is None else comprimir
+        self.umbral = compresion_preparacion['umbral_compresion'] if umbral is None else umbral
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.comprimir:
+            return value
+        datos = value.encode('utf-8')
+        if len(datos) < self.umbral:
+            return value
+        comprimido = PREFIJO_COMPRIMIDO + zlib.compress(datos, 9)
+        #Solo se guarda comprimido si realmente ocupa menos
+        return comprimido if len(comprimido) < len(datos) else value
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes) and value.startswith(PREFIJO_COMPRIMIDO):
+            return zlib.decompress(value[len(PREFIJO_COMPRIMIDO):]).decode('utf-8')
+        return value
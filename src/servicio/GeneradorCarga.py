@@ -0,0 +1,138 @@
+'''
+Generador de carga local para medir el rendimiento del servicio del recetario:
+varios clientes con conexiones persistentes repiten las consultas durante un
+tiempo fijo y se informa el throughput y la latencia
+'''
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from src.servicio.ServidorRecetario import ServidorRecetario
+
+
+def dar_rutas_por_defecto(host, puerto):
+    ''' Arma una mezcla de consultas con recetas que existen en el servidor '''
+    conexion = http.client.HTTPConnection(host, puerto)
+    try:
+        conexion.request('GET', '/recetas?tamano=20')
+        recetas = json.loads(conexion.getresponse().read())['elementos']
+    finally:
+        conexion.close()
+    rutas = ['/recetas', '/ingredientes']
+    for receta in recetas:
+        rutas.append('/recetas/%d' % receta['id'])
+        rutas.append('/recetas/%d/preparacion?personas=4' % receta['id'])
+    return rutas
+
+
+def ejecutar_cliente(host, puerto, rutas, fin, latencias, errores, candado):
+    conexion = http.client.HTTPConnection(host, puerto)
+    propias = []
+    fallidas = 0
+    indice = 0
+    try:
+        while time.perf_counter() < fin:
+            ruta = rutas[indice % len(rutas)]
+            indice += 1
+            inicio = time.perf_counter()
+            try:
+                conexion.request('GET', ruta)
+                respuesta = conexion.getresponse()
+                respuesta.read()
+                if respuesta.status >= 500:
+                    fallidas += 1
+            except (OSError, http.client.HTTPException):
+                fallidas += 1
+                conexion.close()
+                conexion = http.client.HTTPConnection(host, puerto)
+                continue
+            propias.append(time.perf_counter() - inicio)
+    finally:
+        conexion.close()
+    with candado:
+        latencias.extend(propias)
+        errores.append(fallidas)
+
+
+def medir_rendimiento(host, puerto, clientes=8, segundos=5.0, rutas=None):
+    ''' Genera carga con varios clientes concurrentes
+    Parámetros:
+        host, puerto: dirección del servicio
+        clientes (int): cantidad de clientes simultáneos, cada uno con su conexión
+        segundos (float): duración de la medición
+        rutas (list): rutas GET que cada cliente recorre en ciclo; por defecto una mezcla de listados,
+            recetas y preparaciones
+    Retorna:
+        (dict): solicitudes, errores, solicitudes por segundo y latencias p50, p95 y p99 en milisegundos
+    '''
+    rutas = rutas or dar_rutas_por_defecto(host, puerto)
+    latencias = []
+    errores = []
+    candado = threading.Lock()
+    inicio = time.perf_counter()
+    fin = inicio + segundos
+    hilos = [threading.Thread(target=ejecutar_cliente, args=(host, puerto, rutas, fin, latencias, errores, candado))
+             for _ in range(clientes)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+
+    def percentil(porcentaje):
+        if not latencias:
+            return 0.0
+        return latencias[min(len(latencias) - 1, int(len(latencias) * porcentaje / 100))] * 1000
+
+    return {
+        'clientes': clientes,
+        'solicitudes': len(latencias),
+        'errores': sum(errores),
+        'solicitudes_por_segundo': len(latencias) / duracion,
+        'p50_ms': percentil(50),
+        'p95_ms': percentil(95),
+        'p99_ms': percentil(99),
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog='python -m src.servicio.GeneradorCarga',
+                                     description='Mide el throughput del servicio del recetario')
+    parser.add_argument('--url', help='servicio a medir; por defecto se inicia uno local en un puerto libre')
+    parser.add_argument('--clientes', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--segundos', type=float, default=5.0)
+    opciones = parser.parse_args(argumentos)
+
+    servidor = None
+    if opciones.url:
+        direccion = urlsplit(opciones.url)
+        host, puerto = direccion.hostname, direccion.port or 80
+    else:
+        servidor = ServidorRecetario(('127.0.0.1', 0))
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        host, puerto = servidor.server_address[:2]
+
+    try:
+        rutas = dar_rutas_por_defecto(host, puerto)
+        print("clientes  solicitudes  errores  sol/s     p50 ms  p95 ms  p99 ms")
+        for clientes in opciones.clientes:
+            resultado = medir_rendimiento(host, puerto, clientes, opciones.segundos, rutas)
+            print("%8d  %11d  %7d  %8.1f  %6.2f  %6.2f  %6.2f" % (
+                clientes, resultado['solicitudes'], resultado['errores'], resultado['solicitudes_por_segundo'],
+                resultado['p50_ms'], resultado['p95_ms'], resultado['p99_ms']))
+            sys.stdout.flush()
+    finally:
+        if servidor is not None:
+            servidor.shutdown()
+            servidor.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
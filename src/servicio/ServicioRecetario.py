@@ -0,0 +1,197 @@
+'''
+Clase ServicioRecetario: traduce las solicitudes del servicio JSON (método, ruta,
+parámetros y cuerpo) a las operaciones de FachadaRecetario, identificando las
+recetas y los ingredientes por su id en la base de datos
+'''
+import json
+import re
+
+
+#Rutas del servicio: (método, expresión de la ruta, operación)
+RUTAS = [
+    ('GET', r'/recetas', 'listar_recetas'),
+    ('POST', r'/recetas', 'crear_receta'),
+    ('GET', r'/recetas/(\d+)', 'dar_receta'),
+    ('PUT', r'/recetas/(\d+)', 'editar_receta'),
+    ('DELETE', r'/recetas/(\d+)', 'eliminar_receta'),
+    ('GET', r'/recetas/(\d+)/ingredientes', 'dar_ingredientes_receta'),
+    ('GET', r'/recetas/(\d+)/preparacion', 'dar_preparacion'),
+    ('GET', r'/ingredientes', 'listar_ingredientes'),
+    ('POST', r'/ingredientes', 'crear_ingrediente'),
+    ('GET', r'/ingredientes/(\d+)', 'dar_ingrediente'),
+    ('PUT', r'/ingredientes/(\d+)', 'editar_ingrediente'),
+    ('DELETE', r'/ingredientes/(\d+)', 'eliminar_ingrediente'),
+    ('GET', r'/costos', 'dar_costos'),
+]
+
+CAMPOS_RECETA = ['nombre', 'tiempo', 'personas', 'calorias', 'preparacion']
+CAMPOS_INGREDIENTE = ['nombre', 'unidad', 'valor', 'sitioCompra']
+
+
+class ErrorSolicitud(Exception):
+    #Error que se responde al cliente con su código de estado HTTP
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+class ServicioRecetario:
+
+    def __init__(self, logica):
+        self.logica = logica
+        self.rutas = [(metodo, re.compile(patron + '$'), operacion) for metodo, patron, operacion in RUTAS]
+
+    def atender(self, metodo, ruta, parametros=None, cuerpo=None):
+        ''' Ejecuta la operación que corresponde a la solicitud
+        Parámetros:
+            metodo (string): método HTTP
+            ruta (string): ruta sin los parámetros de consulta
+            parametros (dict): parámetros de consulta, cada uno con la lista de sus valores
+            cuerpo (dict): cuerpo JSON ya decodificado, None si no tiene
+        Retorna:
+            (int, object): el código de estado y los datos a responder en JSON
+        '''
+        parametros = parametros or {}
+        ruta_encontrada = False
+        for metodo_ruta, patron, operacion in self.rutas:
+            coincidencia = patron.match(ruta.rstrip('/') or '/')
+            if coincidencia is None:
+                continue
+            ruta_encontrada = True
+            if metodo_ruta == metodo:
+                argumentos = [int(grupo) for grupo in coincidencia.groups()]
+                try:
+                    return getattr(self, operacion)(*argumentos, parametros=parametros, cuerpo=cuerpo)
+                except ErrorSolicitud as error:
+                    return error.estado, {'error': error.mensaje}
+        if ruta_encontrada:
+            return 405, {'error': "Método no permitido"}
+        return 404, {'error': "Ruta no encontrada"}
+
+    def dar_parametro(self, parametros, nombre, convertir=str, por_defecto=None):
+        valores = parametros.get(nombre)
+        if not valores:
+            return por_defecto
+        try:
+            return convertir(valores[0])
+        except (ValueError, TypeError):
+            raise ErrorSolicitud(400, "El parámetro %s no es válido" % nombre)
+
+    def dar_campos(self, cuerpo, campos):
+        if not isinstance(cuerpo, dict):
+            raise ErrorSolicitud(400, "El cuerpo debe ser un objeto JSON")
+        faltantes = [campo for campo in campos if campo not in cuerpo]
+        if faltantes:
+            raise ErrorSolicitud(400, "Faltan los campos: " + ", ".join(faltantes))
+        #La lógica valida los datos como los escribe el usuario en la interfaz
+        return [str(cuerpo[campo]) for campo in campos]
+
+    def dar_pagina(self, parametros):
+        ''' Retorna la llave despues_de (JSON) y el tamaño de la página de los parámetros '''
+        despues_de = self.dar_parametro(parametros, 'despues_de', json.loads)
+        if despues_de is not None and not isinstance(despues_de, list):
+            raise ErrorSolicitud(400, "El parámetro despues_de no es válido")
+        tamano = self.dar_parametro(parametros, 'tamano', int, 50)
+        if tamano < 1:
+            raise ErrorSolicitud(400, "El parámetro tamano no es válido")
+        return (tuple(despues_de) if despues_de is not None else None), tamano
+
+    def listar_recetas(self, parametros, cuerpo):
+        despues_de, tamano = self.dar_pagina(parametros)
+        return 200, self.logica.dar_pagina_recetas(despues_de, tamano)
+
+    def dar_receta(self, id_receta, parametros, cuerpo):
+        receta = self.logica.dar_receta_por_id(id_receta)
+        if receta is None:
+            raise ErrorSolicitud(404, "La receta no existe")
+        return 200, receta
+
+    def crear_receta(self, parametros, cuerpo):
+        datos = self.dar_campos(cuerpo, CAMPOS_RECETA)
+        validacion = self.logica.validar_crear_editar_receta(-1, *datos)
+        if validacion != "":
+            raise ErrorSolicitud(400, validacion)
+        id_receta, mensaje = self.logica.crear_receta_con_id(*datos)
+        if id_receta is None:
+            #La validación pasó pero la base de datos rechazó la receta, por ejemplo por una escritura concurrente
+            raise ErrorSolicitud(409, mensaje)
+        return 201, {'id': id_receta, 'mensaje': mensaje}
+
+    def editar_receta(self, id_receta, parametros, cuerpo):
+        self.dar_receta(id_receta, parametros, cuerpo)
+        datos = self.dar_campos(cuerpo, CAMPOS_RECETA)
+        validacion = self.logica.validar_crear_editar_receta(id_receta, *datos)
+        if validacion != "":
+            raise ErrorSolicitud(400, validacion)
+        return 200, {'mensaje': self.logica.editar_receta_por_id(id_receta, *datos)}
+
+    def eliminar_receta(self, id_receta, parametros, cuerpo):
+        resultado = self.logica.eliminar_receta_por_id(id_receta)
+        if resultado is None:
+            raise ErrorSolicitud(404, "La receta no existe")
+        return 200, {'mensaje': resultado}
+
+    def dar_ingredientes_receta(self, id_receta, parametros, cuerpo):
+        self.dar_receta(id_receta, parametros, cuerpo)
+        return 200, self.logica.dar_ingredientes_receta_por_id(id_receta)
+
+    def dar_preparacion(self, id_receta, parametros, cuerpo):
+        personas = self.dar_parametro(parametros, 'personas', int)
+        if personas is None or personas < 1:
+            raise ErrorSolicitud(400, "El parámetro personas debe ser un número entero positivo")
+        preparacion = self.logica.dar_preparacion_por_id(id_receta, personas)
+        if preparacion == {}:
+            raise ErrorSolicitud(404, "La receta no existe")
+        if not isinstance(preparacion, dict):
+            raise ErrorSolicitud(500, preparacion)
+        return 200, preparacion
+
+    def listar_ingredientes(self, parametros, cuerpo):
+        despues_de, tamano = self.dar_pagina(parametros)
+        orden = self.dar_parametro(parametros, 'orden', str, 'nombre')
+        descendente = self.dar_parametro(parametros, 'descendente', str, 'false').lower() in ('1', 'true', 'si')
+        try:
+            return 200, self.logica.dar_pagina_ingredientes(despues_de, tamano, orden, descendente)
+        except ValueError as error:
+            raise ErrorSolicitud(400, str(error))
+
+    def dar_ingrediente(self, id_ingrediente, parametros, cuerpo):
+        ingrediente = self.logica.dar_ingrediente_por_id(id_ingrediente)
+        if ingrediente is None:
+            raise ErrorSolicitud(404, "El ingrediente no existe")
+        return 200, ingrediente
+
+    def crear_ingrediente(self, parametros, cuerpo):
+        datos = self.dar_campos(cuerpo, CAMPOS_INGREDIENTE)
+        validacion = self.logica.validar_crear_editar_ingrediente_por_id(None, *datos)
+        if validacion != "":
+            raise ErrorSolicitud(400, validacion)
+        id_ingrediente, mensaje = self.logica.crear_ingrediente_con_id(*datos)
+        if id_ingrediente is None:
+            raise ErrorSolicitud(409, mensaje)
+        return 201, {'id': id_ingrediente, 'mensaje': mensaje}
+
+    def editar_ingrediente(self, id_ingrediente, parametros, cuerpo):
+        self.dar_ingrediente(id_ingrediente, parametros, cuerpo)
+        datos = self.dar_campos(cuerpo, CAMPOS_INGREDIENTE)
+        validacion = self.logica.validar_crear_editar_ingrediente_por_id(id_ingrediente, *datos)
+        if validacion != "":
+            raise ErrorSolicitud(400, validacion)
+        return 200, {'mensaje': self.logica.editar_ingrediente_por_id(id_ingrediente, *datos)}
+
+    def eliminar_ingrediente(self, id_ingrediente, parametros, cuerpo):
+        resultado = self.logica.eliminar_ingrediente_por_id(id_ingrediente)
+        if resultado is None:
+            raise ErrorSolicitud(404, "El ingrediente no existe")
+        if self.logica.dar_ingrediente_por_id(id_ingrediente) is not None:
+            #El ingrediente se usa en una receta y no se eliminó
+            raise ErrorSolicitud(409, resultado)
+        return 200, {'mensaje': resultado}
+
+    def dar_costos(self, parametros, cuerpo):
+        personas = self.dar_parametro(parametros, 'personas', int)
+        ids = self.dar_parametro(parametros, 'ids', lambda texto: [int(id_receta) for id_receta in texto.split(',')])
+        costos = self.logica.dar_costos_recetas(ids, personas)
+        return 200, {str(id_receta): costo for id_receta, costo in costos.items()}
@@ -0,0 +1,102 @@
+'''
+Clase ServidorRecetario: servidor HTTP local que publica el recetario como un
+servicio JSON para varias terminales. Atiende cada conexión en su propio hilo; cada
+solicitud usa la sesión de su hilo y la cierra al responder, devolviendo la conexión
+al pool del engine
+'''
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.logica.Recetario import Recetario
+from src.modelo.declarative_base import cerrar_sesion
+from src.servicio.ServicioRecetario import ServicioRecetario
+
+
+class ManejadorRecetario(BaseHTTPRequestHandler):
+    #HTTP/1.1 mantiene abiertas las conexiones entre solicitudes de un mismo cliente
+    protocol_version = 'HTTP/1.1'
+    server_version = 'Recetario/1.0'
+    #Los encabezados y el cuerpo se escriben por separado: sin Nagle no esperan el ACK retardado
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.atender('GET')
+
+    def do_POST(self):
+        self.atender('POST')
+
+    def do_PUT(self):
+        self.atender('PUT')
+
+    def do_DELETE(self):
+        self.atender('DELETE')
+
+    def leer_cuerpo(self):
+        longitud = int(self.headers.get('Content-Length') or 0)
+        if longitud == 0:
+            return None
+        return json.loads(self.rfile.read(longitud).decode('utf-8'))
+
+    def atender(self, metodo):
+        ruta = urlsplit(self.path)
+        try:
+            cuerpo = self.leer_cuerpo()
+        except ValueError:
+            self.responder(400, {'error': "El cuerpo no es un JSON válido"})
+            return
+        try:
+            estado, datos = self.server.servicio.atender(metodo, ruta.path, parse_qs(ruta.query), cuerpo)
+        except Exception as error:
+            self.log_error("Error al atender %s %s: %r", metodo, self.path, error)
+            estado, datos = 500, {'error': "Error interno del servidor"}
+        finally:
+            #La sesión es de la solicitud: se cierra y su conexión vuelve al pool
+            cerrar_sesion()
+        self.responder(estado, datos)
+
+    def responder(self, estado, datos):
+        contenido = json.dumps(datos, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato, *argumentos):
+        if self.server.registrar_solicitudes:
+            super().log_message(formato, *argumentos)
+
+
+class ServidorRecetario(ThreadingHTTPServer):
+    #Los hilos de las conexiones no impiden que el proceso termine
+    daemon_threads = True
+
+    def __init__(self, direccion, logica=None, registrar_solicitudes=False):
+        super().__init__(direccion, ManejadorRecetario)
+        self.servicio = ServicioRecetario(logica if logica is not None else Recetario())
+        self.registrar_solicitudes = registrar_solicitudes
+
+    def dar_url(self):
+        host, puerto = self.server_address[:2]
+        return 'http://%s:%d' % (host, puerto)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(prog='python -m src.servicio', description='Servicio JSON del recetario')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8000)
+    parser.add_argument('--registrar', action='store_true', help='escribe cada solicitud en la salida de errores')
+    opciones = parser.parse_args(argumentos)
+
+    servidor = ServidorRecetario((opciones.host, opciones.puerto), registrar_solicitudes=opciones.registrar)
+    print("Recetario atendiendo en %s" % servidor.dar_url(), file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
@@ -0,0 +1,7 @@
+import sys
+
+from src.servicio.ServidorRecetario import main
+
+if __name__ == '__main__':
+    # Punto inicial del servicio JSON del recetario
+    sys.exit(main())
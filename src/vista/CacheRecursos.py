@@ -0,0 +1,70 @@
+from PyQt5.QtGui import QIcon, QPixmap
+
+#Si se compiló el paquete de recursos (pyrcc5 src/recursos/recursos.qrc -o src/vista/recursos_rc.py),
+#las imágenes se leen del binario en lugar de buscarlas en el disco
+try:
+    from . import recursos_rc
+    PREFIJO_RECURSOS = ":/recursos/"
+except ImportError:
+    PREFIJO_RECURSOS = "src/recursos/"
+
+
+class CacheRecursos:
+    #Cache de los íconos e imágenes de las vistas: cada archivo se decodifica una sola vez y las ventanas
+    #comparten la misma instancia (QIcon y QPixmap son de datos compartidos, copiarlos no vuelve a leer el archivo)
+
+    def __init__(self, prefijo=PREFIJO_RECURSOS):
+        """
+        Constructor de la cache
+        """
+        self.prefijo = prefijo
+        self.iconos = {}
+        self.pixmaps = {}
+
+    def dar_ruta(self, nombre):
+        """
+        Esta función retorna la ruta del recurso con el nombre de archivo recibido
+        """
+        return self.prefijo + nombre
+
+    def dar_icono(self, nombre):
+        """
+        Esta función retorna el ícono del archivo recibido, cargándolo solo la primera vez
+        """
+        icono = self.iconos.get(nombre)
+        if icono is None:
+            icono = QIcon(self.dar_pixmap(nombre))
+            self.iconos[nombre] = icono
+        return icono
+
+    def dar_pixmap(self, nombre):
+        """
+        Esta función retorna la imagen del archivo recibido, cargándola solo la primera vez
+        """
+        pixmap = self.pixmaps.get(nombre)
+        if pixmap is None:
+            pixmap = QPixmap(self.dar_ruta(nombre))
+            self.pixmaps[nombre] = pixmap
+        return pixmap
+
+
+#Cache compartida por todas las ventanas; se crea cuando ya existe la aplicación de Qt
+_cache_recursos = None
+
+
+def dar_cache_recursos():
+    """
+    Esta función retorna la cache de recursos del proceso, creándola la primera vez
+    """
+    global _cache_recursos
+    if _cache_recursos is None:
+        _cache_recursos = CacheRecursos()
+    return _cache_recursos
+
+
+def dar_icono(nombre):
+    return dar_cache_recursos().dar_icono(nombre)
+
+
+def dar_pixmap(nombre):
+    return dar_cache_recursos().dar_pixmap(nombre)
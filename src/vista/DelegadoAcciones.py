@@ -0,0 +1,43 @@
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtCore import *
+
+
+class DelegadoAcciones(QStyledItemDelegate):
+    #Delegado que dibuja el ícono de una acción en la celda y avisa cuando se hace clic sobre ella
+
+    accion_solicitada = pyqtSignal(str, int)
+
+    def __init__(self, tamano_icono=30, parent=None):
+        """
+        Constructor del delegado
+        """
+        super().__init__(parent)
+        self.tamano_icono = tamano_icono
+
+    def paint(self, painter, option, index):
+        """
+        Esta función dibuja el ícono de la acción centrado en la celda, sin crear widgets por fila
+        """
+        if option.state & QStyle.State_MouseOver:
+            painter.fillRect(option.rect, option.palette.midlight())
+        icono = index.data(Qt.DecorationRole)
+        if icono is not None:
+            area_icono = QRect(0, 0, self.tamano_icono, self.tamano_icono)
+            area_icono.moveCenter(option.rect.center())
+            icono.paint(painter, area_icono)
+
+    def sizeHint(self, option, index):
+        return QSize(self.tamano_icono + 10, self.tamano_icono + 10)
+
+    def editorEvent(self, event, model, option, index):
+        """
+        Esta función informa la acción de la celda cuando se suelta el botón izquierdo sobre ella
+        """
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton \
+                and option.rect.contains(event.pos()):
+            accion = index.data(Qt.UserRole)
+            if accion:
+                self.accion_solicitada.emit(accion, index.row())
+                return True
+        return False
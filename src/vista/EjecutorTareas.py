@@ -0,0 +1,138 @@
+from PyQt5.QtCore import *
+
+from src.modelo.declarative_base import cerrar_sesion
+
+
+class SenalesTarea(QObject):
+    #Señales con las que los hilos de trabajo entregan el resultado al hilo de la interfaz
+
+    terminada = pyqtSignal(object, object)
+    fallida = pyqtSignal(object, object)
+
+
+class TareaFachada(QRunnable):
+    #Llamada a la lógica que se ejecuta en un hilo del pool
+
+    def __init__(self, grupo, funcion, argumentos, senales, al_terminar=None, al_fallar=None):
+        """
+        Constructor de la tarea
+        """
+        super().__init__()
+        #El ejecutor conserva la referencia; Qt no debe destruir el objeto de Python al terminar
+        self.setAutoDelete(False)
+        self.grupo = grupo
+        self.funcion = funcion
+        self.argumentos = argumentos
+        self.senales = senales
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.cancelada = False
+
+    def cancelar(self):
+        """
+        Esta función marca la tarea para que su resultado se descarte
+        """
+        self.cancelada = True
+
+    def run(self):
+        """
+        Esta función ejecuta la llamada en el hilo de trabajo con la sesión propia de ese hilo
+        """
+        if self.cancelada:
+            self.senales.terminada.emit(self, None)
+            return
+        try:
+            resultado = self.funcion(*self.argumentos)
+        except Exception as error:
+            self.senales.fallida.emit(self, error)
+        else:
+            self.senales.terminada.emit(self, resultado)
+        finally:
+            #Los hilos del pool se reutilizan: se libera la conexión de la sesión del hilo
+            cerrar_sesion()
+
+
+class EjecutorTareas(QObject):
+    #Ejecuta las llamadas lentas a la lógica fuera del hilo de la interfaz. Cada tarea pertenece a un grupo
+    #(normalmente la ventana que espera el resultado); una tarea nueva del mismo grupo cancela la anterior
+
+    #Indica si hay tareas en curso, para mostrar el indicador de carga
+    ocupado_cambiado = pyqtSignal(bool)
+    #Entrega las excepciones de las tareas que no indicaron al_fallar
+    error_tarea = pyqtSignal(object)
+
+    def __init__(self, max_hilos=None, parent=None):
+        """
+        Constructor del ejecutor
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_hilos is not None:
+            self.pool.setMaxThreadCount(max_hilos)
+        self.senales = SenalesTarea(self)
+        self.senales.terminada.connect(self.recibir_resultado)
+        self.senales.fallida.connect(self.recibir_error)
+        self.tareas = {}
+        self.pendientes = set()
+
+    def ejecutar(self, grupo, funcion, *argumentos, al_terminar=None, al_fallar=None):
+        """
+        Esta función ejecuta la función en un hilo de trabajo; al_terminar recibe el resultado y al_fallar
+        la excepción, ambas en el hilo de la interfaz
+        """
+        self.cancelar(grupo)
+        tarea = TareaFachada(grupo, funcion, argumentos, self.senales, al_terminar, al_fallar)
+        self.tareas[grupo] = tarea
+        self.pendientes.add(tarea)
+        if len(self.pendientes) == 1:
+            self.ocupado_cambiado.emit(True)
+        self.pool.start(tarea)
+        return tarea
+
+    def cancelar(self, *grupos):
+        """
+        Esta función cancela las tareas de los grupos recibidos; las que aún no empiezan se sacan del pool
+        y las que están en curso terminan sin entregar su resultado
+        """
+        for grupo in grupos:
+            tarea = self.tareas.pop(grupo, None)
+            if tarea is None:
+                continue
+            tarea.cancelar()
+            if self.pool.tryTake(tarea):
+                self.finalizar(tarea)
+
+    def cancelar_todo(self):
+        """
+        Esta función cancela todas las tareas y espera a que terminen las que están en curso
+        """
+        self.cancelar(*list(self.tareas))
+        self.pool.waitForDone()
+
+    def esta_ocupado(self):
+        return bool(self.pendientes)
+
+    def finalizar(self, tarea):
+        """
+        Esta función retira una tarea terminada y retorna si su resultado se debe entregar
+        """
+        if tarea not in self.pendientes:
+            return False
+        self.pendientes.discard(tarea)
+        if self.tareas.get(tarea.grupo) is tarea:
+            del self.tareas[tarea.grupo]
+        if not self.pendientes:
+            self.ocupado_cambiado.emit(False)
+        return not tarea.cancelada
+
+    def recibir_resultado(self, tarea, resultado):
+        if self.finalizar(tarea) and tarea.al_terminar is not None:
+            tarea.al_terminar(resultado)
+
+    def recibir_error(self, tarea, error):
+        if not self.finalizar(tarea):
+            return
+        if tarea.al_fallar is not None:
+            tarea.al_fallar(error)
+        else:
+            self.error_tarea.emit(error)
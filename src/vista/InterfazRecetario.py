@@ -1,4 +1,6 @@
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from .EjecutorTareas import EjecutorTareas
 from .VistaListaRecetas import VistaListaRecetas
 from .VistaReceta import VistaReceta
 from .VistaListaIngredientes import VistaListaIngredientes
@@ -20,14 +22,71 @@ class App_Recetario(QApplication):
         super(App_Recetario, self).__init__(sys_argv)
 
         self.logica = logica
+        #Las consultas lentas a la lógica se hacen en hilos de trabajo para no congelar la interfaz
+        self.ejecutor = EjecutorTareas(parent=self)
+        self.ejecutor.ocupado_cambiado.connect(self.mostrar_indicador_carga)
+        self.ejecutor.error_tarea.connect(self.mostrar_error_carga)
+        self.aboutToQuit.connect(self.ejecutor.cancelar_todo)
+        #Registro de ventanas: cada vista se construye una sola vez y luego solo se oculta y se vuelve a mostrar
+        self.ventanas = {}
+        self.mostrar_vista_lista_recetas()
+
+    def dar_ventana(self, nombre, clase, *argumentos):
+        """
+        Esta función retorna la ventana registrada con el nombre dado, construyéndola solo la primera vez
+        """
+        ventana = self.ventanas.get(nombre)
+        if ventana is None:
+            ventana = clase(self, *argumentos)
+            self.ventanas[nombre] = ventana
+        return ventana
+
+    def mostrar_ventana(self, ventana):
+        """
+        Esta función vuelve a mostrar una ventana registrada y la pone al frente
+        """
+        ventana.show()
+        ventana.raise_()
+        ventana.activateWindow()
+
+    def mostrar_indicador_carga(self, ocupado):
+        """
+        Esta función muestra el cursor de espera mientras hay consultas en curso
+        """
+        if ocupado:
+            self.setOverrideCursor(Qt.WaitCursor)
+        else:
+            self.restoreOverrideCursor()
+
+    def mostrar_error_carga(self, error):
+        """
+        Esta función informa que una consulta en segundo plano falló y vuelve a la lista de recetas
+        """
+        mensaje_error = QMessageBox()
+        mensaje_error.setIcon(QMessageBox.Warning)
+        mensaje_error.setText("Error al consultar los datos: " + str(error))
+        mensaje_error.setWindowTitle("Error")
+        mensaje_error.exec_()
         self.mostrar_vista_lista_recetas()
 
     def mostrar_vista_lista_recetas(self):
         """
-        Esta función inicializa la ventana de lista de recetas
+        Esta función muestra la ventana de lista de recetas
+        """
+        #Al salir de una ventana de detalle se descarta la consulta que aún la estaba llenando
+        self.ejecutor.cancelar('ventana')
+        nueva = 'lista_recetas' not in self.ventanas
+        self.vista_lista_recetas = self.dar_ventana('lista_recetas', VistaListaRecetas)
+        if nueva:
+            #Después de la primera carga la tabla se actualiza con los eventos de cambio de la lógica
+            self.recargar_recetas()
+        self.mostrar_ventana(self.vista_lista_recetas)
+
+    def recargar_recetas(self):
+        """
+        Esta función muestra la primera página de recetas en la ventana de lista de recetas
         """
-        self.vista_lista_recetas = VistaListaRecetas(self)
-        self.vista_lista_recetas.mostrar_recetas(self.logica.dar_recetas())
+        self.vista_lista_recetas.recargar_recetas()
 
     def crear_receta(self):
         """
@@ -37,27 +96,28 @@ class App_Recetario(QApplication):
 
     def mostrar_receta(self, id_receta=-1):
         """
-        Esta función muestra la información de una receta
+        Esta función muestra la información de una receta a partir de su id, o -1 para una receta nueva
         """
         self.receta_actual = id_receta
         if id_receta != -1:
-            self.mostrar_ventana_receta(self.logica.dar_receta(self.receta_actual))
+            self.ejecutor.ejecutar('ventana', self.logica.dar_receta_por_id, self.receta_actual,
+                                   al_terminar=self.mostrar_ventana_receta)
         else:
             self.mostrar_ventana_receta(None)
     
-    def eliminar_receta(self, indice):
+    def eliminar_receta(self, id_receta):
         """
-        Esta función permite eliminar una receta
+        Esta función permite eliminar una receta a partir de su id
         """
-        self.logica.eliminar_receta(indice)
-        self.vista_lista_recetas.mostrar_recetas(self.logica.dar_recetas())
+        self.logica.eliminar_receta_por_id(id_receta)
 		
     def mostrar_ventana_receta(self, receta):
         """
         Esta función muestra la ventana con la información de una receta
         """
-        self.vistaReceta = VistaReceta(self)
+        self.vistaReceta = self.dar_ventana('receta', VistaReceta)
         self.vistaReceta.mostrar_receta(receta)
+        self.mostrar_ventana(self.vistaReceta)
 
 
     def guardar_receta(self, receta, tiempo, personas, calorias, preparacion):
@@ -69,46 +129,46 @@ class App_Recetario(QApplication):
             if self.receta_actual == -1:
                 self.logica.crear_receta(receta, tiempo, personas, calorias, preparacion)
             else:
-                self.logica.editar_receta(self.receta_actual, receta, tiempo, personas, calorias, preparacion)
-            self.vista_lista_recetas.mostrar_recetas(self.logica.dar_recetas())
+                self.logica.editar_receta_por_id(self.receta_actual, receta, tiempo, personas, calorias, preparacion)
         return validacion
     
     def mostrar_ingredientes(self):
         """
         Esta función muestra la ventana con la lista de ingredientes
         """
-        self.vista_lista_ingredientes=VistaListaIngredientes(self)
-        self.vista_lista_ingredientes.mostrar_ingredientes(self.logica.dar_ingredientes())
+        self.ejecutor.cancelar('ventana')
+        self.vista_lista_ingredientes = self.dar_ventana('lista_ingredientes', VistaListaIngredientes)
+        self.mostrar_ventana(self.vista_lista_ingredientes)
 
     def crear_ingrediente(self, nombre, unidad, valor, sitioCompra):
         """
         Esta función permite crear un nuevo ingrediente
         """
-        id_creacion = -1
-        validacion = self.logica.validar_crear_editar_ingrediente(id_creacion, nombre, unidad, valor, sitioCompra)
+        validacion = self.logica.validar_crear_editar_ingrediente_por_id(None, nombre, unidad, valor, sitioCompra)
         if validacion == "":
+            #La tabla agrega la fila cuando la lógica publica el cambio
             self.logica.crear_ingrediente(nombre, unidad, valor, sitioCompra)
         else:
             self.vista_lista_ingredientes.error(validacion)
-        self.vista_lista_ingredientes.mostrar_ingredientes(self.logica.dar_ingredientes())
         return validacion
 
-    def editar_ingrediente(self, id, nombre, unidad, valor, sitioCompra):
+    def editar_ingrediente(self, id_ingrediente, nombre, unidad, valor, sitioCompra):
         """
-        Esta función permite editar un ingrediente
+        Esta función permite editar un ingrediente a partir de su id
         """
-        validacion = self.logica.validar_crear_editar_ingrediente(id, nombre, unidad, valor, sitioCompra)
+        validacion = self.logica.validar_crear_editar_ingrediente_por_id(id_ingrediente, nombre, unidad, valor, sitioCompra)
         if validacion == "":
-            self.logica.editar_ingrediente(id, nombre, unidad, valor, sitioCompra)
+            self.logica.editar_ingrediente_por_id(id_ingrediente, nombre, unidad, valor, sitioCompra)
         else:
             self.vista_lista_ingredientes.error(validacion)
 
-    def eliminar_ingrediente(self, indice):
+    def eliminar_ingrediente(self, id_ingrediente):
         """
-        Esta función permite eliminar un ingrediente
+        Esta función permite eliminar un ingrediente a partir de su id
         """
-        self.logica.eliminar_ingrediente(indice)
-        self.vista_lista_ingredientes.mostrar_ingredientes(self.logica.dar_ingredientes())
+        resultado = self.logica.eliminar_ingrediente_por_id(id_ingrediente)
+        if resultado is not None and self.logica.dar_ingrediente_por_id(id_ingrediente) is not None:
+            self.vista_lista_ingredientes.error(resultado)
 
 
     def agregar_ingrediente_receta(self, receta, ingrediente, cantidad):
@@ -146,16 +206,38 @@ class App_Recetario(QApplication):
         """
         Esta función muestra la ventana con la lista de ingredientes de una receta
         """
-        ingredientes = self.logica.dar_ingredientes()
-        self.vista_lista_ingReceta = VistaListaIngredientesReceta(self, receta, ingredientes)
-        self.vista_lista_ingReceta.mostrar_ing_receta(self.logica.dar_ingredientes_receta(self.receta_actual))
+        self.ejecutor.ejecutar('ventana', self.dar_datos_ingredientes_receta, self.receta_actual,
+                               al_terminar=lambda datos: self.mostrar_ventana_ingredientes_receta(receta, *datos))
+
+    def dar_datos_ingredientes_receta(self, id_receta):
+        """
+        Esta función consulta, en el hilo de trabajo, los ingredientes disponibles y los de la receta
+        """
+        return self.logica.dar_ingredientes(), self.logica.dar_ingredientes_receta_por_id(id_receta)
+
+    def mostrar_ventana_ingredientes_receta(self, receta, ingredientes, ingredientes_receta):
+        """
+        Esta función muestra la ventana de ingredientes de una receta con los datos ya consultados
+        """
+        self.vista_lista_ingReceta = self.dar_ventana('ingredientes_receta', VistaListaIngredientesReceta, receta, ingredientes)
+        self.vista_lista_ingReceta.cambiar_receta(receta, ingredientes)
+        self.vista_lista_ingReceta.mostrar_ing_receta(ingredientes_receta)
+        self.mostrar_ventana(self.vista_lista_ingReceta)
 
 
     def mostrar_preparacion(self, id_receta, cantidad_personas):
         """
-        Esta función muestra la preparacieon de una receta para un número de personas
+        Esta función muestra la preparacieon de una receta para un número de personas a partir de su id
+        """
+        self.ejecutor.ejecutar('ventana', self.logica.dar_preparacion_por_id, id_receta, cantidad_personas,
+                               al_terminar=self.mostrar_ventana_preparacion)
+
+    def mostrar_ventana_preparacion(self, datos_preparacion):
+        """
+        Esta función muestra el reporte de preparación con los datos ya consultados
         """
-        self.datos_preparacion = self.logica.dar_preparacion(id_receta, cantidad_personas)
-        self.vista_reporte = VistaPreparacion( self, self.datos_preparacion['receta'])
+        self.datos_preparacion = datos_preparacion
+        self.vista_reporte = self.dar_ventana('preparacion', VistaPreparacion, self.datos_preparacion['receta'])
         self.vista_reporte.mostrar_datos(self.datos_preparacion)
+        self.mostrar_ventana(self.vista_reporte)
 
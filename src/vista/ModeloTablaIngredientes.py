@@ -0,0 +1,93 @@
+from PyQt5.QtGui import *
+from PyQt5.QtCore import *
+
+from src.logica.PublicadorCambios import INGREDIENTE
+from .CacheRecursos import dar_icono
+from .ModeloTablaPaginada import ModeloTablaPaginada
+
+
+class ModeloTablaIngredientes(ModeloTablaPaginada):
+    #Modelo de la tabla de ingredientes: pide los ingredientes a la lógica por páginas, en el orden
+    #de la columna seleccionada, y aplica los cambios fila por fila
+
+    COLUMNAS = [
+        ('nombre', "Ingrediente"),
+        ('unidad', "Unidad"),
+        ('valor', "Valor \n por unidad"),
+        ('sitioCompra', "Sitio \n compra"),
+    ]
+    #Columnas de acciones: (acción, texto de ayuda, ícono)
+    ACCIONES = {
+        4: ('editar', "Editar", "004-edit-button.png"),
+        5: ('eliminar', "Borrar", "005-delete.png"),
+    }
+    #Columnas por las que se puede ordenar y la llave de paginación de cada orden
+    ORDENES = {0: 'nombre', 1: 'unidad'}
+    LLAVES = {'nombre': ('nombre', 'unidad', 'id'), 'unidad': ('unidad', 'nombre', 'id')}
+
+    def __init__(self, logica, parent=None, ejecutor=None):
+        """
+        Constructor del modelo
+        """
+        super().__init__(logica, INGREDIENTE, parent, ejecutor)
+        self.orden = 'nombre'
+        self.iconos = {columna: dar_icono(ruta) for columna, (_, _, ruta) in self.ACCIONES.items()}
+
+    def dar_pagina(self, despues_de=None):
+        return self.logica.dar_pagina_ingredientes(despues_de, orden=self.orden, descendente=self.descendente)
+
+    def dar_elemento_por_id(self, id_ingrediente):
+        return self.logica.dar_ingrediente_por_id(id_ingrediente)
+
+    def dar_llave(self, ingrediente):
+        return tuple(ingrediente[clave] for clave in self.LLAVES[self.orden])
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNAS) + len(self.ACCIONES)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.filas):
+            return None
+        columna = index.column()
+        if columna in self.ACCIONES:
+            accion, ayuda, _ = self.ACCIONES[columna]
+            if role == Qt.DecorationRole:
+                return self.iconos[columna]
+            if role == Qt.ToolTipRole:
+                return ayuda
+            if role == Qt.UserRole:
+                return accion
+            return None
+
+        clave = self.COLUMNAS[columna][0]
+        if role == Qt.DisplayRole:
+            return str(self.filas[index.row()][clave])
+        if role == Qt.TextAlignmentRole:
+            if clave == 'valor':
+                return Qt.AlignRight | Qt.AlignVCenter
+            if clave in ('unidad', 'sitioCompra'):
+                return Qt.AlignCenter
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if orientacion != Qt.Horizontal:
+            return None
+        if role == Qt.DisplayRole:
+            if seccion < len(self.COLUMNAS):
+                return self.COLUMNAS[seccion][1]
+            return "Opciones" if seccion == min(self.ACCIONES) else ""
+        if role == Qt.FontRole:
+            return QFont("Times", weight=QFont.Bold)
+        return None
+
+    def sort(self, columna, orden=Qt.AscendingOrder):
+        """
+        Esta función ordena la tabla por nombre o por unidad pidiendo de nuevo los datos a la lógica
+        """
+        if columna not in self.ORDENES:
+            return
+        self.orden = self.ORDENES[columna]
+        self.descendente = orden == Qt.DescendingOrder
+        self.recargar()
@@ -0,0 +1,178 @@
+from PyQt5.QtCore import *
+
+from src.logica.PublicadorCambios import CREADO, ELIMINADO
+
+
+class ModeloTablaPaginada(QAbstractTableModel):
+    #Modelo base de las tablas que piden los datos a la lógica por páginas y se actualizan fila por fila
+    #con los eventos de cambio que publica la lógica
+
+    #Los eventos pueden publicarse desde otro hilo; la señal los lleva al hilo de la interfaz
+    cambio_recibido = pyqtSignal(object)
+
+    def __init__(self, logica, entidad, parent=None, ejecutor=None):
+        """
+        Constructor del modelo
+        """
+        super().__init__(parent)
+        self.logica = logica
+        #Con un ejecutor la primera página se consulta en un hilo de trabajo; una recarga nueva cancela la anterior
+        self.ejecutor = ejecutor
+        self.grupo_carga = 'tabla_' + entidad
+        self.filas = []
+        self.siguiente = None
+        self.descendente = False
+        self.cambio_recibido.connect(self.aplicar_cambio)
+        self.logica.suscribir_cambios(self.recibir_cambio, entidad)
+
+    def dar_pagina(self, despues_de=None):
+        """
+        Esta función retorna la página de la lógica que sigue a la llave recibida
+        """
+        raise NotImplementedError("Método no implementado")
+
+    def dar_elemento_por_id(self, id_elemento):
+        """
+        Esta función retorna el elemento con el id recibido o None si ya no existe
+        """
+        raise NotImplementedError("Método no implementado")
+
+    def dar_llave(self, elemento):
+        """
+        Esta función retorna la llave por la que está ordenada la tabla
+        """
+        raise NotImplementedError("Método no implementado")
+
+    def recargar(self):
+        """
+        Esta función descarta las filas cargadas y pide la primera página a la lógica
+        """
+        if self.ejecutor is None:
+            self.mostrar_primera_pagina(self.dar_pagina())
+        else:
+            self.ejecutor.ejecutar(self.grupo_carga, self.dar_pagina, al_terminar=self.mostrar_primera_pagina)
+
+    def mostrar_primera_pagina(self, pagina):
+        """
+        Esta función reemplaza las filas por la primera página consultada
+        """
+        self.beginResetModel()
+        self.filas = pagina['elementos']
+        self.siguiente = pagina['siguiente']
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.filas)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.siguiente is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        """
+        Esta función agrega la siguiente página cuando la tabla llega al final
+        """
+        if parent.isValid() or self.siguiente is None:
+            return
+        pagina = self.dar_pagina(self.siguiente)
+        if pagina['elementos']:
+            inicio = len(self.filas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(pagina['elementos']) - 1)
+            self.filas.extend(pagina['elementos'])
+            self.endInsertRows()
+        self.siguiente = pagina['siguiente']
+
+    def dar_elemento(self, fila):
+        return self.filas[fila]
+
+    def dar_fila(self, id_elemento):
+        for fila, elemento in enumerate(self.filas):
+            if elemento['id'] == id_elemento:
+                return fila
+        return None
+
+    def dar_posicion_nueva(self, elemento):
+        """
+        Esta función retorna la fila en la que va el elemento según el orden actual, o None si
+        queda después de las filas cargadas y todavía hay páginas por pedir
+        """
+        llave = self.dar_llave(elemento)
+        for fila, otro in enumerate(self.filas):
+            llave_otro = self.dar_llave(otro)
+            if (llave > llave_otro) if self.descendente else (llave < llave_otro):
+                return fila
+        if self.siguiente is not None:
+            return None
+        return len(self.filas)
+
+    def insertar_elemento(self, elemento):
+        """
+        Esta función agrega un elemento nuevo en su posición sin volver a cargar la tabla
+        """
+        fila = self.dar_posicion_nueva(elemento)
+        if fila is None:
+            #El elemento llegará con la página que lo contenga
+            return
+        self.beginInsertRows(QModelIndex(), fila, fila)
+        self.filas.insert(fila, elemento)
+        self.endInsertRows()
+
+    def actualizar_elemento(self, elemento):
+        """
+        Esta función reemplaza los datos de un elemento editado y lo mueve si cambió su posición
+        """
+        fila = self.dar_fila(elemento['id'])
+        if fila is None:
+            self.insertar_elemento(elemento)
+            return
+        if self.dar_llave(elemento) == self.dar_llave(self.filas[fila]):
+            self.filas[fila] = elemento
+            self.dataChanged.emit(self.index(fila, 0), self.index(fila, self.columnCount() - 1))
+            return
+        self.quitar_elemento(elemento['id'])
+        self.insertar_elemento(elemento)
+
+    def quitar_elemento(self, id_elemento):
+        """
+        Esta función quita la fila de un elemento eliminado
+        """
+        fila = self.dar_fila(id_elemento)
+        if fila is None:
+            return
+        self.beginRemoveRows(QModelIndex(), fila, fila)
+        del self.filas[fila]
+        self.endRemoveRows()
+
+    def recibir_cambio(self, evento):
+        """
+        Esta función recibe los eventos de la lógica, posiblemente desde otro hilo
+        """
+        self.cambio_recibido.emit(evento)
+
+    def aplicar_cambio(self, evento):
+        """
+        Esta función actualiza solo la fila afectada por el evento
+        """
+        if evento.id is None:
+            #Una importación masiva cambió muchas filas: se vuelve a cargar la primera página
+            self.recargar()
+            return
+        if evento.tipo == ELIMINADO:
+            self.quitar_elemento(evento.id)
+            return
+        elemento = self.dar_elemento_por_id(evento.id)
+        if elemento is None:
+            self.quitar_elemento(evento.id)
+        elif evento.tipo == CREADO:
+            self.insertar_elemento(elemento)
+        else:
+            self.actualizar_elemento(elemento)
+
+    def desconectar(self):
+        """
+        Esta función deja de recibir los eventos de la lógica
+        """
+        self.logica.cancelar_suscripcion_cambios(self.recibir_cambio)
@@ -0,0 +1,68 @@
+from PyQt5.QtGui import *
+from PyQt5.QtCore import *
+
+from src.logica.PublicadorCambios import RECETA
+from .CacheRecursos import dar_icono
+from .ModeloTablaPaginada import ModeloTablaPaginada
+
+
+class ModeloTablaRecetas(ModeloTablaPaginada):
+    #Modelo de la tabla de recetas: pide las recetas a la lógica por páginas a medida que se desplaza la tabla
+
+    COLUMNA_NOMBRE = 0
+    #Columnas de acciones: (acción, texto de ayuda, ícono)
+    ACCIONES = {
+        1: ('editar', "Editar", "004-edit-button.png"),
+        2: ('eliminar', "Borrar", "005-delete.png"),
+        3: ('preparar', "Preparar", "002-preparar.png"),
+    }
+    ENCABEZADOS = ["Nombre", "Opciones", "", ""]
+
+    def __init__(self, logica, parent=None, ejecutor=None):
+        """
+        Constructor del modelo
+        """
+        super().__init__(logica, RECETA, parent, ejecutor)
+        self.iconos = {columna: dar_icono(ruta) for columna, (_, _, ruta) in self.ACCIONES.items()}
+
+    def dar_pagina(self, despues_de=None):
+        return self.logica.dar_pagina_recetas(despues_de)
+
+    def dar_elemento_por_id(self, id_receta):
+        receta = self.logica.dar_receta_por_id(id_receta)
+        if receta is not None:
+            #La tabla no muestra la preparación
+            receta.pop('preparacion', None)
+        return receta
+
+    def dar_llave(self, receta):
+        return (receta['nombre'], receta['id'])
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.ENCABEZADOS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.filas):
+            return None
+        columna = index.column()
+        if columna == self.COLUMNA_NOMBRE:
+            if role == Qt.DisplayRole:
+                return self.filas[index.row()]['nombre']
+            return None
+        accion, ayuda, _ = self.ACCIONES[columna]
+        if role == Qt.DecorationRole:
+            return self.iconos[columna]
+        if role == Qt.ToolTipRole:
+            return ayuda
+        if role == Qt.UserRole:
+            return accion
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientacion == Qt.Horizontal:
+            return self.ENCABEZADOS[seccion]
+        if role == Qt.FontRole and orientacion == Qt.Horizontal:
+            return QFont("Times", weight=QFont.Bold)
+        return None
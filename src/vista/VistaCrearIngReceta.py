@@ -3,6 +3,7 @@ from PyQt5 import QtCore
 
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
+from .CacheRecursos import dar_icono
 
 
 class VistaCrearIngReceta(QDialog):
@@ -18,7 +19,7 @@ class VistaCrearIngReceta(QDialog):
         self.ingredientes = ingredientes
 
         self.setFixedSize(400, 300)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
 
         self.resultado = ""
 
@@ -1,9 +1,10 @@
 from PyQt5.QtWidgets import * 
 from PyQt5.QtGui import * 
 from PyQt5.QtCore import *
+from .CacheRecursos import dar_icono
 
-from functools import partial
-
+from  .DelegadoAcciones import DelegadoAcciones
+from  .ModeloTablaIngredientes import ModeloTablaIngredientes
 from  .VistaCrearIngrediente import VistaCrearIngrediente
 
 
@@ -30,7 +31,7 @@ class VistaListaIngredientes(QWidget):
         # inicializamos la ventana
         self.setWindowTitle(self.titulo)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
          
         self.distribuidor_base = QVBoxLayout(self)        
 
@@ -42,13 +43,13 @@ class VistaListaIngredientes(QWidget):
         self.btn_agregar_ingrediente=QPushButton("Agregar ingrediente", self)
         self.btn_agregar_ingrediente.setFixedSize(170, 40)
         self.btn_agregar_ingrediente.setToolTip("Agregar ingrediente")
-        self.btn_agregar_ingrediente.setIcon(QIcon("src/recursos/006-add.png"))
+        self.btn_agregar_ingrediente.setIcon(dar_icono("006-add.png"))
         self.btn_agregar_ingrediente.clicked.connect(self.mostrar_dialogo_agregar_ingrediente)
 
         self.btn_volver = QPushButton("Volver", self)
         self.btn_volver.setFixedSize(170, 40)
         self.btn_volver.setToolTip("Volver")
-        self.btn_volver.setIcon(QIcon("src/recursos/007-back-button.png"))
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
         self.btn_volver.clicked.connect(self.volver)
 
 
@@ -58,57 +59,37 @@ class VistaListaIngredientes(QWidget):
         self.contenedor_tabla.setTitle('Ingredientes')
         self.distribuidor_base.addWidget(self.contenedor_tabla)
 
-        #Creación de la tabla con la lista de ingredientes
-        self.tabla_ingredientes = QScrollArea(self)
-        self.tabla_ingredientes.setWidgetResizable(True)
-        self.tabla_ingredientes.setStyleSheet('QScrollArea{border:none}')
+        #Creación de la tabla con la lista de ingredientes: solo se dibujan las filas visibles
+        self.modelo_ingredientes = ModeloTablaIngredientes(self.interfaz.logica, self, self.interfaz.ejecutor)
+        self.tabla_ingredientes = QTableView(self)
+        self.tabla_ingredientes.setModel(self.modelo_ingredientes)
+        self.tabla_ingredientes.setStyleSheet('QTableView{border:none}')
         self.tabla_ingredientes.setFixedSize(700, 300)
-        self.widget_tabla_ingredientes = QWidget()
-        self.distribuidor_tabla_ingredientes = QGridLayout(self.widget_tabla_ingredientes)
-        self.tabla_ingredientes.setWidget(self.widget_tabla_ingredientes)
+        self.tabla_ingredientes.setShowGrid(False)
+        self.tabla_ingredientes.setSelectionMode(QAbstractItemView.NoSelection)
+        self.tabla_ingredientes.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla_ingredientes.setMouseTracking(True)
+        self.tabla_ingredientes.setWordWrap(True)
+        self.tabla_ingredientes.verticalHeader().setVisible(False)
+        self.tabla_ingredientes.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tabla_ingredientes.verticalHeader().setDefaultSectionSize(40)
+        self.tabla_ingredientes.horizontalHeader().setMinimumHeight(60)
+        for columna, ancho in enumerate([180, 80, 120, 180]):
+            self.tabla_ingredientes.setColumnWidth(columna, ancho)
+
+        #Se ordena por nombre o por unidad haciendo clic en el encabezado; activar el orden llama a
+        #sort, que carga la primera página, por lo que la ventana no necesita otra carga inicial
+        self.tabla_ingredientes.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
+        self.tabla_ingredientes.setSortingEnabled(True)
+
+        #Las acciones de cada fila se dibujan con un delegado en lugar de botones
+        self.delegado_acciones = DelegadoAcciones(30, self)
+        self.delegado_acciones.accion_solicitada.connect(self.ejecutar_accion)
+        for columna in ModeloTablaIngredientes.ACCIONES:
+            self.tabla_ingredientes.setItemDelegateForColumn(columna, self.delegado_acciones)
+            self.tabla_ingredientes.setColumnWidth(columna, 50)
         self.contenedor_tabla.layout().addWidget(self.tabla_ingredientes)
 
-        self.distribuidor_tabla_ingredientes.setColumnStretch(0, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(1, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(2, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(3, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(4, 1)
-        self.distribuidor_tabla_ingredientes.setColumnStretch(5, 1)
-
-        self.distribuidor_tabla_ingredientes.setSpacing(0)
-
-        #Creación de las etiquetas de encabezado
-        etiqueta_nombre = QLabel("Ingrediente")
-        etiqueta_nombre.setFixedSize(180,40)
-        etiqueta_nombre.setFont(QFont("Times",weight=QFont.Bold)) 
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_nombre, 0, 0, Qt.AlignTop)
-
-        etiqueta_unidad = QLabel("Unidad")
-        etiqueta_unidad.setFixedSize(80,40)
-        etiqueta_unidad.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_unidad.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_unidad, 0, 1, Qt.AlignTop)
-        
-        etiqueta_valor = QLabel("Valor \n por unidad")
-        etiqueta_valor.setFixedSize(100,60)
-        etiqueta_valor.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_valor.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_valor, 0, 2, Qt.AlignTop)
-
-        etiqueta_sitio = QLabel("Sitio \n compra")
-        etiqueta_sitio.setFixedSize(180,60)
-        etiqueta_sitio.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_sitio.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_sitio, 0, 3, Qt.AlignTop)
-
-
-
-        etiqueta_accion = QLabel("Opciones")
-        etiqueta_accion.setFixedSize(60,40)
-        etiqueta_accion.setFont(QFont("Times",weight=QFont.Bold)) 
-        etiqueta_accion.setAlignment(Qt.AlignCenter)
-        self.distribuidor_tabla_ingredientes.addWidget(etiqueta_accion, 0, 4, 0, 2, Qt.AlignTop | Qt.AlignCenter)
-
         #Se añaden los botones a la caja de botones
         caja_botones.layout().addWidget(self.btn_agregar_ingrediente)
         caja_botones.layout().addWidget(self.btn_volver)
@@ -117,57 +98,14 @@ class VistaListaIngredientes(QWidget):
         caja_botones.setStyleSheet("#MyBox{border:3px}")
         self.distribuidor_base.addWidget(caja_botones)
 
-    def mostrar_ingredientes(self, lista_ingredientes):
+    def ejecutar_accion(self, accion, indice):
         """
-        Esta función muestra la lista de ingredientes
+        Esta función ejecuta la acción seleccionada en la fila de un ingrediente
         """
-        self.ingredientes = lista_ingredientes
-
-        #Ciclo para poblar la tabla
-        numero_fila = 0
-        for ingrediente in self.ingredientes:
-
-            etiqueta_nombre=QLabel(ingrediente["nombre"])
-            etiqueta_nombre.setWordWrap(True)
-            etiqueta_nombre.setFixedSize(180,40)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_nombre, numero_fila + 1, 0, Qt.AlignTop)
-
-            etiqueta_unidad=QLabel(ingrediente["unidad"])
-            etiqueta_unidad.setWordWrap(True)
-            etiqueta_unidad.setFixedSize(80,40)
-            etiqueta_unidad.setAlignment(Qt.AlignCenter)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_unidad, numero_fila + 1, 1, Qt.AlignTop)
-
-            etiqueta_valor=QLabel(str(ingrediente["valor"]))
-            etiqueta_valor.setWordWrap(True)
-            etiqueta_valor.setFixedSize(120,40)
-            etiqueta_valor.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_valor, numero_fila + 1, 2, Qt.AlignHCenter)
-
-            etiqueta_sitioCompras=QLabel(ingrediente["sitioCompra"])
-            etiqueta_sitioCompras.setWordWrap(True)
-            etiqueta_sitioCompras.setFixedSize(180,40)
-            etiqueta_sitioCompras.setAlignment(Qt.AlignCenter)
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_sitioCompras, numero_fila + 1, 3, Qt.AlignTop)
-
-            boton_editar=QPushButton("",self)
-            boton_editar.setToolTip("Editar")
-            boton_editar.setFixedSize(40,40)
-            boton_editar.setIcon(QIcon("src/recursos/004-edit-button.png"))
-            boton_editar.clicked.connect(partial(self.mostrar_dialogo_editar_ingrediente, numero_fila))
-            self.distribuidor_tabla_ingredientes.addWidget(boton_editar, numero_fila + 1, 4, Qt.AlignTop)
-
-            etiqueta_eliminar=QPushButton("",self)
-            etiqueta_eliminar.setToolTip("Borrar")
-            etiqueta_eliminar.setFixedSize(40,40)
-            etiqueta_eliminar.setIcon(QIcon("src/recursos/005-delete.png"))
-            etiqueta_eliminar.clicked.connect(partial(self.eliminar_ingrediente, numero_fila))
-            self.distribuidor_tabla_ingredientes.addWidget(etiqueta_eliminar, numero_fila + 1, 5, Qt.AlignTop)
-
-            numero_fila=numero_fila+1
-
-            #para ajustar la forma de la tabla (y evitar que queden muy espaciados)
-            self.distribuidor_tabla_ingredientes.layout().setRowStretch(numero_fila + 1, 1)
+        if accion == 'editar':
+            self.mostrar_dialogo_editar_ingrediente(indice)
+        elif accion == 'eliminar':
+            self.eliminar_ingrediente(indice)
 
     def mostrar_dialogo_agregar_ingrediente(self):
         """
@@ -183,12 +121,11 @@ class VistaListaIngredientes(QWidget):
         """
         Esta función ejecuta el diálogo para editar un ingrediente
         """    
-        dialogo=VistaCrearIngrediente(self.ingredientes[id_ingrediente], self.interfaz)
+        ingrediente = self.modelo_ingredientes.dar_elemento(id_ingrediente)
+        dialogo=VistaCrearIngrediente(ingrediente, self.interfaz)
         dialogo.exec_()
         if dialogo.resultado==1:  
-            self.interfaz.editar_ingrediente(id_ingrediente, dialogo.texto_nombre.text(), dialogo.texto_unidad.text(),dialogo.texto_valor.text(), dialogo.texto_sitioCompra.text())
-            self.hide()
-            self.interfaz.mostrar_ingredientes()
+            self.interfaz.editar_ingrediente(ingrediente['id'], dialogo.texto_nombre.text(), dialogo.texto_unidad.text(),dialogo.texto_valor.text(), dialogo.texto_sitioCompra.text())
 
     def eliminar_ingrediente(self, indice_ingrediente):
         """
@@ -198,13 +135,12 @@ class VistaListaIngredientes(QWidget):
         mensaje_confirmacion.setIcon(QMessageBox.Question)
         mensaje_confirmacion.setText("¿Esta seguro de que desea eliminar este ingrediente?\nRecuerde que esta acción es irreversible")
         mensaje_confirmacion.setWindowTitle("¿Desea borrar este ingrediente?")
-        mensaje_confirmacion.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje_confirmacion.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje_confirmacion.setStandardButtons(QMessageBox.Yes | QMessageBox.No ) 
         respuesta=mensaje_confirmacion.exec_()
         if respuesta == QMessageBox.Yes:
-            self.interfaz.eliminar_ingrediente(indice_ingrediente)
-            self.hide()
-            self.interfaz.mostrar_ingredientes()
+            ingrediente = self.modelo_ingredientes.dar_elemento(indice_ingrediente)
+            self.interfaz.eliminar_ingrediente(ingrediente['id'])
 
     def volver(self):
         """
@@ -218,7 +154,7 @@ class VistaListaIngredientes(QWidget):
             mensaje_error.setIcon(QMessageBox.Question)
             mensaje_error.setText("Error : " + error)
             mensaje_error.setWindowTitle("Error al guardar ingrediente")
-            mensaje_error.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+            mensaje_error.setWindowIcon(dar_icono("RecetarioLogo.png"))
             mensaje_error.setStandardButtons(QMessageBox.Ok ) 
             respuesta=mensaje_error.exec_()
 
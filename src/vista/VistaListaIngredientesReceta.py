@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import * 
 from PyQt5.QtGui import * 
 from PyQt5.QtCore import *
+from .CacheRecursos import dar_icono
 
 from functools import partial
 
@@ -33,7 +34,7 @@ class VistaListaIngredientesReceta(QWidget):
         # inicializamos la ventana
         self.setWindowTitle(self.titulo)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
          
         self.distribuidor_base = QVBoxLayout(self)        
 
@@ -46,13 +47,13 @@ class VistaListaIngredientesReceta(QWidget):
         self.btn_agregar_ingredienteReceta=QPushButton("Agregar ingrediente", self)
         self.btn_agregar_ingredienteReceta.setFixedSize(170, 40)
         self.btn_agregar_ingredienteReceta.setToolTip("Agregar ingrediente")
-        self.btn_agregar_ingredienteReceta.setIcon(QIcon("src/recursos/006-add.png"))
+        self.btn_agregar_ingredienteReceta.setIcon(dar_icono("006-add.png"))
         self.btn_agregar_ingredienteReceta.clicked.connect(self.mostrar_dialogo_agregar_ingredienteReceta)
 
         self.btn_volver = QPushButton("Volver", self)
         self.btn_volver.setFixedSize(170, 40)
         self.btn_volver.setToolTip("Volver")
-        self.btn_volver.setIcon(QIcon("src/recursos/007-back-button.png"))
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
         self.btn_volver.clicked.connect(self.volver)
 
         self.contenedor_tabla = QGroupBox(self)
@@ -102,6 +103,13 @@ class VistaListaIngredientesReceta(QWidget):
         caja_botones.setStyleSheet("#MyBox{border:3px}")
         self.distribuidor_base.addWidget(caja_botones)
 
+    def cambiar_receta(self, receta, ingredientes):
+        """
+        Esta función asigna la receta y los ingredientes disponibles cuando se reutiliza la ventana
+        """
+        self.receta = receta
+        self.ingredientes = ingredientes
+
     def mostrar_ing_receta(self, lista_ings_receta):
         """
         Esta función muestra la lista de ingredientes de la receta
@@ -109,7 +117,15 @@ class VistaListaIngredientesReceta(QWidget):
 
         self.contenedor_tabla.setTitle('Ingredientes ' + self.receta['nombre'])
         self.lista_ings_receta = lista_ings_receta
-        
+
+        #La ventana se reutiliza: se quitan las filas de la lista anterior y se dejan los encabezados
+        for posicion in reversed(range(self.distribuidor_tabla_ingReceta.count())):
+            fila, _, _, _ = self.distribuidor_tabla_ingReceta.getItemPosition(posicion)
+            if fila > 0:
+                elemento = self.distribuidor_tabla_ingReceta.takeAt(posicion)
+                elemento.widget().deleteLater()
+        for fila in range(self.distribuidor_tabla_ingReceta.rowCount()):
+            self.distribuidor_tabla_ingReceta.setRowStretch(fila, 0)
 
         #Ciclo para poblar la tabla
         numero_fila = 0
@@ -133,14 +149,14 @@ class VistaListaIngredientesReceta(QWidget):
             boton_editar=QPushButton("",self)
             boton_editar.setToolTip("Editar")
             boton_editar.setFixedSize(30,30)
-            boton_editar.setIcon(QIcon("src/recursos/004-edit-button.png"))
+            boton_editar.setIcon(dar_icono("004-edit-button.png"))
             boton_editar.clicked.connect(partial(self.mostrar_dialogo_editar_ingrediente_receta, numero_fila))
             self.distribuidor_tabla_ingReceta.addWidget(boton_editar, numero_fila + 1, 3, Qt.AlignTop)
 
             boton_eliminar=QPushButton("",self)
             boton_eliminar.setToolTip("Borrar")
             boton_eliminar.setFixedSize(30,30)
-            boton_eliminar.setIcon(QIcon("src/recursos/005-delete.png"))
+            boton_eliminar.setIcon(dar_icono("005-delete.png"))
             boton_eliminar.clicked.connect(partial(self.eliminar_ingrediente_receta, numero_fila))
             self.distribuidor_tabla_ingReceta.addWidget(boton_eliminar, numero_fila + 1, 4, Qt.AlignTop)
 
@@ -158,7 +174,6 @@ class VistaListaIngredientesReceta(QWidget):
         dialogo.exec_()
         if dialogo.resultado==1:
             self.interfaz.agregar_ingrediente_receta(self.receta,self.ingredientes[dialogo.combobox_ingredientes.currentIndex()],dialogo.texto_cantidad.text())
-            self.hide()
             self.interfaz.mostrar_ingredientes_receta(self.receta)
             
 
@@ -170,7 +185,6 @@ class VistaListaIngredientesReceta(QWidget):
         dialogo.exec_()
         if dialogo.resultado==1:            
             self.interfaz.editar_ingrediente_receta(id_ingrediente_receta,self.receta, self.ingredientes[dialogo.combobox_ingredientes.currentIndex()], dialogo.texto_cantidad.text())
-            self.hide()
             self.interfaz.mostrar_ingredientes_receta(self.receta)
 
 
@@ -182,12 +196,11 @@ class VistaListaIngredientesReceta(QWidget):
         mensaje_confirmacion.setIcon(QMessageBox.Question)
         mensaje_confirmacion.setText("¿Esta seguro de que desea eliminar este ingrediente de la receta?\nRecuerde que esta acción es irreversible")
         mensaje_confirmacion.setWindowTitle("¿Desea borrar este ingrediente de la receeta?")
-        mensaje_confirmacion.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje_confirmacion.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje_confirmacion.setStandardButtons(QMessageBox.Yes | QMessageBox.No ) 
         respuesta=mensaje_confirmacion.exec_()
         if respuesta == QMessageBox.Yes:
             self.interfaz.eliminar_ingrediente_receta(id_ingrediente_receta, self.receta)
-            self.hide()
             self.interfaz.mostrar_ingredientes_receta(self.receta)
 
 
@@ -204,7 +217,7 @@ class VistaListaIngredientesReceta(QWidget):
             mensaje_error.setIcon(QMessageBox.Question)
             mensaje_error.setText("Error : " + error)
             mensaje_error.setWindowTitle("Error guardar ingrediente receta")
-            mensaje_error.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+            mensaje_error.setWindowIcon(dar_icono("RecetarioLogo.png"))
             mensaje_error.setStandardButtons(QMessageBox.Ok ) 
             respuesta=mensaje_error.exec_()
 
@@ -1,7 +1,9 @@
 from PyQt5.QtWidgets import * 
 from PyQt5.QtGui import * 
 from PyQt5.QtCore import *
-from functools import partial
+from .CacheRecursos import dar_icono, dar_pixmap
+from .DelegadoAcciones import DelegadoAcciones
+from .ModeloTablaRecetas import ModeloTablaRecetas
 from .VistaPersonasPreparacion import VistaPersonasPreparacion
 
 
@@ -27,13 +29,13 @@ class VistaListaRecetas(QWidget):
         #inicializamos la ventana
         self.setWindowTitle(self.title)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
          
         self.distribuidor_base = QVBoxLayout(self)
 
         #Creación del logo de encabezado
         self.logo=QLabel(self)
-        self.pixmap = QPixmap("src/recursos/RecetarioLogo.png")
+        self.pixmap = dar_pixmap("RecetarioLogo.png")
         self.pixmap = self.pixmap.scaled(488,158, Qt.KeepAspectRatio)
         self.logo.setPixmap(self.pixmap)
         self.logo.setAlignment(Qt.AlignCenter)
@@ -53,7 +55,7 @@ class VistaListaRecetas(QWidget):
         self.btn_crear_receta=QPushButton("Crear receta",self)
         self.btn_crear_receta.setFixedSize(288,48)
         self.btn_crear_receta.setToolTip("Crear receta")
-        self.btn_crear_receta.setIcon(QIcon("src/recursos/006-add.png"))
+        self.btn_crear_receta.setIcon(dar_icono("006-add.png"))
         self.btn_crear_receta.setIconSize(QSize(120,120))
         self.distribuidor_botones.addWidget(self.btn_crear_receta,0,1,Qt.AlignLeft)
         self.btn_crear_receta.clicked.connect(self.crear_receta)
@@ -61,97 +63,69 @@ class VistaListaRecetas(QWidget):
         self.btn_ver_ingredientes=QPushButton("Ingredientes",self)
         self.btn_ver_ingredientes.setFixedSize(288,48)
         self.btn_ver_ingredientes.setToolTip("Ingredientes")
-        self.btn_ver_ingredientes.setIcon(QIcon("src/recursos/010-ingredientes.png"))
+        self.btn_ver_ingredientes.setIcon(dar_icono("010-ingredientes.png"))
         self.btn_ver_ingredientes.setIconSize(QSize(30,30))
         self.distribuidor_botones.addWidget(self.btn_ver_ingredientes,0,2,Qt.AlignRight)
         self.distribuidor_base.addWidget(self.widget_botones,Qt.AlignCenter)
         self.btn_ver_ingredientes.clicked.connect(self.mostrar_ingredientes)
 
-        #Creación del área con la información de las recetas
-        self.tabla_recetas = QScrollArea(self)
-        self.tabla_recetas.setWidgetResizable(True)
+        #Creación de la tabla de recetas: solo se dibujan las filas visibles y las recetas se piden por páginas
+        self.modelo_recetas = ModeloTablaRecetas(self.interfaz.logica, self, self.interfaz.ejecutor)
+        self.tabla_recetas = QTableView(self)
+        self.tabla_recetas.setModel(self.modelo_recetas)
         self.tabla_recetas.setFixedSize(840, 400)
-        self.widget_tabla_recetas = QWidget()
-        self.distribuidor_tabla_recetas = QGridLayout()
-        self.widget_tabla_recetas.setLayout(self.distribuidor_tabla_recetas);
-        self.tabla_recetas.setWidget(self.widget_tabla_recetas)
+        self.tabla_recetas.setShowGrid(False)
+        self.tabla_recetas.setSelectionMode(QAbstractItemView.NoSelection)
+        self.tabla_recetas.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla_recetas.setMouseTracking(True)
+        self.tabla_recetas.setWordWrap(True)
+        self.tabla_recetas.verticalHeader().setVisible(False)
+        self.tabla_recetas.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tabla_recetas.verticalHeader().setDefaultSectionSize(48)
+        self.tabla_recetas.horizontalHeader().setSectionResizeMode(ModeloTablaRecetas.COLUMNA_NOMBRE, QHeaderView.Stretch)
+
+        #Las acciones de cada fila se dibujan con un delegado en lugar de botones
+        self.delegado_acciones = DelegadoAcciones(30, self)
+        self.delegado_acciones.accion_solicitada.connect(self.ejecutar_accion)
+        for columna in ModeloTablaRecetas.ACCIONES:
+            self.tabla_recetas.setItemDelegateForColumn(columna, self.delegado_acciones)
+            self.tabla_recetas.horizontalHeader().setSectionResizeMode(columna, QHeaderView.Fixed)
+            self.tabla_recetas.setColumnWidth(columna, 60)
         self.distribuidor_base.addWidget(self.tabla_recetas)
 
+        #La ventana se reutiliza, así que la tabla se muestra u oculta con cada cambio del modelo
+        self.modelo_recetas.rowsInserted.connect(self.actualizar_visibilidad_tabla)
+        self.modelo_recetas.rowsRemoved.connect(self.actualizar_visibilidad_tabla)
+        self.modelo_recetas.modelReset.connect(self.actualizar_visibilidad_tabla)
+
         #Hacemos la ventana visible
         self.show()
 
 
-    def mostrar_recetas(self, lista_recetas):
+    def recargar_recetas(self):
         """
-        Esta función puebla la tabla con las recetas
+        Esta función vuelve a cargar la tabla desde la primera página de recetas
         """
-        self.recetas = lista_recetas
-        numero_fila=0
-
-        self.distribuidor_tabla_recetas.setColumnStretch(0,1)
-        self.distribuidor_tabla_recetas.setColumnStretch(1,1)
-        self.distribuidor_tabla_recetas.setColumnStretch(2,0)
-        self.distribuidor_tabla_recetas.setColumnStretch(3,0)
-        self.distribuidor_tabla_recetas.setColumnStretch(4,0)
-        self.distribuidor_tabla_recetas.setColumnStretch(5,0)
-
-        #Ciclo para llenar la tabla
-        if (self.recetas!= None and len(self.recetas)>0) :
-            self.tabla_recetas.setVisible(True)
-
-            #Creación de las etiquetas
-            etiqueta_nombre=QLabel("Nombre")
-            etiqueta_nombre.setMinimumSize(QSize(0,0))
-            etiqueta_nombre.setMaximumSize(QSize(65525,65525))
-            etiqueta_nombre.setAlignment(Qt.AlignCenter)
-            etiqueta_nombre.setFont(QFont("Times",weight=QFont.Bold)) 
-            self.distribuidor_tabla_recetas.addWidget(etiqueta_nombre, 0,0, Qt.AlignLeft)
-
-            etiqueta_acciones=QLabel("Opciones")                      
-            etiqueta_acciones.setMinimumSize(QSize(0,0))
-            etiqueta_acciones.setMaximumSize(QSize(65525,65525))
-            etiqueta_acciones.setAlignment(Qt.AlignCenter)
-            etiqueta_acciones.setFont(QFont("Times",weight=QFont.Bold))               
-            self.distribuidor_tabla_recetas.addWidget(etiqueta_acciones, 0,2,1,3, Qt.AlignCenter)
-       
-            for dic_receta in self.recetas:
-                numero_fila=numero_fila+1
-
-                etiqueta_nombre=QLabel(dic_receta['nombre'] )
-                etiqueta_nombre.setWordWrap(True)
-                self.distribuidor_tabla_recetas.addWidget(etiqueta_nombre,numero_fila,0)
-
-                #Creación de los botones asociados a cada acción
-
-
-                btn_editar_receta=QPushButton("",self)
-                btn_editar_receta.setToolTip("Editar")
-                btn_editar_receta.setFixedSize(40,40)
-                btn_editar_receta.setIcon(QIcon("src/recursos/004-edit-button.png"))
-                btn_editar_receta.clicked.connect(partial(self.mostrar_receta,numero_fila-1) )
-                self.distribuidor_tabla_recetas.addWidget(btn_editar_receta,numero_fila,2,Qt.AlignCenter)
-
-                btn_eliminar=QPushButton("",self)
-                btn_eliminar.setToolTip("Borrar")
-                btn_eliminar.setFixedSize(40,40)
-                btn_eliminar.setIcon(QIcon("src/recursos/005-delete.png"))
-                btn_eliminar.clicked.connect(partial(self.eliminar_receta,numero_fila -1) )
-                self.distribuidor_tabla_recetas.addWidget(btn_eliminar,numero_fila,3,Qt.AlignCenter)
-
-                btn_preparar_receta = QPushButton("", self)
-                btn_preparar_receta.setToolTip("Preparar")
-                btn_preparar_receta.setFixedSize(40, 40)
-                btn_preparar_receta.setIcon(QIcon("src/recursos/002-preparar.png"))
-                btn_preparar_receta.clicked.connect(
-                    partial(self.mostrar_ventana_preparar, numero_fila - 1))
-                self.distribuidor_tabla_recetas.addWidget(btn_preparar_receta, numero_fila, 4,
-                                                           Qt.AlignCenter)
+        self.modelo_recetas.recargar()
 
-        else:
-                self.tabla_recetas.setVisible(False)
+    def actualizar_visibilidad_tabla(self, *argumentos):
+        """
+        Esta función oculta la tabla cuando no hay recetas
+        """
+        self.tabla_recetas.setVisible(self.modelo_recetas.rowCount() > 0)
 
-        #persona para ajustar la forma de la tabla (y evitar que queden muy espaciados)
-        self.distribuidor_tabla_recetas.layout().setRowStretch(numero_fila+2, 1)
+    def ejecutar_accion(self, accion, indice):
+        """
+        Esta función ejecuta la acción seleccionada en la fila de una receta
+        """
+        #La fila se traduce al id de la receta de inmediato: un orden o un cambio posterior mueve las filas
+        id_receta = self.modelo_recetas.dar_elemento(indice)['id']
+        if accion == 'editar':
+            self.mostrar_receta(id_receta)
+        elif accion == 'eliminar':
+            self.eliminar_receta(id_receta)
+        elif accion == 'preparar':
+            self.mostrar_ventana_preparar(id_receta)
 
     def crear_receta(self):
         """
@@ -167,7 +141,7 @@ class VistaListaRecetas(QWidget):
         self.hide()
         self.interfaz.mostrar_receta(id_receta)
 
-    def eliminar_receta(self, indice):
+    def eliminar_receta(self, id_receta):
         """
         Esta función elimina una receta tras solicitar una confirmación
         """
@@ -176,13 +150,12 @@ class VistaListaRecetas(QWidget):
         mensaje_confirmacion.setText(
             "¿Esta seguro de que desea borrar esta receta?\nRecuerde que esta acción es irreversible")
         mensaje_confirmacion.setWindowTitle("¿Desea borrar esta receta?")
-        mensaje_confirmacion.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        mensaje_confirmacion.setWindowIcon(dar_icono("RecetarioLogo.png"))
         mensaje_confirmacion.setStandardButtons(QMessageBox.Yes | QMessageBox.No)
         respuesta = mensaje_confirmacion.exec_()
         if respuesta == QMessageBox.Yes:
-            self.interfaz.eliminar_receta(indice)
-            self.hide()
-            self.interfaz.mostrar_vista_lista_recetas()
+            #La fila se quita cuando la lógica publica el cambio
+            self.interfaz.eliminar_receta(id_receta)
 
     def mostrar_ingredientes(self):
         """
@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
 from PyQt5.QtWidgets import QWidget
+from .CacheRecursos import dar_icono
 
 
 class VistaPreparacion(QWidget):
@@ -21,9 +22,6 @@ class VistaPreparacion(QWidget):
         self.height = 560
         self.interfaz = interfaz
     
-
-        self.setAttribute(Qt.WA_DeleteOnClose)
-
         self.inicializar_GUI()
         self.show()
 
@@ -32,7 +30,7 @@ class VistaPreparacion(QWidget):
         # inicializamos la ventana
         self.setWindowTitle(self.titulo)
         self.setFixedSize(self.width, self.height)
-        self.setWindowIcon(QIcon("src/recursos/RecetarioLogo.png"))
+        self.setWindowIcon(dar_icono("RecetarioLogo.png"))
 
         self.distribuidor_base = QVBoxLayout(self)
 
@@ -113,7 +111,7 @@ class VistaPreparacion(QWidget):
         self.btn_volver = QPushButton("Volver", self)
         self.btn_volver.setFixedSize(200, 40)
         self.btn_volver.setToolTip("Volver")
-        self.btn_volver.setIcon(QIcon("src/recursos/007-back-button.png"))
+        self.btn_volver.setIcon(dar_icono("007-back-button.png"))
         self.btn_volver.setIconSize(QSize(120, 120))
         self.btn_volver.clicked.connect(self.volver)
         self.distribuidor_base.addWidget(self.btn_volver)
@@ -123,7 +121,11 @@ class VistaPreparacion(QWidget):
         """
         Esta función pobla el reporte con la información
         """
-      
+        #La ventana se reutiliza entre recetas: se quitan los datos del reporte anterior
+        self.setWindowTitle("Recetario - Preparación receta  " + datos_preparacion['receta'])
+        self.limpiar_tabla(self.distribuidor_tabla_reporte, 0, 1)
+        self.limpiar_tabla(self.distribuidor_tabla, 1, 0)
+
         #Mostrar información básica
         etiqueta_detalle = QLabel(str(datos_preparacion['personas']))
         etiqueta_detalle.setWordWrap(True)
@@ -184,6 +186,19 @@ class VistaPreparacion(QWidget):
         # Elemento para ajustar la forma de la tabla (y evitar que queden muy espaciados)
         self.distribuidor_tabla.layout().setRowStretch(numero_fila + 1, 1)
         
+    def limpiar_tabla(self, distribuidor, fila_inicial, columna_inicial):
+        """
+        Esta función elimina las etiquetas de datos de una tabla, dejando los encabezados
+        """
+        for posicion in reversed(range(distribuidor.count())):
+            fila, columna, _, _ = distribuidor.getItemPosition(posicion)
+            if fila >= fila_inicial and columna >= columna_inicial:
+                elemento = distribuidor.takeAt(posicion)
+                if elemento.widget() is not None:
+                    elemento.widget().deleteLater()
+        for fila in range(distribuidor.rowCount()):
+            distribuidor.setRowStretch(fila, 0)
+
     def volver(self):
         """
         Esta función permite volver a la ventana de lista de recetas 
@@ -0,0 +1,33 @@
+from datetime import time
+
+from src.modelo.declarative_base import Session
+from src.modelo.receta import Receta
+from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
+
+
+class CatalogoPrueba:
+    #Catálogo pequeño y conocido que comparten las pruebas de la lógica, la consola y el servicio
+
+    def crear_catalogo(self):
+        '''Vacía las tablas y guarda los ingredientes Arroz y Pollo y la receta Arroz con pollo con ambos'''
+        self.session = Session()
+        self.session.query(RecetaIngrediente).delete()
+        self.session.query(Receta).delete()
+        self.session.query(Ingrediente).delete()
+
+        self.arroz = Ingrediente(nombre="Arroz", unidad="libra", valor=2000, sitioCompra="Plaza")
+        self.pollo = Ingrediente(nombre="Pollo", unidad="libra", valor=9000, sitioCompra="Plaza")
+        self.session.add_all([self.arroz, self.pollo])
+        self.session.flush()
+        self.arroz_con_pollo = self.agregar_receta("Arroz con pollo", time(1, 0, 0), 4, 500,
+                                                   "Cocinar el arroz con el pollo", [(self.arroz, 2), (self.pollo, 3)])
+
+    def agregar_receta(self, nombre, tiempo, personas, calorias, preparacion, ingredientes=()):
+        '''Guarda una receta con sus líneas de (ingrediente, cantidad) y la retorna'''
+        receta = Receta(nombre=nombre, tiempo=tiempo, personas=personas, calorias=calorias, preparacion=preparacion)
+        self.session.add(receta)
+        self.session.flush()
+        self.session.add_all([RecetaIngrediente(receta_id=receta.id, ingrediente_id=ingrediente.id, cantidad=cantidad)
+                              for ingrediente, cantidad in ingredientes])
+        self.session.commit()
+        return receta
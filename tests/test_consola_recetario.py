@@ -0,0 +1,198 @@
+import csv
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import time
+
+from src.consola.ConsolaRecetario import COMANDOS, crear_parser, es_comando_consola, main
+from src.logica.Recetario import Recetario
+from src.modelo.receta import Receta
+from src.modelo.ingrediente import RecetaIngrediente
+from tests.catalogo_prueba import CatalogoPrueba
+
+
+class ConsolaRecetarioTestCase(CatalogoPrueba, unittest.TestCase):
+
+    def setUp(self):
+        self.logica = Recetario()
+        self.crear_catalogo()
+        self.arroz_blanco = self.agregar_receta("Arroz blanco", time(0, 30, 0), 2, 200, "Cocinar el arroz")
+        self.logica.invalidar_recetas()
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        self.session.close()
+
+    def ejecutar(self, *argumentos, entrada=None):
+        salida = io.StringIO()
+        errores = io.StringIO()
+        if entrada is not None:
+            argumentos = argumentos + ('--archivo', entrada)
+        codigo = main(list(argumentos), self.logica, salida, errores)
+        return codigo, salida.getvalue(), errores.getvalue()
+
+    def test_listar_recetas(self):
+        '''Prueba que el listado recorre todas las páginas en orden de nombre'''
+        codigo, salida, _ = self.ejecutar('recetas', 'list', '--tamano-pagina', '1')
+        self.assertEqual(codigo, 0)
+        filas = [linea.split('\t') for linea in salida.splitlines()]
+        self.assertEqual([fila[1] for fila in filas], ["Arroz blanco", "Arroz con pollo"])
+        self.assertEqual(filas[0][0], str(self.arroz_blanco.id))
+
+        codigo, salida, _ = self.ejecutar('recetas', 'listar', '--formato', 'json')
+        self.assertEqual(json.loads(salida.splitlines()[1])['nombre'], "Arroz con pollo")
+        print("Prueba listar recetas por consola: OK")
+
+    def test_exportar_importar_recetas(self):
+        '''Prueba que las recetas exportadas se pueden volver a importar con sus ingredientes'''
+        codigo, exportadas, errores = self.ejecutar('recetas', 'export')
+        self.assertEqual(codigo, 0)
+        self.assertIn("2 recetas exportadas", errores)
+        lineas = [json.loads(linea) for linea in exportadas.splitlines()]
+        self.assertEqual(lineas[1]['preparacion'], "Cocinar el arroz con el pollo")
+        self.assertEqual([ingrediente['nombre'] for ingrediente in lineas[1]['ingredientes']], ["Arroz", "Pollo"])
+
+        self.session.query(RecetaIngrediente).delete()
+        self.session.query(Receta).delete()
+        self.session.commit()
+        self.logica.invalidar_recetas()
+
+        sys.stdin, anterior = io.StringIO(exportadas), sys.stdin
+        try:
+            codigo, _, errores = self.ejecutar('recetas', 'import')
+        finally:
+            sys.stdin = anterior
+        self.assertEqual(codigo, 0)
+        self.assertIn("2 recetas importadas, 0 errores", errores)
+        self.assertEqual(self.ejecutar('recetas', 'export')[1], exportadas)
+        print("Prueba exportar e importar recetas por consola: OK")
+
+    def test_importar_recetas_con_errores(self):
+        '''Prueba que las líneas inválidas se informan sin detener la importación'''
+        lineas = [
+            '{"nombre": "Arroz blanco", "tiempo": "00:30:00", "personas": 2, "calorias": 200, "preparacion": "x"}',
+            'no es json',
+            '{"nombre": "Sopa", "tiempo": "00:40:00", "personas": 2, "calorias": 90, "preparacion": "Hervir",'
+            ' "ingredientes": [{"nombre": "Sal", "unidad": "libra", "cantidad": 1}]}',
+        ]
+        sys.stdin, anterior = io.StringIO('\n'.join(lineas)), sys.stdin
+        try:
+            codigo, _, errores = self.ejecutar('recetas', 'importar')
+        finally:
+            sys.stdin = anterior
+        self.assertEqual(codigo, 1)
+        self.assertIn("Línea 1: Ya existe una receta con el nombre.", errores)
+        self.assertIn("Línea 2: formato inválido", errores)
+        self.assertIn("Línea 3: el ingrediente Sal (libra) no existe", errores)
+        #La receta con un ingrediente inválido no se importa
+        self.assertNotIn("Sopa", [receta['nombre'] for receta in self.logica.dar_recetas()])
+        self.assertIn("0 recetas importadas, 3 errores", errores)
+        print("Prueba importar recetas con errores por consola: OK")
+
+    def test_importar_ingredientes(self):
+        '''Prueba la importación de ingredientes en CSV y en JSON con el informe de errores al final'''
+        ruta = os.path.join(self.directorio.name, 'precios.csv')
+        with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+            archivo.write("nombre,unidad,valor,sitioCompra\n"
+                          "Sal,libra,1000,Tienda\n"
+                          "Arroz,libra,2100,Tienda\n"
+                          "Aceite,litro,,Tienda\n"
+                          "Azúcar,libra,2500,Tienda\n")
+        codigo, _, errores = self.ejecutar('ingredientes', 'importar', '--tamano-lote', '1', entrada=ruta)
+        self.assertEqual(codigo, 1)
+        self.assertEqual(errores.splitlines(), [
+            "Fila 2: Ya existe un ingrediente con el nombre y la unidad de medida.",
+            "Fila 3: Todos los campos son obligatorios. Por favor, complete todos los campos.",
+            "2 ingredientes importados, 2 errores"])
+        self.assertEqual(self.logica.buscar_ingrediente("Azúcar", "libra")['sitioCompra'], "Tienda")
+
+        sys.stdin, anterior = io.StringIO('[{"nombre": "Aceite", "unidad": "litro", "valor": 7000, '
+                                          '"sitioCompra": "Tienda"}]'), sys.stdin
+        try:
+            codigo, _, errores = self.ejecutar('ingredientes', 'import', '--formato', 'json')
+        finally:
+            sys.stdin = anterior
+        self.assertEqual((codigo, errores), (0, "1 ingredientes importados, 0 errores\n"))
+        print("Prueba importar ingredientes por consola: OK")
+
+    def test_exportar_catalogo(self):
+        '''Prueba la exportación del catálogo en CSV, JSON por línea y gzip'''
+        codigo, salida, errores = self.ejecutar('catalogo', 'export', 'ingredientes', '--formato', 'csv')
+        self.assertEqual(codigo, 0)
+        self.assertEqual(salida.splitlines(), [
+            "id,nombre,unidad,valor,sitioCompra",
+            "%d,Arroz,libra,2000,Plaza" % self.arroz.id,
+            "%d,Pollo,libra,9000,Plaza" % self.pollo.id])
+        self.assertEqual(errores, "2 filas exportadas\n")
+
+        ruta = os.path.join(self.directorio.name, 'lineas.jsonl.gz')
+        codigo, _, errores = self.ejecutar('catalogo', 'exportar', 'ingredientes_recetas', '--archivo', ruta)
+        self.assertEqual(codigo, 0)
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            lineas = [json.loads(linea) for linea in archivo]
+        self.assertEqual(sorted((linea['receta'], linea['ingrediente'], linea['cantidad']) for linea in lineas),
+                         [("Arroz con pollo", "Arroz", 2), ("Arroz con pollo", "Pollo", 3)])
+
+        codigo, salida, _ = self.ejecutar('catalogo', 'exportar', 'recetas', '--formato', 'csv')
+        recetas = list(csv.DictReader(io.StringIO(salida)))
+        self.assertEqual([receta['nombre'] for receta in recetas], ["Arroz blanco", "Arroz con pollo"])
+        self.assertEqual(recetas[1]['preparacion'], "Cocinar el arroz con el pollo")
+
+        codigo, _, errores = self.ejecutar('catalogo', 'exportar', 'recetas_completas', '--formato', 'csv')
+        self.assertEqual(codigo, 2)
+        print("Prueba exportar catálogo por consola: OK")
+
+    def test_exportar_importar_recetas_gzip(self):
+        '''Prueba que la exportación comprimida se puede volver a importar'''
+        ruta = os.path.join(self.directorio.name, 'recetas.jsonl.gz')
+        exportadas = self.ejecutar('recetas', 'exportar')[1]
+        self.assertEqual(self.ejecutar('recetas', 'exportar', '--archivo', ruta)[0], 0)
+
+        self.session.query(RecetaIngrediente).delete()
+        self.session.query(Receta).delete()
+        self.session.commit()
+        self.logica.invalidar_recetas()
+
+        codigo, _, errores = self.ejecutar('recetas', 'importar', entrada=ruta)
+        self.assertEqual((codigo, errores), (0, "2 recetas importadas, 0 errores\n"))
+        self.assertEqual(self.ejecutar('recetas', 'exportar')[1], exportadas)
+        print("Prueba exportar e importar recetas con gzip: OK")
+
+    def test_preparar_receta(self):
+        '''Prueba la preparación de una receta por su id'''
+        codigo, salida, _ = self.ejecutar('recetas', 'preparar', str(self.arroz_con_pollo.id), '--personas', '8')
+        self.assertEqual(codigo, 0)
+        preparacion = json.loads(salida)
+        self.assertEqual(preparacion, self.logica.dar_preparacion(1, 8))
+
+        codigo, _, errores = self.ejecutar('recetas', 'preparar', '0', '--personas', '8')
+        self.assertEqual(codigo, 1)
+        self.assertIn("no existe", errores)
+        print("Prueba preparar receta por consola: OK")
+
+    def test_no_importa_pyqt_ni_numpy(self):
+        '''Prueba que la consola no carga la interfaz gráfica ni NumPy'''
+        codigo = ("import sys, io\n"
+                  "from src.consola.ConsolaRecetario import main\n"
+                  "main(['recetas', 'list'], salida=io.StringIO())\n"
+                  "print(sorted(m for m in ('PyQt5', 'numpy') if m in sys.modules))\n")
+        resultado = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True)
+        self.assertEqual(resultado.stdout.strip(), "[]")
+        print("Prueba consola sin PyQt5 ni NumPy: OK")
+
+    def test_es_comando_consola(self):
+        '''Prueba que solo los comandos de la consola dejan de abrir la interfaz gráfica'''
+        self.assertTrue(es_comando_consola(['recetas', 'list']))
+        self.assertTrue(es_comando_consola(['catalogo', 'exportar', 'recetas']))
+        self.assertFalse(es_comando_consola([]))
+        self.assertFalse(es_comando_consola(['-style', 'fusion']))
+        self.assertFalse(es_comando_consola(['-platform', 'offscreen']))
+        entidades = [accion for accion in crear_parser()._subparsers._group_actions][0]
+        self.assertEqual(sorted(COMANDOS), sorted(entidades.choices))
+        print("Prueba es comando de consola: OK")
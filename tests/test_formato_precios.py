@@ -0,0 +1,44 @@
+import locale
+import unittest
+
+from src.logica.FormatoPrecios import FormatoPrecios, dar_formato_precios
+
+
+class FormatoPreciosTestCase(unittest.TestCase):
+
+    def test_separador_de_miles(self):
+        '''Prueba que los valores se agrupan de a tres cifras con el separador recibido'''
+        formato = FormatoPrecios('.', [3, 0])
+        self.assertEqual(formato.formatear(1234567), "$1.234.567")
+        self.assertEqual(formato.formatear(500), "$500")
+        self.assertEqual(formato.formatear(-12500), "$-12.500")
+
+    def test_agrupacion_sin_repeticion(self):
+        '''Prueba que la agrupación termina cuando la lista no acaba en 0'''
+        formato = FormatoPrecios(',', [3, 2, locale.CHAR_MAX])
+        self.assertEqual(formato.formatear(123456789), "$1234,56,789")
+
+    def test_equivalente_a_locale(self):
+        '''Prueba que el formato coincide con locale.format_string en la configuración regional'''
+        anterior = locale.setlocale(locale.LC_ALL)
+        formato = FormatoPrecios()
+        try:
+            locale.setlocale(locale.LC_ALL, '')
+            for valor in [0, 7, 999, 1000, 25000, 1234567, -4500]:
+                self.assertEqual(formato.formatear(valor), "$" + locale.format_string("%d", valor, grouping=True))
+        finally:
+            locale.setlocale(locale.LC_ALL, anterior)
+
+    def test_no_modifica_locale(self):
+        '''Prueba que crear el formateador no cambia la configuración regional del proceso'''
+        anterior = locale.setlocale(locale.LC_ALL)
+        FormatoPrecios()
+        self.assertEqual(locale.setlocale(locale.LC_ALL), anterior)
+
+    def test_valores_memorizados(self):
+        '''Prueba que un valor repetido se toma de la memoria del formateador'''
+        formato = FormatoPrecios('.', [3, 0])
+        formato.formatear(2000)
+        formato.formatear(2000)
+        self.assertEqual(formato.formatear.cache_info().hits, 1)
+        self.assertIs(dar_formato_precios(), dar_formato_precios())
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.consola.GeneradorDatos import Distribucion, GeneradorDatos, main
+
+
+class GeneradorDatosTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def dar_ruta(self, nombre):
+        return os.path.join(self.directorio.name, nombre)
+
+    def leer_tablas(self, ruta):
+        conexion = sqlite3.connect(ruta)
+        try:
+            return {tabla: conexion.execute("SELECT * FROM %s ORDER BY 1, 2" % tabla).fetchall()
+                    for tabla in ('ingrediente', 'receta', 'receta_ingrediente')}
+        finally:
+            conexion.close()
+
+    def test_generacion_determinista(self):
+        '''Prueba que la misma semilla produce el mismo catálogo sin importar el tamaño del lote'''
+        GeneradorDatos(semilla=7).generar(self.dar_ruta('a.sqlite'), 120, 40, tamano_lote=1000)
+        GeneradorDatos(semilla=7).generar(self.dar_ruta('b.sqlite'), 120, 40, tamano_lote=7)
+        GeneradorDatos(semilla=8).generar(self.dar_ruta('c.sqlite'), 120, 40)
+
+        tablas = self.leer_tablas(self.dar_ruta('a.sqlite'))
+        self.assertEqual(tablas, self.leer_tablas(self.dar_ruta('b.sqlite')))
+        self.assertNotEqual(tablas, self.leer_tablas(self.dar_ruta('c.sqlite')))
+        self.assertEqual((len(tablas['receta']), len(tablas['ingrediente'])), (120, 40))
+        self.assertEqual(len({(fila[1], fila[2]) for fila in tablas['ingrediente']}), 40)
+        print("Prueba generación determinista: OK")
+
+    def test_distribuciones(self):
+        '''Prueba que los valores generados respetan las distribuciones configuradas'''
+        ruta = self.dar_ruta('catalogo.sqlite')
+        generador = GeneradorDatos(semilla=1, ingredientes_por_receta=Distribucion(3, 4, None),
+                                   palabras_preparacion=Distribucion(5, 5, None), precios=Distribucion(100, 900, 200))
+        totales = generador.generar(ruta, 200, 30)
+
+        tablas = self.leer_tablas(ruta)
+        self.assertEqual(totales['lineas_ingredientes'], len(tablas['receta_ingrediente']))
+        lineas_por_receta = {}
+        for _, id_receta, _ in tablas['receta_ingrediente']:
+            lineas_por_receta[id_receta] = lineas_por_receta.get(id_receta, 0) + 1
+        self.assertEqual(set(lineas_por_receta.values()), {3, 4})
+        self.assertTrue(all(len(fila[5].split()) == 5 for fila in tablas['receta']))
+        self.assertTrue(all(100 <= fila[3] <= 900 for fila in tablas['ingrediente']))
+        print("Prueba distribuciones del generador: OK")
+
+    def test_destino_existente(self):
+        '''Prueba que el generador no sobrescribe un archivo sin --reemplazar'''
+        ruta = self.dar_ruta('existente.sqlite')
+        self.assertEqual(main([ruta, '--recetas', '5', '--ingredientes', '5']), 0)
+        self.assertEqual(main([ruta, '--recetas', '5', '--ingredientes', '5']), 1)
+        self.assertEqual(main([ruta, '--recetas', '8', '--ingredientes', '5', '--reemplazar']), 0)
+        self.assertEqual(len(self.leer_tablas(ruta)['receta']), 8)
+        with self.assertRaises(SystemExit):
+            main([ruta, '--precios', '10:5'])
+        print("Prueba destino existente del generador: OK")
@@ -0,0 +1,59 @@
+import unittest
+from datetime import time
+
+from src.logica.MotorCostos import MotorCostos
+from src.logica.PreparacionMasiva import PreparacionMasiva
+from src.logica.Recetario import Recetario
+from tests.catalogo_prueba import CatalogoPrueba
+
+
+class MotorCostosTestCase(CatalogoPrueba, unittest.TestCase):
+
+    def setUp(self):
+        Recetario()
+        self.motor_costos = MotorCostos()
+        self.crear_catalogo()
+        self.arroz_blanco = self.agregar_receta("Arroz blanco", time(0, 30, 0), 2, 200, "Cocinar", [(self.arroz, 1)])
+        self.receta_vacia = self.agregar_receta("Receta vacía", time(0, 10, 0), 1, 10, "Nada")
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_costos_recetas_personas_base(self):
+        '''Prueba el costo de todas las recetas para sus personas base'''
+        costos = self.motor_costos.dar_costos_recetas()
+
+        self.assertEqual(costos[self.arroz_con_pollo.id], 2 * 2000 + 3 * 9000)
+        self.assertEqual(costos[self.arroz_blanco.id], 2000)
+        self.assertEqual(costos[self.receta_vacia.id], 0)
+        print("Prueba costos de recetas para sus personas base: OK")
+
+    def test_costos_recetas_escalados_por_personas(self):
+        '''Prueba que el costo se escala por personas / personas base'''
+        costos = self.motor_costos.dar_costos_recetas([self.arroz_con_pollo.id, self.arroz_blanco.id], 8)
+
+        self.assertEqual(costos, {self.arroz_con_pollo.id: (2 * 2000 + 3 * 9000) * 8 / 4,
+                                  self.arroz_blanco.id: 2000 * 8 / 2})
+        print("Prueba costos de recetas escalados por personas: OK")
+
+    def test_costos_lineas(self):
+        '''Prueba el costo de cada línea de ingrediente de una receta'''
+        lineas = self.motor_costos.dar_costos_lineas([self.arroz_con_pollo.id], 2)
+
+        self.assertEqual([(linea['nombre'], linea['costo']) for linea in lineas],
+                         [("Arroz", 2 * 2000 * 2 / 4), ("Pollo", 3 * 9000 * 2 / 4)])
+        print("Prueba costos de las líneas de una receta: OK")
+
+    def test_preparaciones_masivas(self):
+        '''Prueba el cálculo vectorizado de tiempo y costo para varias recetas y personas'''
+        preparaciones = PreparacionMasiva(self.motor_costos).dar_preparaciones(
+            [self.arroz_blanco.id, self.arroz_con_pollo.id, -1], [2, 4, 8])
+
+        self.assertEqual(list(preparaciones['ids_recetas']), [self.arroz_blanco.id, self.arroz_con_pollo.id])
+        self.assertEqual(preparaciones['recetas'], ["Arroz blanco", "Arroz con pollo"])
+        self.assertEqual(preparaciones['tiempo_preparacion'].shape, (2, 3))
+        #Arroz con pollo: TR = 3600, PB = 4
+        self.assertEqual(list(preparaciones['tiempo_preparacion'][1]), [3600 - (2 / 8) * 3600, 3600, 2 * 3600 / 3])
+        self.assertEqual(list(preparaciones['costo'][0]), [2000, 4000, 8000])
+        self.assertEqual(list(preparaciones['costo'][1]), [15500, 31000, 62000])
+        print("Prueba preparaciones masivas: OK")
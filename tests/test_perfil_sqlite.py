@@ -0,0 +1,40 @@
+import os
+import unittest
+from unittest import mock
+
+from src.modelo.declarative_base import engine, dar_perfil_sqlite, perfil_sqlite, PERFILES_SQLITE
+
+
+class PerfilSqliteTestCase(unittest.TestCase):
+
+    def test_perfil_desde_variable_de_entorno(self):
+        '''Prueba que el perfil se selecciona con la variable de entorno'''
+        with mock.patch.dict(os.environ, {'RECETARIO_PERFIL_SQLITE': 'read-mostly'}):
+            perfil = dar_perfil_sqlite()
+        self.assertEqual(perfil, PERFILES_SQLITE['read-mostly'])
+
+    def test_perfil_desconocido(self):
+        '''Prueba que un perfil inexistente genera un error'''
+        with mock.patch.dict(os.environ, {'RECETARIO_PERFIL_SQLITE': 'inexistente'}):
+            self.assertRaises(ValueError, dar_perfil_sqlite)
+
+    def test_perfil_aplicado_a_la_conexion(self):
+        '''Prueba que las conexiones del engine usan el modo de journal del perfil'''
+        conexion = engine.raw_connection()
+        try:
+            modo = conexion.execute('PRAGMA journal_mode').fetchone()[0]
+        finally:
+            conexion.close()
+        self.assertEqual(modo, perfil_sqlite['journal_mode'].lower())
+
+    def test_perfil_por_defecto_sin_wal(self):
+        '''Prueba que el perfil por defecto no deja la base de datos en modo WAL'''
+        with mock.patch.dict(os.environ, {'RECETARIO_CONFIGURACION': 'inexistente.ini'}):
+            os.environ.pop('RECETARIO_PERFIL_SQLITE', None)
+            perfil = dar_perfil_sqlite()
+        self.assertEqual(perfil['journal_mode'], 'DELETE')
+        self.assertEqual(PERFILES_SQLITE['fast']['journal_mode'], 'WAL')
+
+    def test_espera_del_pool(self):
+        '''Prueba que la espera por una conexión del pool se toma de espera_pool y no de busy_timeout'''
+        self.assertEqual(engine.pool.timeout(), perfil_sqlite['espera_pool'])
@@ -1,12 +1,20 @@
 import unittest
+import json
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 from faker import Faker
 import locale
 from datetime import datetime
 from src.logica.Recetario import Recetario
+from src.logica.PublicadorCambios import EventoCambio, CREADO, ACTUALIZADO, ELIMINADO, RECETA, INGREDIENTE
 from src.modelo.receta import Receta
 from src.modelo.ingrediente import Ingrediente, RecetaIngrediente
-from src.modelo.declarative_base import Session, engine, Base
+from sqlalchemy import event, inspect
+from src.modelo.declarative_base import Session, engine, Base, sesion_transaccional, cerrar_sesion
+from src.modelo.declarative_base import politica_memoria, dar_objetos_en_sesion
+from src.modelo.texto_comprimido import TextoComprimido
 
 
 class RecetarioTestCase(unittest.TestCase):
@@ -215,7 +223,7 @@ class RecetarioTestCase(unittest.TestCase):
     def test_dar_mas_ingredientes(self):
         '''Prueba que el método dar_ingrediente devuelve una lista de 10 ingredientes cuando hay  10 ingredientes en la tabla'''
         # Obtener el listado de ingrediente
-        listado_ingredientes = Recetario.dar_ingredientes(self.session)
+        listado_ingredientes = self.Recetario.dar_ingredientes()
 
         # Obtener los ingredientes almacenados en la tabla
         ingredientes_tabla = self.session.query(Ingrediente).all()
@@ -228,7 +236,7 @@ class RecetarioTestCase(unittest.TestCase):
     def test_dar_ingredientes_ordenados_nombre(self):
         '''Prueba que el método dar_ingrediente devuelve una lista ordenada en orden alfabético'''
         # Obtener el listado de ingrediente
-        listado_ingredientes = Recetario.dar_ingredientes(self.session) 
+        listado_ingredientes = self.Recetario.dar_ingredientes() 
 
         # Extraer los nombres de los ingredientes
         nombres_ingredientes = [ingrediente['nombre'] for ingrediente in listado_ingredientes]
@@ -255,7 +263,7 @@ class RecetarioTestCase(unittest.TestCase):
         self.session.commit()
 
         # Obtener el listado de ingredientes
-        listado_ingredientes = Recetario.dar_ingredientes(self.session)
+        listado_ingredientes = self.Recetario.dar_ingredientes()
 
         # Verificar que los ingredientes estén ordenados alfabéticamente por nombre
         nombres_ordenados = [ingrediente['nombre'] for ingrediente in listado_ingredientes]
@@ -271,7 +279,7 @@ class RecetarioTestCase(unittest.TestCase):
     def test_formato_valor_ingredientes(self):
         '''Prueba que el metodo dar ingredientes entregue el formato del valor correctamente'''
         # Obtener el listado de ingredientes
-        lista_ingredientes = Recetario.dar_ingredientes(self.session)
+        lista_ingredientes = self.Recetario.dar_ingredientes()
         # Verificar que el formato del valor de cada ingrediente sea el correcto
         # Verificar el formato de los valores
          # Verificar el formato de los valores
@@ -286,7 +294,7 @@ class RecetarioTestCase(unittest.TestCase):
     def test_dar_recetas_ordenadas(self):
         '''Prueba dar recetas ordenadas alfabéticamente por nombre'''
         # Obtener el listado de recetas
-        listado_recetas = Recetario.dar_recetas(self.session)
+        listado_recetas = self.Recetario.dar_recetas()
 
         # Extraer los nombres de las recetas en el listado
         nombres_recetas = [receta['nombre'] for receta in listado_recetas]
@@ -397,7 +405,7 @@ class RecetarioTestCase(unittest.TestCase):
         valor="5000"
         sitioCompra="Proveedor X"
 
-        resultado = Recetario.crear_ingrediente(self, nombre, unidad, valor, sitioCompra)
+        resultado = self.Recetario.crear_ingrediente(nombre, unidad, valor, sitioCompra)
         self.assertEqual(resultado, "El ingrediente ha sido creado exitosamente.", "Error al crear el ingrediente")
         print("Prueba crear ingrediente: OK")
 
@@ -481,10 +489,10 @@ class RecetarioTestCase(unittest.TestCase):
     def test_validar_crear_ingReceta_campos_no_vacios(self):
         '''Prueba crear ingrediente en receta con campos vacios'''
         
-        listado_recetas = Recetario.dar_recetas(self.session)
+        listado_recetas = self.Recetario.dar_recetas()
         receta_aleatoria = random.choice(listado_recetas)
         
-        #listado_ingredientes = Recetario.dar_ingredientes(self.session)
+        #listado_ingredientes = self.Recetario.dar_ingredientes()
         #ingrediente_aleatorio = random.choice(listado_ingredientes)
 
         ingrediente_aleatorio = ""
@@ -497,10 +505,10 @@ class RecetarioTestCase(unittest.TestCase):
     def test_validar_crear_ingReceta_campo_cantidad_invalido(self):
         '''Prueba crear ingrediente en receta con campos cantidad invalido'''
         
-        listado_recetas = Recetario.dar_recetas(self.session)
+        listado_recetas = self.Recetario.dar_recetas()
         receta_aleatoria = random.choice(listado_recetas)
 
-        listado_ingredientes = Recetario.dar_ingredientes(self.session)
+        listado_ingredientes = self.Recetario.dar_ingredientes()
         ingrediente_aleatorio = random.choice(listado_ingredientes)
         
         cantidad = "-50"
@@ -700,7 +708,8 @@ class RecetarioTestCase(unittest.TestCase):
 
         indice = random.randint(0, rango)
         receta = recetas_ordenadas[indice]
-        id_receta = recetas_ordenadas[indice].id
+        #dar_preparacion recibe la posición de la receta en el listado
+        id_receta = indice
         personas_receta = receta.personas
 
         # Verificar si hay más de una persona en la receta antes de generar el número aleatorio
@@ -739,7 +748,8 @@ class RecetarioTestCase(unittest.TestCase):
             rango=0
 
         indice = random.randint(0, rango)
-        id_receta = recetas_ordenadas[indice].id
+        #dar_preparacion recibe la posición de la receta en el listado
+        id_receta = indice
         resultado=None
     
         try:
@@ -757,7 +767,8 @@ class RecetarioTestCase(unittest.TestCase):
 
         indice = random.randint(0, rango)
         receta = recetas_ordenadas[indice]
-        id_receta = recetas_ordenadas[indice].id
+        #dar_preparacion recibe la posición de la receta en el listado
+        id_receta = indice
         personas_receta = recetas_ordenadas[indice].personas
 
         # Verificar si hay más de una persona en la receta antes de generar el número aleatorio
@@ -837,15 +848,526 @@ class RecetarioTestCase(unittest.TestCase):
     #pruebas unitarias editar ingrediente
     def test_el_ingrediente_se_edita_muestra_mensaje_confirmadolo(self):
 
-        #se consultan los ingredientes
-        ingredientes = self.session.query(Ingrediente).all()
+        #se consultan los ingredientes en el orden en que los lista la interfaz
+        ingredientes = self.session.query(Ingrediente).order_by(Ingrediente.nombre, Ingrediente.unidad).all()
         
         ingrediente = ingredientes[0]
 
-        mensaje = self.Recetario.editar_ingrediente(ingrediente.id, ingrediente.nombre,
+        mensaje = self.Recetario.editar_ingrediente(0, ingrediente.nombre,
                                                ingrediente.unidad, str(ingrediente.valor),
                                                ingrediente.sitioCompra)
         self.assertEqual(mensaje, "El ingrediente ha sido actualizado exitósamente.")
         print("Prueba editar ingrediente: OK")    
 
         
+    #pruebas unitarias dar receta por id
+    def test_dar_receta_por_id(self):
+        '''Prueba que dar_receta_por_id devuelve la receta con la llave primaria solicitada'''
+        receta = self.recetas[0]
+
+        resultado = self.Recetario.dar_receta_por_id(receta.id)
+
+        self.assertEqual(resultado['id'], receta.id)
+        self.assertEqual(resultado['nombre'], receta.nombre)
+        self.assertIsNone(self.Recetario.dar_receta_por_id(-1))
+        print("Prueba dar receta por id: OK")
+
+    def test_dar_receta_posicion_coincide_con_id(self):
+        '''Prueba que la posición de dar_receta corresponde al id de la receta listada'''
+        listado_recetas = self.Recetario.dar_recetas()
+        posicion = random.randint(0, len(listado_recetas) - 1)
+
+        receta = self.Recetario.dar_receta(posicion)
+
+        self.assertEqual(receta['nombre'], listado_recetas[posicion]['nombre'])
+        self.assertEqual(receta['id'], self.Recetario.dar_id_receta(posicion))
+        print("Prueba dar receta por posición: OK")
+
+    def test_crear_receta_invalida_indice_recetas(self):
+        '''Prueba que crear una receta invalida el índice cacheado de posiciones'''
+        cantidad_recetas = len(self.Recetario.dar_ids_recetas())
+
+        self.Recetario.crear_receta("AAA receta nueva", "00:30:00", "2", "300", "Mezclar todo")
+
+        ids_recetas = self.Recetario.dar_ids_recetas()
+        self.assertEqual(len(ids_recetas), cantidad_recetas + 1)
+        self.assertEqual(self.Recetario.dar_receta(0)['nombre'], "AAA receta nueva")
+        print("Prueba invalidar índice de recetas: OK")
+
+    #pruebas unitarias índices del esquema
+    def test_indices_creados(self):
+        '''Prueba que la base de datos tiene los índices declarados en los modelos'''
+        inspector = inspect(engine)
+        indices_ingrediente = {indice['name']: indice for indice in inspector.get_indexes('ingrediente')}
+        indices_receta = {indice['name'] for indice in inspector.get_indexes('receta')}
+        indices_receta_ingrediente = {indice['name'] for indice in inspector.get_indexes('receta_ingrediente')}
+
+        self.assertTrue(indices_ingrediente['ix_ingrediente_nombre_unidad']['unique'])
+        self.assertIn('ix_receta_nombre', indices_receta)
+        self.assertIn('ix_receta_ingrediente_receta_id', indices_receta_ingrediente)
+        print("Prueba índices creados: OK")
+
+    def test_crear_ingrediente_duplicado(self):
+        '''Prueba que la restricción única de nombre y unidad impide ingredientes duplicados'''
+        nombre, unidad, valor, sitioCompra = self.data_ingredientes[0]
+
+        resultado = self.Recetario.crear_ingrediente(nombre, unidad, str(valor), sitioCompra)
+
+        self.assertTrue(resultado.startswith("Error al crear el ingrediente"))
+        print("Prueba crear ingrediente duplicado: OK")
+
+    #pruebas unitarias sesiones por hilo
+    def test_dar_recetas_desde_varios_hilos(self):
+        '''Prueba que la fachada se puede consultar desde hilos de trabajo con sesiones independientes'''
+        #Los cuatro hilos esperan juntos con su sesión abierta para que todas existan a la vez
+        barrera = threading.Barrier(4, timeout=10)
+
+        def consultar():
+            try:
+                with sesion_transaccional() as sesion:
+                    barrera.wait()
+                #Se retorna la sesión y no su id para que no se libere y su id no se reutilice
+                return sesion, self.Recetario.dar_recetas()
+            finally:
+                cerrar_sesion()
+
+        with ThreadPoolExecutor(max_workers=4) as ejecutor:
+            resultados = [ejecutor.submit(consultar) for _ in range(8)]
+            resultados = [futuro.result() for futuro in resultados]
+
+        with sesion_transaccional() as sesion_principal:
+            listado_recetas = self.Recetario.dar_recetas()
+        ids_sesiones = {id(sesion) for sesion, _ in resultados}
+        self.assertEqual(len(ids_sesiones), len(resultados))
+        self.assertNotIn(id(sesion_principal), ids_sesiones)
+        for _, recetas in resultados:
+            self.assertEqual(recetas, listado_recetas)
+        print("Prueba dar recetas desde varios hilos: OK")
+
+    def test_sesion_transaccional_revierte_con_error(self):
+        '''Prueba que una excepción dentro de la transacción revierte los cambios'''
+        cantidad_recetas = self.session.query(Receta).count()
+
+        with self.assertRaises(ValueError):
+            with sesion_transaccional() as sesion:
+                sesion.add(Receta(nombre="Receta revertida", personas=1, calorias=1, preparacion="Nada"))
+                sesion.flush()
+                raise ValueError("Error forzado")
+
+        self.assertEqual(self.session.query(Receta).count(), cantidad_recetas)
+        print("Prueba revertir sesión transaccional: OK")
+
+    #pruebas unitarias política de memoria de la sesión
+    def test_politica_memoria_limita_objetos(self):
+        '''Prueba que la sesión se vacía cuando supera el máximo de objetos'''
+        #La sesión del hilo puede conservar objetos de pruebas anteriores
+        cerrar_sesion()
+        with mock.patch.dict(politica_memoria, {'max_objetos': 1000, 'operaciones_entre_limpiezas': 1000}):
+            with sesion_transaccional() as sesion:
+                recetas = sesion.query(Receta).all()
+            self.assertEqual(dar_objetos_en_sesion(), len(recetas))
+
+        with mock.patch.dict(politica_memoria, {'max_objetos': 5}):
+            with sesion_transaccional() as sesion:
+                recetas = sesion.query(Receta).all()
+            self.assertEqual(dar_objetos_en_sesion(), 0)
+        print("Prueba política de memoria de la sesión: OK")
+
+    #pruebas unitarias preparación en una sola consulta
+    def test_preparar_receta_datos_ingredientes(self):
+        '''Prueba que la preparación trae los ingredientes ordenados y el costo según la cantidad de cada uno'''
+        recetas_ordenadas = self.session.query(Receta).order_by(Receta.nombre, Receta.id).all()
+        receta = recetas_ordenadas[0]
+        relaciones = self.session.query(RecetaIngrediente).filter_by(receta_id=receta.id).all()
+        ingredientes = {ingrediente.id: ingrediente for ingrediente in self.ingredientes}
+        esperados = sorted((ingredientes[relacion.ingrediente_id].nombre,
+                            ingredientes[relacion.ingrediente_id].unidad,
+                            str(relacion.cantidad),
+                            float(ingredientes[relacion.ingrediente_id].valor * relacion.cantidad)) for relacion in relaciones)
+
+        resultado = self.Recetario.dar_preparacion(0, receta.personas)
+
+        obtenidos = [(dato['nombre'], dato['unidad'], dato['cantidad'], dato['valor'])
+                     for dato in resultado['datos_ingredientes']]
+        self.assertEqual(resultado['receta'], receta.nombre)
+        self.assertEqual(obtenidos, esperados)
+        self.assertEqual(resultado['costo'], sum(esperado[3] for esperado in esperados))
+        print("Prueba preparar receta con ingredientes: OK")
+
+    def test_preparar_receta_sin_ingredientes(self):
+        '''Prueba que una receta sin ingredientes se prepara con costo cero'''
+        self.session.query(RecetaIngrediente).delete()
+        self.session.commit()
+
+        resultado = self.Recetario.dar_preparacion(0, 1)
+
+        self.assertEqual(resultado['datos_ingredientes'], [])
+        self.assertEqual(resultado['costo'], 0.0)
+        print("Prueba preparar receta sin ingredientes: OK")
+
+    #pruebas unitarias caché de listados
+    def test_cache_dar_recetas(self):
+        '''Prueba que el listado de recetas se sirve desde la caché hasta que una escritura lo invalida'''
+        listado_recetas = self.Recetario.dar_recetas()
+        self.assertEqual(self.Recetario.dar_recetas(), listado_recetas)
+        self.assertEqual(self.Recetario.dar_estadisticas_cache(), {'aciertos': 1, 'fallos': 1, 'invalidaciones': 0})
+
+        self.Recetario.crear_receta("Receta nueva", "00:30:00", "2", "300", "Mezclar todo")
+
+        self.assertEqual(len(self.Recetario.dar_recetas()), len(listado_recetas) + 1)
+        self.assertEqual(self.Recetario.dar_estadisticas_cache(), {'aciertos': 1, 'fallos': 2, 'invalidaciones': 1})
+        print("Prueba caché dar recetas: OK")
+
+    def test_cache_dar_ingredientes(self):
+        '''Prueba que crear un ingrediente invalida solo el listado de ingredientes'''
+        self.Recetario.dar_recetas()
+        cantidad_ingredientes = len(self.Recetario.dar_ingredientes())
+
+        self.Recetario.crear_ingrediente("Camarones", "Unidad", "5000", "Proveedor X")
+
+        self.assertEqual(len(self.Recetario.dar_ingredientes()), cantidad_ingredientes + 1)
+        self.Recetario.dar_recetas()
+        self.assertEqual(self.Recetario.dar_estadisticas_cache(), {'aciertos': 1, 'fallos': 3, 'invalidaciones': 1})
+        print("Prueba caché dar ingredientes: OK")
+
+    def test_cache_no_guarda_indice_de_antes_de_una_escritura(self):
+        '''Prueba que el índice de posiciones consultado durante una escritura no se guarda'''
+        self.Recetario.invalidar_recetas()
+        dar_version = self.Recetario.cache.dar_version
+        escrituras = []
+
+        def dar_version_con_escritura(nombre):
+            #Simula otro hilo que crea una receta mientras se consulta el listado
+            version = dar_version(nombre)
+            if not escrituras:
+                escrituras.append(nombre)
+                self.Recetario.crear_receta("Receta concurrente", "00:30:00", "2", "300", "Mezclar todo")
+            return version
+
+        with mock.patch.object(self.Recetario.cache, 'dar_version', side_effect=dar_version_con_escritura):
+            self.Recetario.dar_recetas()
+        self.assertIsNone(self.Recetario.ids_recetas)
+        self.assertEqual(len(self.Recetario.dar_ids_recetas()), len(self.Recetario.dar_recetas()))
+        self.assertIsNotNone(self.Recetario.ids_recetas)
+        print("Prueba caché no guarda índice de antes de una escritura: OK")
+
+    def test_cache_entrega_copias(self):
+        '''Prueba que modificar un listado entregado no cambia el listado guardado en la caché'''
+        recetas = self.Recetario.dar_recetas()
+        nombre = recetas[0]['nombre']
+        recetas[0]['nombre'] = 'Modificada'
+        self.assertEqual(self.Recetario.dar_recetas()[0]['nombre'], nombre)
+        print("Prueba caché entrega copias: OK")
+
+    #pruebas unitarias paginación de listados
+    def test_paginar_recetas(self):
+        '''Prueba que recorrer todas las páginas de recetas da el mismo listado que dar_recetas'''
+        recetas = []
+        pagina = self.Recetario.dar_pagina_recetas(tamano_pagina=3)
+        recetas.extend(pagina['elementos'])
+        while pagina['siguiente'] is not None:
+            self.assertEqual(len(pagina['elementos']), 3)
+            pagina = self.Recetario.dar_pagina_recetas(pagina['siguiente'], tamano_pagina=3)
+            recetas.extend(pagina['elementos'])
+
+        self.assertEqual([receta['nombre'] for receta in recetas], [receta['nombre'] for receta in self.Recetario.dar_recetas()])
+        self.assertEqual([receta['id'] for receta in recetas], self.Recetario.dar_ids_recetas())
+        print("Prueba paginar recetas: OK")
+
+    def test_paginar_recetas_mismo_nombre(self):
+        '''Prueba que la llave de paginación desempata por id las recetas con el mismo nombre'''
+        for _ in range(3):
+            with sesion_transaccional() as session:
+                session.add(Receta(nombre="Aaa", tiempo=datetime.strptime("00:10:00", '%H:%M:%S').time(),
+                                   personas=1, calorias=100, preparacion="Mezclar"))
+
+        primera = self.Recetario.dar_pagina_recetas(tamano_pagina=2)
+        segunda = self.Recetario.dar_pagina_recetas(primera['siguiente'], tamano_pagina=2)
+
+        ids = [receta['id'] for receta in primera['elementos'] + segunda['elementos']]
+        self.assertEqual(len(set(ids)), 4)
+        self.assertEqual(primera['siguiente'], ('Aaa', primera['elementos'][-1]['id']))
+        self.assertEqual(segunda['elementos'][0]['nombre'], "Aaa")
+        print("Prueba paginar recetas mismo nombre: OK")
+
+    def test_paginar_ingredientes(self):
+        '''Prueba que recorrer todas las páginas de ingredientes da el mismo listado que dar_ingredientes'''
+        ingredientes = []
+        siguiente = None
+        while True:
+            pagina = self.Recetario.dar_pagina_ingredientes(siguiente, tamano_pagina=4)
+            ingredientes.extend(pagina['elementos'])
+            siguiente = pagina['siguiente']
+            if siguiente is None:
+                break
+
+        self.assertEqual(ingredientes, self.Recetario.dar_ingredientes())
+        self.assertRaises(ValueError, self.Recetario.dar_pagina_ingredientes, None, 0)
+        print("Prueba paginar ingredientes: OK")
+
+    #pruebas unitarias carga diferida y compresión de la preparación
+    def test_listado_no_carga_preparacion(self):
+        '''Prueba que los listados de recetas no traen la preparación y dar_receta sí la trae'''
+        recetas = self.Recetario.dar_recetas()
+        self.assertNotIn('preparacion', recetas[0])
+        self.assertNotIn('preparacion', self.Recetario.dar_pagina_recetas()['elementos'][0])
+
+        with sesion_transaccional() as session:
+            receta = session.query(Receta).first()
+            self.assertNotIn('preparacion', receta.__dict__)
+
+        receta = self.Recetario.dar_receta(0)
+        with sesion_transaccional() as session:
+            preparacion = session.query(Receta.preparacion).filter_by(id=receta['id']).scalar()
+        self.assertEqual(receta['preparacion'], preparacion)
+        print("Prueba listado sin preparación: OK")
+
+    def test_preparacion_comprimida(self):
+        '''Prueba que una preparación guardada comprimida se lee de forma transparente'''
+        texto = "Picar la cebolla y sofreír a fuego lento. " * 50
+        tipo = TextoComprimido(comprimir=True, umbral=256)
+        comprimido = tipo.process_bind_param(texto, engine.dialect)
+        self.assertIsInstance(comprimido, bytes)
+        self.assertLess(len(comprimido), len(texto.encode('utf-8')))
+        self.assertEqual(tipo.process_bind_param("Mezclar", engine.dialect), "Mezclar")
+
+        id_receta = self.Recetario.dar_id_receta(0)
+        with engine.begin() as conexion:
+            conexion.execute("UPDATE receta SET preparacion = ? WHERE id = ?", comprimido, id_receta)
+
+        self.assertEqual(self.Recetario.dar_receta(0)['preparacion'], texto)
+        print("Prueba preparación comprimida: OK")
+
+    def test_agregar_ingrediente_con_compresion_activada(self):
+        '''Prueba que al activar la compresión se pueden agregar ingredientes a recetas guardadas en claro'''
+        texto = "Picar la cebolla y sofreír a fuego lento. " * 50
+        receta = Receta(nombre="Sofrito", tiempo=datetime.strptime("00:20:00", '%H:%M:%S').time(),
+                        personas=2, calorias=150, preparacion=texto)
+        self.session.add(receta)
+        self.session.commit()
+        self.Recetario.invalidar_recetas()
+        posicion = [item['nombre'] for item in self.Recetario.dar_recetas()].index("Sofrito")
+        ingredientes = self.Recetario.dar_ingredientes()
+
+        #SQLAlchemy usa una copia del tipo por dialecto; se activa la compresión en ambos
+        tipos = [Receta.__table__.c.preparacion.type, Receta.__table__.c.preparacion.type.dialect_impl(engine.dialect)]
+        comprimir = tipos[0].comprimir
+        for tipo in tipos:
+            tipo.comprimir = True
+        try:
+            receta_con_id = self.Recetario.dar_receta(posicion)
+            self.assertEqual(receta_con_id['preparacion'], texto)
+            self.assertEqual(self.Recetario.validar_crear_editar_ingReceta(receta_con_id, ingredientes[0], "2"), "")
+            self.assertEqual(self.Recetario.agregar_ingrediente_receta(receta_con_id, ingredientes[0], 2),
+                             "El ingrediente ha sido creado exitosamente.")
+
+            #Sin el id la receta se busca por sus demás campos
+            receta_sin_id = {llave: valor for llave, valor in receta_con_id.items() if llave != 'id'}
+            self.assertEqual(self.Recetario.validar_crear_editar_ingReceta(receta_sin_id, ingredientes[0], "2"),
+                             "El ingrediente ya se encuentra almacenado.")
+            self.assertEqual(self.Recetario.agregar_ingrediente_receta(receta_sin_id, ingredientes[1], 3),
+                             "El ingrediente ha sido creado exitosamente.")
+        finally:
+            for tipo in tipos:
+                tipo.comprimir = comprimir
+
+        self.assertEqual(len(self.Recetario.dar_ingredientes_receta(posicion)), 2)
+        print("Prueba agregar ingrediente con compresión activada: OK")
+
+    #pruebas unitarias catálogo de ingredientes ordenado y operaciones por id
+    def test_paginar_ingredientes_por_unidad(self):
+        '''Prueba que las páginas de ingredientes se pueden pedir ordenadas por unidad y en orden descendente'''
+        for orden, llave in [('unidad', lambda ing: (ing['unidad'], ing['nombre'], ing['id'])),
+                             ('nombre', lambda ing: (ing['nombre'], ing['unidad'], ing['id']))]:
+            for descendente in (False, True):
+                ingredientes = []
+                siguiente = None
+                while True:
+                    pagina = self.Recetario.dar_pagina_ingredientes(siguiente, 3, orden, descendente)
+                    ingredientes.extend(pagina['elementos'])
+                    siguiente = pagina['siguiente']
+                    if siguiente is None:
+                        break
+                esperado = sorted(self.Recetario.dar_ingredientes(), key=llave, reverse=descendente)
+                self.assertEqual(ingredientes, esperado)
+
+        self.assertRaises(ValueError, self.Recetario.dar_pagina_ingredientes, None, 3, 'valor')
+        print("Prueba paginar ingredientes por unidad: OK")
+
+    def test_editar_eliminar_ingrediente_por_id(self):
+        '''Prueba editar, buscar y eliminar un ingrediente a partir de su id'''
+        self.Recetario.crear_ingrediente("Azafrán", "Gramo", "12000", "Plaza")
+        ingrediente = self.Recetario.buscar_ingrediente("Azafrán", "Gramo")
+        self.assertEqual(self.Recetario.dar_ingrediente_por_id(ingrediente['id']), ingrediente)
+
+        self.assertEqual(self.Recetario.validar_crear_editar_ingrediente_por_id(
+            ingrediente['id'], "Azafrán", "Gramo", "15000", "Plaza"), "")
+        self.Recetario.editar_ingrediente_por_id(ingrediente['id'], "Azafrán", "Gramo", "15000", "Plaza")
+        self.assertEqual(self.Recetario.dar_ingrediente_por_id(ingrediente['id'])['valor'],
+                         self.Recetario.formato_precios.formatear(15000))
+
+        self.assertEqual(self.Recetario.eliminar_ingrediente_por_id(ingrediente['id']), "El ingrediente ha sido eliminado.")
+        self.assertIsNone(self.Recetario.dar_ingrediente_por_id(ingrediente['id']))
+        self.assertIsNone(self.Recetario.eliminar_ingrediente_por_id(ingrediente['id']))
+        print("Prueba editar y eliminar ingrediente por id: OK")
+
+    def test_eliminar_ingrediente_en_receta(self):
+        '''Prueba que no se elimina un ingrediente que usa alguna receta'''
+        relacion = self.session.query(RecetaIngrediente).first()
+
+        resultado = self.Recetario.eliminar_ingrediente_por_id(relacion.ingrediente_id)
+
+        self.assertEqual(resultado, "Este ingrediente ya existe en una receta.")
+        self.assertIsNotNone(self.Recetario.dar_ingrediente_por_id(relacion.ingrediente_id))
+        print("Prueba eliminar ingrediente en receta: OK")
+
+    #pruebas unitarias eventos de cambio
+    def test_eventos_cambio_recetas(self):
+        '''Prueba que crear, editar y eliminar una receta publica un evento con su id'''
+        eventos = []
+        self.Recetario.suscribir_cambios(eventos.append, RECETA)
+
+        self.Recetario.crear_receta("Arepa", "00:20:00", "2", "250", "Amasar y asar")
+        posicion = [receta['nombre'] for receta in self.Recetario.dar_recetas()].index("Arepa")
+        id_receta = self.Recetario.dar_id_receta(posicion)
+        self.Recetario.editar_receta(posicion, "Arepa", "00:25:00", "2", "250", "Amasar y asar")
+        self.Recetario.eliminar_receta(posicion)
+        self.Recetario.crear_ingrediente("Maíz", "Libra", "3000", "Plaza")
+
+        self.assertEqual(eventos, [EventoCambio(CREADO, RECETA, id_receta),
+                                   EventoCambio(ACTUALIZADO, RECETA, id_receta),
+                                   EventoCambio(ELIMINADO, RECETA, id_receta)])
+        print("Prueba eventos de cambio de recetas: OK")
+
+    def test_eventos_cambio_ingredientes(self):
+        '''Prueba que los cambios de ingredientes se publican y que se puede cancelar la suscripción'''
+        eventos = []
+        self.Recetario.suscribir_cambios(eventos.append)
+
+        self.Recetario.crear_ingrediente("Maíz", "Libra", "3000", "Plaza")
+        id_ingrediente = self.Recetario.buscar_ingrediente("Maíz", "Libra")['id']
+        self.Recetario.editar_ingrediente_por_id(id_ingrediente, "Maíz", "Libra", "3500", "Plaza")
+        self.Recetario.cancelar_suscripcion_cambios(eventos.append)
+        self.Recetario.eliminar_ingrediente_por_id(id_ingrediente)
+
+        self.assertEqual(eventos, [EventoCambio(CREADO, INGREDIENTE, id_ingrediente),
+                                   EventoCambio(ACTUALIZADO, INGREDIENTE, id_ingrediente)])
+        print("Prueba eventos de cambio de ingredientes: OK")
+
+    def test_eventos_cambio_observador_eliminado(self):
+        '''Prueba que un método suscrito no mantiene vivo a su objeto'''
+        class Observador:
+            def __init__(self):
+                self.eventos = []
+
+            def recibir(self, evento):
+                self.eventos.append(evento)
+
+        observador = Observador()
+        self.Recetario.suscribir_cambios(observador.recibir)
+        self.Recetario.crear_ingrediente("Maíz", "Libra", "3000", "Plaza")
+        self.assertEqual(len(observador.eventos), 1)
+
+        del observador
+        self.Recetario.crear_ingrediente("Maíz", "Kilo", "6000", "Plaza")
+        self.assertEqual(self.Recetario.publicador.suscripciones, [])
+        print("Prueba observador eliminado: OK")
+
+    def test_importar_ingredientes(self):
+        '''Prueba la importación masiva con duplicados y filas inválidas'''
+        existente = self.ingredientes[0]
+        eventos = []
+        self.Recetario.suscribir_cambios(eventos.append)
+        filas = [
+            {"nombre": "Maíz", "unidad": "Libra", "valor": 3000, "sitioCompra": "Plaza"},
+            {"nombre": existente.nombre, "unidad": existente.unidad, "valor": "100", "sitioCompra": "Plaza"},
+            {"nombre": "Maíz ", "unidad": "Libra", "valor": "3100", "sitioCompra": "Tienda"},
+            {"nombre": "Frijol", "unidad": "Libra", "valor": "cinco", "sitioCompra": "Plaza"},
+            {"nombre": "Frijol", "unidad": "Libra"},
+            "Frijol",
+            {"nombre": "Frijol", "unidad": "Kilo", "valor": "$8000", "sitioCompra": "Plaza"},
+            {"nombre": "Lenteja", "unidad": "Libra", "valor": "4000", "sitioCompra": "Plaza"},
+        ]
+        cantidad_inicial = self.session.query(Ingrediente).count()
+
+        resultado = self.Recetario.importar_ingredientes(iter(filas), tamano_lote=2)
+
+        self.assertEqual(resultado['importados'], 3)
+        self.assertEqual([numero_fila for numero_fila, _ in resultado['errores']], [2, 3, 4, 5, 6])
+        self.assertEqual(resultado['errores'][0][1], "Ya existe un ingrediente con el nombre y la unidad de medida.")
+        self.assertEqual(resultado['errores'][2][1], "El valor del ingrediente debe ser un número entero")
+        self.assertEqual(self.session.query(Ingrediente).count(), cantidad_inicial + 3)
+        self.assertEqual(self.Recetario.buscar_ingrediente("Frijol", "Kilo")['sitioCompra'], "Plaza")
+        self.assertIn("Lenteja", [ingrediente['nombre'] for ingrediente in self.Recetario.dar_ingredientes()])
+        self.assertEqual(eventos, [EventoCambio(CREADO, INGREDIENTE, None)])
+        print("Prueba importar ingredientes: OK")
+
+    def test_importar_recetas(self):
+        '''Prueba la importación por lotes de recetas con sus ingredientes desde líneas JSON'''
+        primero, segundo = self.ingredientes[0], self.ingredientes[1]
+        receta_existente = self.recetas[0]
+        lineas = [
+            json.dumps({"nombre": "Sopa", "tiempo": "00:40:00", "personas": 2, "calorias": 90, "preparacion": "Hervir",
+                        "ingredientes": [{"nombre": primero.nombre, "unidad": primero.unidad, "cantidad": 2},
+                                         {"nombre": "Sal", "unidad": "libra", "cantidad": 1},
+                                         {"nombre": segundo.nombre, "unidad": segundo.unidad, "cantidad": 3},
+                                         {"nombre": primero.nombre, "unidad": primero.unidad, "cantidad": 5}]}),
+            "",
+            "no es json",
+            json.dumps({"nombre": receta_existente.nombre, "tiempo": "00:10:00", "personas": 1, "calorias": 10,
+                        "preparacion": "Mezclar"}),
+            json.dumps({"nombre": "Sopa", "tiempo": "00:20:00", "personas": 1, "calorias": 10, "preparacion": "x"}),
+            json.dumps({"nombre": "Ensalada", "tiempo": "0:15", "personas": 1, "calorias": 10, "preparacion": "x"}),
+            json.dumps({"nombre": "Ensalada", "tiempo": "00:15:00", "personas": 1, "calorias": 10,
+                        "preparacion": "Picar"}),
+            json.dumps({"nombre": "Crema", "tiempo": "00:30:00", "personas": 2, "calorias": 120, "preparacion": "Licuar",
+                        "ingredientes": [{"nombre": primero.nombre, "unidad": primero.unidad, "cantidad": 2},
+                                         {"nombre": segundo.nombre, "unidad": segundo.unidad, "cantidad": 3}]}),
+        ]
+        eventos = []
+        self.Recetario.suscribir_cambios(eventos.append)
+
+        resultado = self.Recetario.importar_recetas(iter(lineas), tamano_lote=2)
+
+        self.assertEqual((resultado['importadas'], resultado['lineas_ingredientes']), (3, 2))
+        self.assertEqual([numero_linea for numero_linea, _ in resultado['errores']], [1, 1, 3, 4, 6])
+        self.assertIn((1, "el ingrediente Sal (libra) no existe"), resultado['errores'])
+        self.assertIn((4, "Ya existe una receta con el nombre."), resultado['errores'])
+        #La primera Sopa se rechaza completa por sus ingredientes inválidos; se importa la de la línea 5
+        sopa = self.session.query(Receta).filter(Receta.nombre == "Sopa").one()
+        self.assertEqual(self.Recetario.dar_receta_por_id(sopa.id)['preparacion'], "x")
+        self.assertEqual(self.Recetario.dar_ingredientes_receta_por_id(sopa.id), [])
+        crema = self.session.query(Receta).filter(Receta.nombre == "Crema").one()
+        self.assertEqual({(ingrediente['ingrediente'], ingrediente['cantidad'])
+                          for ingrediente in self.Recetario.dar_ingredientes_receta_por_id(crema.id)},
+                         {(primero.nombre, 2), (segundo.nombre, 3)})
+        self.assertIn("Ensalada", [receta['nombre'] for receta in self.Recetario.dar_recetas()])
+        self.assertEqual(eventos, [EventoCambio(CREADO, RECETA, None)])
+        print("Prueba importar recetas: OK")
+
+    def test_importar_recetas_con_nombre_repetido_por_otro_escritor(self):
+        '''Prueba que los ingredientes importados quedan en la receta importada aunque otra con el mismo nombre aparezca durante el lote'''
+        primero = self.ingredientes[0]
+        linea = json.dumps({"nombre": "Sopa", "tiempo": "00:40:00", "personas": 2, "calorias": 90, "preparacion": "Hervir",
+                            "ingredientes": [{"nombre": primero.nombre, "unidad": primero.unidad, "cantidad": 2}]})
+        intrusas = []
+
+        def insertar_intrusa(conexion, sentencia, *argumentos):
+            #Simula otro escritor que guarda una receta con el mismo nombre justo después de la importada
+            if not intrusas and getattr(sentencia, 'table', None) is Receta.__table__:
+                intrusas.append(None)
+                intrusas[0] = conexion.execute(Receta.__table__.insert(), {
+                    'nombre': "Sopa", 'tiempo': datetime.strptime("00:05:00", '%H:%M:%S').time(),
+                    'personas': 1, 'calorias': 1, 'preparacion': "Otra"}).inserted_primary_key[0]
+
+        event.listen(engine, 'after_execute', insertar_intrusa)
+        try:
+            resultado = self.Recetario.importar_recetas([linea])
+        finally:
+            event.remove(engine, 'after_execute', insertar_intrusa)
+
+        self.assertEqual((resultado['importadas'], resultado['lineas_ingredientes']), (1, 1))
+        sopa = self.session.query(Receta).filter(Receta.nombre == "Sopa", Receta.id != intrusas[0]).one()
+        self.assertEqual(len(self.Recetario.dar_ingredientes_receta_por_id(sopa.id)), 1)
+        self.assertEqual(self.Recetario.dar_ingredientes_receta_por_id(intrusas[0]), [])
+        print("Prueba importar recetas con nombre repetido por otro escritor: OK")
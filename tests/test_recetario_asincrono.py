@@ -0,0 +1,214 @@
+import asyncio
+import inspect
+import io
+import threading
+import time
+import unittest
+
+from src.logica.LogicaMock import LogicaMock
+from src.logica.Recetario import Recetario
+from src.logica.RecetarioAsincrono import RecetarioAsincrono
+from tests.catalogo_prueba import CatalogoPrueba
+
+
+class LogicaLenta(LogicaMock):
+    #Mock que tarda en responder y cuenta las consultas que llegan a la lógica
+
+    def __init__(self, demora=0.05):
+        super().__init__()
+        self.demora = demora
+        self.candado = threading.Lock()
+        self.consultas = 0
+        self.activas = 0
+        self.max_activas = 0
+
+    def consultar(self, resultado):
+        with self.candado:
+            self.consultas += 1
+            self.activas += 1
+            self.max_activas = max(self.max_activas, self.activas)
+        time.sleep(self.demora)
+        with self.candado:
+            self.activas -= 1
+        return resultado
+
+    def dar_ingredientes(self):
+        return self.consultar(super().dar_ingredientes())
+
+    def dar_ingrediente(self, id_ingrediente):
+        return self.consultar(super().dar_ingrediente(id_ingrediente))
+
+
+class RecetarioAsincronoTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.logica = LogicaLenta()
+
+    def test_consultas_identicas_comparten_llamada(self):
+        '''Prueba que las consultas idénticas en curso hacen una sola llamada a la lógica'''
+        async def consultar():
+            async with RecetarioAsincrono(self.logica) as fachada:
+                resultados = await asyncio.gather(*[fachada.dar_ingredientes() for _ in range(10)])
+                return fachada, resultados
+
+        fachada, resultados = asyncio.run(consultar())
+        self.assertEqual(self.logica.consultas, 1)
+        self.assertEqual(fachada.consultas_compartidas, 9)
+        self.assertTrue(all(resultado == resultados[0] for resultado in resultados))
+        #Cada llamador recibe su propia copia del resultado
+        resultados[0][0]['nombre'] = 'Modificado'
+        self.assertEqual(resultados[1][0]['nombre'], 'Tomate chonto')
+        print("Prueba consultas idénticas comparten llamada: OK")
+
+    def test_escritura_no_comparte_consulta_anterior(self):
+        '''Prueba que una consulta posterior a una escritura no reutiliza la consulta iniciada antes'''
+        async def consultar():
+            async with RecetarioAsincrono(self.logica) as fachada:
+                antes = asyncio.ensure_future(fachada.dar_ingredientes())
+                await asyncio.sleep(0)
+                await fachada.crear_ingrediente('Sal', 'libra', 1000, 'Tienda')
+                despues = await fachada.dar_ingredientes()
+                return await antes, despues
+
+        antes, despues = asyncio.run(consultar())
+        self.assertEqual(self.logica.consultas, 2)
+        self.assertEqual(len(despues), len(antes) + 1)
+        print("Prueba escritura no comparte consulta anterior: OK")
+
+    def test_limite_concurrencia(self):
+        '''Prueba que no se ejecutan más llamadas a la vez que el límite indicado'''
+        async def consultar():
+            async with RecetarioAsincrono(self.logica, max_hilos=4, max_concurrentes=2) as fachada:
+                #Consultas con argumentos distintos para que no se compartan
+                await asyncio.gather(*[fachada.dar_ingrediente(posicion) for posicion in range(6)])
+
+        asyncio.run(consultar())
+        self.assertEqual(self.logica.consultas, 6)
+        self.assertEqual(self.logica.max_activas, 2)
+        print("Prueba límite de concurrencia: OK")
+
+    def test_tiempo_limite(self):
+        '''Prueba que una llamada que supera el tiempo límite lanza TimeoutError sin afectar a las demás'''
+        self.logica.demora = 0.3
+
+        async def consultar():
+            async with RecetarioAsincrono(self.logica) as fachada:
+                apurada = fachada.llamar('dar_ingredientes', tiempo_limite=0.01)
+                paciente = fachada.dar_ingredientes()
+                return await asyncio.gather(apurada, paciente, return_exceptions=True)
+
+        apurada, paciente = asyncio.run(consultar())
+        self.assertIsInstance(apurada, asyncio.TimeoutError)
+        self.assertEqual(len(paciente), 6)
+        self.assertEqual(self.logica.consultas, 1)
+        print("Prueba tiempo límite: OK")
+
+    def test_errores_de_la_logica(self):
+        '''Prueba que las excepciones de la lógica llegan al llamador'''
+        async def consultar():
+            async with RecetarioAsincrono(self.logica) as fachada:
+                return await fachada.dar_ingrediente(100)
+
+        with self.assertRaises(IndexError):
+            asyncio.run(consultar())
+        print("Prueba errores de la lógica: OK")
+
+
+    def test_cerrar_no_bloquea_el_ciclo(self):
+        '''Prueba que al salir del contexto la espera del pool no bloquea el ciclo de eventos'''
+        self.logica.demora = 0.2
+        latidos = []
+
+        async def latir():
+            while True:
+                latidos.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def consultar():
+            latido = asyncio.ensure_future(latir())
+            async with RecetarioAsincrono(self.logica) as fachada:
+                #La consulta sigue en el pool cuando termina el bloque
+                asyncio.ensure_future(fachada.dar_ingredientes())
+                await asyncio.sleep(0.02)
+            await asyncio.sleep(0.05)
+            latido.cancel()
+
+        asyncio.run(consultar())
+        self.assertEqual(self.logica.consultas, 1)
+        pausas = [despues - antes for antes, despues in zip(latidos, latidos[1:])]
+        self.assertLess(max(pausas), 0.1)
+        print("Prueba cerrar no bloquea el ciclo: OK")
+
+
+class RecetarioAsincronoRecetarioTestCase(CatalogoPrueba, unittest.TestCase):
+    #Ejecuta cada método de la fachada asíncrona contra un Recetario real para detectar
+    #diferencias entre los argumentos que pasa cada método y los que recibe la lógica
+
+    def setUp(self):
+        self.logica = Recetario()
+        self.crear_catalogo()
+        self.logica.invalidar_recetas()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_metodos_con_los_argumentos_de_la_logica(self):
+        '''Prueba que cada método asíncrono recibe y pasa los mismos argumentos que el Recetario'''
+        omitidos = {'llamar', 'ejecutar'}
+        metodos = [nombre for nombre, metodo in inspect.getmembers(RecetarioAsincrono, inspect.iscoroutinefunction)
+                   if not nombre.startswith('_') and nombre not in omitidos]
+        for nombre in metodos:
+            asincrono = list(inspect.signature(getattr(RecetarioAsincrono, nombre)).parameters.values())
+            logica = list(inspect.signature(getattr(Recetario, nombre)).parameters.values())
+            self.assertEqual([parametro.default for parametro in asincrono],
+                             [parametro.default for parametro in logica], nombre)
+
+        id_arroz, id_pollo, id_receta = self.arroz.id, self.pollo.id, self.arroz_con_pollo.id
+        salida = io.StringIO()
+
+        async def llamar_todos():
+            async with RecetarioAsincrono(self.logica) as fachada:
+                receta = await fachada.dar_receta(0)
+                pollo = await fachada.dar_ingrediente_por_id(id_pollo)
+                llamadas = [
+                    ('dar_recetas', ()), ('dar_receta', (0,)), ('dar_receta_por_id', (id_receta,)),
+                    ('dar_pagina_recetas', ()), ('dar_ingredientes', ()), ('dar_pagina_ingredientes', ()),
+                    ('dar_ingrediente', (0,)), ('dar_ingrediente_por_id', (id_arroz,)),
+                    ('buscar_ingrediente', ('Arroz', 'libra')),
+                    ('validar_crear_editar_receta', (-1, 'Arroz blanco', '00:30:00', '2', '200', 'Cocinar')),
+                    ('validar_crear_editar_ingrediente', (-1, 'Sal', 'libra', '1000', 'Tienda')),
+                    ('validar_crear_editar_ingrediente_por_id', (id_arroz, 'Arroz', 'libra', '2000', 'Plaza')),
+                    ('dar_ingredientes_receta', (0,)), ('dar_ingredientes_receta_por_id', (id_receta,)),
+                    ('validar_crear_editar_ingReceta', (receta, pollo, '3')),
+                    ('agregar_ingrediente_receta', (receta, pollo, 3)),
+                    ('editar_ingrediente_receta', (0, receta, pollo, 4)),
+                    ('eliminar_ingrediente_receta', (0, receta)),
+                    ('dar_costos_recetas', ()), ('dar_preparaciones', ([id_receta], [2])),
+                    ('dar_preparacion', (0, 2)), ('dar_preparacion_por_id', (id_receta, 2)),
+                    ('exportar_catalogo', ('recetas', salida)),
+                    ('crear_ingrediente', ('Sal', 'libra', 1000, 'Tienda')),
+                    ('importar_ingredientes', ([{'nombre': 'Azúcar', 'unidad': 'libra', 'valor': '3000',
+                                                 'sitioCompra': 'Tienda'}],)),
+                    ('editar_ingrediente', (0, 'Arroz', 'libra', 2500, 'Plaza')),
+                    ('editar_ingrediente_por_id', (id_arroz, 'Arroz', 'libra', 2600, 'Plaza')),
+                    ('crear_receta', ('Arroz blanco', '00:30:00', '2', '200', 'Cocinar el arroz')),
+                    ('importar_recetas', (['{"nombre": "Sopa", "tiempo": "00:40:00", "personas": 2, '
+                                           '"calorias": 100, "preparacion": "Hervir"}'],)),
+                    ('editar_receta', (0, 'Arroz blanco', '00:35:00', '2', '200', 'Cocinar el arroz')),
+                    ('editar_receta_por_id', (id_receta, 'Arroz con pollo', '01:00:00', '4', '500', 'Cocinar')),
+                    ('eliminar_receta', (0,)), ('eliminar_receta_por_id', (id_receta,)),
+                    ('eliminar_ingrediente', (0,)), ('eliminar_ingrediente_por_id', (id_pollo,)),
+                ]
+                self.assertEqual(sorted(nombre for nombre, _ in llamadas), sorted(metodos))
+                for nombre, argumentos in llamadas:
+                    try:
+                        await getattr(fachada, nombre)(*argumentos)
+                    except TypeError as error:
+                        self.fail("%s: %s" % (nombre, error))
+                    except Exception:
+                        #Los errores propios de la lógica se prueban en test_recetario
+                        pass
+
+        asyncio.run(llamar_todos())
+        self.assertIn('Arroz con pollo', salida.getvalue())
+        print("Prueba métodos asíncronos con los argumentos de la lógica: OK")
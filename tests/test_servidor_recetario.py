@@ -0,0 +1,107 @@
+import http.client
+import json
+import threading
+import unittest
+from unittest import mock
+
+from src.logica.Recetario import Recetario
+from src.modelo.receta import Receta
+from src.servicio.GeneradorCarga import medir_rendimiento
+from src.servicio.ServidorRecetario import ServidorRecetario
+from tests.catalogo_prueba import CatalogoPrueba
+
+
+class ServidorRecetarioTestCase(CatalogoPrueba, unittest.TestCase):
+
+    def setUp(self):
+        self.logica = Recetario()
+        self.crear_catalogo()
+        self.logica.invalidar_recetas()
+
+        self.servidor = ServidorRecetario(('127.0.0.1', 0), self.logica)
+        self.hilo = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.hilo.start()
+        self.host, self.puerto = self.servidor.server_address[:2]
+        self.conexion = http.client.HTTPConnection(self.host, self.puerto, timeout=10)
+
+    def tearDown(self):
+        self.conexion.close()
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self.session.close()
+
+    def solicitar(self, metodo, ruta, cuerpo=None):
+        contenido = json.dumps(cuerpo) if cuerpo is not None else None
+        self.conexion.request(metodo, ruta, contenido, {'Content-Type': 'application/json'})
+        respuesta = self.conexion.getresponse()
+        return respuesta.status, json.loads(respuesta.read())
+
+    def test_consultar_recetas(self):
+        '''Prueba el listado, el detalle, los ingredientes y la preparación de una receta'''
+        estado, pagina = self.solicitar('GET', '/recetas')
+        self.assertEqual(estado, 200)
+        self.assertEqual([receta['nombre'] for receta in pagina['elementos']], ["Arroz con pollo"])
+
+        id_receta = self.arroz_con_pollo.id
+        estado, receta = self.solicitar('GET', '/recetas/%d' % id_receta)
+        self.assertEqual((estado, receta['preparacion']), (200, "Cocinar el arroz con el pollo"))
+
+        estado, ingredientes = self.solicitar('GET', '/recetas/%d/ingredientes' % id_receta)
+        self.assertEqual([ingrediente['ingrediente'] for ingrediente in ingredientes], ["Arroz", "Pollo"])
+
+        estado, preparacion = self.solicitar('GET', '/recetas/%d/preparacion?personas=8' % id_receta)
+        self.assertEqual(estado, 200)
+        self.assertEqual(preparacion, json.loads(json.dumps(self.logica.dar_preparacion(0, 8), default=str)))
+        print("Prueba consultar recetas por el servicio: OK")
+
+    def test_crear_editar_eliminar(self):
+        '''Prueba crear, editar y eliminar recetas e ingredientes por el servicio'''
+        estado, sal = self.solicitar('POST', '/ingredientes', {"nombre": "Sal", "unidad": "libra", "valor": 1000,
+                                                                "sitioCompra": "Tienda"})
+        self.assertEqual(estado, 201)
+        self.assertEqual(self.solicitar('GET', '/ingredientes/%d' % sal['id'])[1]['nombre'], "Sal")
+        estado, creada = self.solicitar('POST', '/recetas', {"nombre": "Sopa", "tiempo": "00:40:00", "personas": 2,
+                                                              "calorias": 90, "preparacion": "Hervir"})
+        self.assertEqual(estado, 201)
+        sopa = self.session.query(Receta).filter(Receta.nombre == "Sopa").one()
+        self.assertEqual(creada['id'], sopa.id)
+
+        estado, _ = self.solicitar('PUT', '/recetas/%d' % sopa.id, {"nombre": "Sopa de arroz", "tiempo": "00:45:00",
+                                                                     "personas": 3, "calorias": 120,
+                                                                     "preparacion": "Hervir el arroz"})
+        self.assertEqual(estado, 200)
+        self.assertEqual(self.solicitar('GET', '/recetas/%d' % sopa.id)[1]['nombre'], "Sopa de arroz")
+
+        estado, _ = self.solicitar('DELETE', '/recetas/%d' % sopa.id)
+        self.assertEqual(estado, 200)
+        self.assertEqual(self.solicitar('GET', '/recetas/%d' % sopa.id)[0], 404)
+
+        estado, _ = self.solicitar('DELETE', '/ingredientes/%d' % self.arroz.id)
+        self.assertEqual(estado, 409)
+        print("Prueba crear, editar y eliminar por el servicio: OK")
+
+    def test_errores_solicitud(self):
+        '''Prueba los códigos de estado de las solicitudes inválidas'''
+        self.assertEqual(self.solicitar('GET', '/no-existe')[0], 404)
+        self.assertEqual(self.solicitar('DELETE', '/recetas')[0], 405)
+        self.assertEqual(self.solicitar('POST', '/recetas', {"nombre": "Sopa"})[0], 400)
+        self.assertEqual(self.solicitar('GET', '/recetas/%d/preparacion' % self.arroz_con_pollo.id)[0], 400)
+        self.assertEqual(self.solicitar('GET', '/recetas?tamano=0')[0], 400)
+        print("Prueba errores de solicitud del servicio: OK")
+
+    def test_error_al_guardar(self):
+        '''Prueba que una creación que la base de datos rechaza no se responde como creada'''
+        error = (None, "Error al crear la receta: UNIQUE constraint failed, intente nuevamente")
+        with mock.patch.object(self.logica, 'crear_receta_con_id', return_value=error):
+            estado, datos = self.solicitar('POST', '/recetas', {"nombre": "Sopa", "tiempo": "00:40:00", "personas": 2,
+                                                                 "calorias": 90, "preparacion": "Hervir"})
+        self.assertEqual((estado, datos), (409, {'error': error[1]}))
+        print("Prueba error al guardar por el servicio: OK")
+
+    def test_medir_rendimiento(self):
+        '''Prueba que varios clientes concurrentes se atienden sin errores'''
+        resultado = medir_rendimiento(self.host, self.puerto, clientes=4, segundos=0.3)
+        self.assertGreater(resultado['solicitudes'], 0)
+        self.assertEqual(resultado['errores'], 0)
+        self.assertLessEqual(resultado['p50_ms'], resultado['p99_ms'])
+        print("Prueba medir rendimiento del servicio: OK")